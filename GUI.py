@@ -1,30 +1,103 @@
+import importlib
 import sys
+import threading
+import time
+
+# Titik nol pengukuran startup (--startup-time), sebelum import Qt
+STARTUP_T0 = time.perf_counter()
+
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                              QHBoxLayout, QLabel, QPushButton, QComboBox, 
-                             QGroupBox, QTextEdit, QCheckBox, QFrame)
-from PyQt5.QtCore import QTimer, Qt, QThread, pyqtSignal
+                             QGroupBox, QScrollArea)
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
 from PyQt5.QtGui import QFont, QColor, QPalette
-import serial
-import serial.tools.list_ports
-import time
+
+from hotplug import is_url
+from logview import LogBuffer, LogView
+from portscan import PortScanner, load_cached_ports
+from protocol import DEFAULT_BAUD, BAUD_RATES
+from transport import BridgeManager
+
+# segment/historyview (NumPy, plot, statistik) di-import saat pertama
+# dipakai atau di background setelah window tampil
+
+
+class StartupProfile:
+    """Waktu setiap tahap startup sejak STARTUP_T0 (mode --startup-time)"""
+    
+    def __init__(self, t0=STARTUP_T0):
+        self.t0 = t0
+        self.marks = []
+    
+    def mark(self, name):
+        self.marks.append((name, time.perf_counter() - self.t0))
+    
+    def report(self, out=sys.stderr):
+        for name, elapsed in self.marks:
+            print(f"{elapsed * 1000:8.1f} ms  {name}", file=out)
+
 
 class ModbusGUI(QMainWindow):
-    def __init__(self):
+    modules_ready = pyqtSignal()
+    
+    def __init__(self, profile_startup=False):
         super().__init__()
+        self.startup = StartupProfile()
+        self.startup.mark("imports done")
+        self.profile_startup = profile_startup
         self.setWindowTitle("Modbus RTU Master Control - Project Elektronika Industri")
-        self.setGeometry(100, 100, 900, 700)
+        self.setGeometry(100, 100, 900, 900)
         
         # Variables
-        self.serial_port = None
-        self.is_connected = False
-        self.auto_read_timer = None
+        self.segments = {}  # port -> SegmentPanel
+        self.history_dialog = None
+        self.port_scanner = None
+        self.pending = {"ports", "log", "modules"}  # Tahap startup yang belum selesai
+        # Log sebelum panel log dibuat ditampung di buffer yang sama
+        self.log_buffer = LogBuffer()
+        self.log_text = None
+        
+        # Satu worker thread (I/O + polling) per master bridge
+        self.bridges = BridgeManager()
+        self.bridges.bridge_opened.connect(self.on_bridge_opened)
+        self.modules_ready.connect(lambda: self.startup_step("modules", "segment modules imported"))
+        
+        # Stylesheet dipasang sebelum widget dibuat agar tidak di-polish ulang
+        self.apply_dark_theme()
         
         # Setup UI
         self.init_ui()
+        # Daftar port sesi sebelumnya dulu, scan sebenarnya di background
+        self.port_combo.addItems(load_cached_ports())
         self.refresh_ports()
+        self.startup.mark("window built")
         
-        # Apply dark theme
-        self.apply_dark_theme()
+        # Panel berat dibuat setelah event loop jalan (window sudah tampil)
+        QTimer.singleShot(0, self.finish_startup)
+    
+    def finish_startup(self):
+        """Tahap startup setelah window pertama kali tampil"""
+        self.startup.mark("event loop running (interactive)")
+        log_frame = self.create_log_frame()
+        self.centralWidget().layout().addWidget(log_frame)
+        self.startup_step("log", "log panel built")
+        threading.Thread(target=self.import_modules, daemon=True).start()
+    
+    def import_modules(self):
+        """Import modul panel segmen/riwayat di background"""
+        for name in ("segment", "historyview"):
+            importlib.import_module(name)
+        self.modules_ready.emit()
+    
+    def startup_step(self, step, name):
+        """Tandai satu tahap startup selesai; mode profil keluar setelah semua"""
+        if step not in self.pending:
+            return
+        self.pending.discard(step)
+        self.startup.mark(name)
+        if self.profile_startup and not self.pending:
+            self.startup.report()
+            self.close()
     
     def init_ui(self):
         # Central Widget
@@ -38,17 +111,11 @@ class ModbusGUI(QMainWindow):
         conn_frame = self.create_connection_frame()
         main_layout.addWidget(conn_frame)
         
-        # ===== SENSOR FRAME =====
-        sensor_frame = self.create_sensor_frame()
-        main_layout.addWidget(sensor_frame)
-        
-        # ===== ACTUATOR FRAME =====
-        actuator_frame = self.create_actuator_frame()
-        main_layout.addWidget(actuator_frame)
+        # ===== SEGMENT FRAME (sensor + aktuator per bridge) =====
+        segment_frame = self.create_segment_frame()
+        main_layout.addWidget(segment_frame, 1)
         
-        # ===== LOG FRAME =====
-        log_frame = self.create_log_frame()
-        main_layout.addWidget(log_frame)
+        # ===== LOG FRAME ===== (dibuat di finish_startup)
     
     def create_connection_frame(self):
         """Frame untuk koneksi serial"""
@@ -64,12 +131,27 @@ class ModbusGUI(QMainWindow):
         # Port ComboBox
         self.port_combo = QComboBox()
         self.port_combo.setMinimumWidth(200)
+        # Editable: port bisa diketik, mis. sim:// untuk bus simulasi
+        self.port_combo.setEditable(True)
+        self.port_combo.currentTextChanged.connect(self.update_connection_status)
         layout.addWidget(self.port_combo)
         
+        # Baud rate, harus sama dengan HOST_BAUD di master.ino
+        baud_label = QLabel("Baud:")
+        baud_label.setFont(QFont("Arial", 10))
+        layout.addWidget(baud_label)
+        
+        self.baud_combo = QComboBox()
+        for baud in BAUD_RATES:
+            self.baud_combo.addItem(str(baud), baud)
+        self.baud_combo.setCurrentIndex(BAUD_RATES.index(DEFAULT_BAUD))
+        layout.addWidget(self.baud_combo)
+        
         # Refresh Button
         refresh_btn = QPushButton("Refresh")
         refresh_btn.setFixedWidth(100)
-        refresh_btn.clicked.connect(self.refresh_ports)
+        # Tombol Refresh selalu enumerasi ulang, tanpa cache
+        refresh_btn.clicked.connect(lambda: self.refresh_ports(max_age=0.0))
         refresh_btn.setStyleSheet("""
             QPushButton {
                 background-color: #3498db;
@@ -112,190 +194,47 @@ class ModbusGUI(QMainWindow):
         layout.addWidget(self.status_label)
         
         layout.addStretch()
-        group.setLayout(layout)
-        return group
-    
-    def create_sensor_frame(self):
-        """Frame untuk slave sensor"""
-        group = QGroupBox("📡 Slave Sensor (0x24)")
-        group.setFont(QFont("Arial", 12, QFont.Bold))
-        layout = QVBoxLayout()
-        layout.setSpacing(15)
-        
-        # === ULTRASONIK ===
-        ultra_layout = QHBoxLayout()
         
-        ultra_label = QLabel("Sensor Ultrasonik:")
-        ultra_label.setFont(QFont("Arial", 11, QFont.Bold))
-        ultra_layout.addWidget(ultra_label)
-        
-        self.ultra_btn = QPushButton("Read Distance")
-        self.ultra_btn.setFixedWidth(150)
-        self.ultra_btn.clicked.connect(self.read_ultrasonic)
-        self.ultra_btn.setStyleSheet("""
+        # History Button
+        history_btn = QPushButton("📂 History")
+        history_btn.setFixedWidth(120)
+        history_btn.clicked.connect(self.show_history)
+        history_btn.setStyleSheet("""
             QPushButton {
-                background-color: #3498db;
+                background-color: #8e44ad;
                 color: white;
                 border: none;
-                padding: 10px;
-                border-radius: 4px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #2980b9;
-            }
-        """)
-        ultra_layout.addWidget(self.ultra_btn)
-        
-        self.ultra_value = QLabel("-- cm")
-        self.ultra_value.setFont(QFont("Arial", 18, QFont.Bold))
-        self.ultra_value.setAlignment(Qt.AlignCenter)
-        self.ultra_value.setFixedWidth(150)
-        self.ultra_value.setStyleSheet("""
-            QLabel {
-                background-color: #2c3e50;
-                color: #1abc9c;
-                border: 2px solid #34495e;
-                border-radius: 4px;
-                padding: 10px;
-            }
-        """)
-        ultra_layout.addWidget(self.ultra_value)
-        ultra_layout.addStretch()
-        
-        layout.addLayout(ultra_layout)
-        
-        # Separator
-        line = QFrame()
-        line.setFrameShape(QFrame.HLine)
-        line.setFrameShadow(QFrame.Sunken)
-        layout.addWidget(line)
-        
-        # === TCRT5000 ===
-        tcrt_layout = QHBoxLayout()
-        
-        tcrt_label = QLabel("Sensor TCRT5000:")
-        tcrt_label.setFont(QFont("Arial", 11, QFont.Bold))
-        tcrt_layout.addWidget(tcrt_label)
-        
-        self.tcrt_btn = QPushButton("Read Status")
-        self.tcrt_btn.setFixedWidth(150)
-        self.tcrt_btn.clicked.connect(self.read_tcrt)
-        self.tcrt_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #3498db;
-                color: white;
-                border: none;
-                padding: 10px;
+                padding: 8px;
                 border-radius: 4px;
                 font-weight: bold;
             }
             QPushButton:hover {
-                background-color: #2980b9;
-            }
-        """)
-        tcrt_layout.addWidget(self.tcrt_btn)
-        
-        self.tcrt_value = QLabel("NO OBJECT")
-        self.tcrt_value.setFont(QFont("Arial", 16, QFont.Bold))
-        self.tcrt_value.setAlignment(Qt.AlignCenter)
-        self.tcrt_value.setFixedWidth(180)
-        self.tcrt_value.setStyleSheet("""
-            QLabel {
-                background-color: #2c3e50;
-                color: #95a5a6;
-                border: 2px solid #34495e;
-                border-radius: 4px;
-                padding: 10px;
+                background-color: #7d3c98;
             }
         """)
-        tcrt_layout.addWidget(self.tcrt_value)
-        tcrt_layout.addStretch()
-        
-        layout.addLayout(tcrt_layout)
-        
-        # Auto Read Checkbox
-        self.auto_read_check = QCheckBox("Auto Read (1s interval)")
-        self.auto_read_check.setFont(QFont("Arial", 10))
-        self.auto_read_check.stateChanged.connect(self.toggle_auto_read)
-        layout.addWidget(self.auto_read_check)
+        layout.addWidget(history_btn)
         
         group.setLayout(layout)
         return group
     
-    def create_actuator_frame(self):
-        """Frame untuk slave aktuator"""
-        group = QGroupBox("🔌 Slave Aktuator (0x66)")
-        group.setFont(QFont("Arial", 12, QFont.Bold))
-        layout = QHBoxLayout()
-        
-        relay_label = QLabel("Relay Control:")
-        relay_label.setFont(QFont("Arial", 11, QFont.Bold))
-        layout.addWidget(relay_label)
-        
-        # ON Button
-        self.relay_on_btn = QPushButton("ON")
-        self.relay_on_btn.setFixedSize(120, 60)
-        self.relay_on_btn.clicked.connect(lambda: self.control_relay(1))
-        self.relay_on_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #27ae60;
-                color: white;
-                border: none;
-                border-radius: 4px;
-                font-size: 14pt;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #229954;
-            }
-            QPushButton:pressed {
-                background-color: #1e8449;
-            }
-        """)
-        layout.addWidget(self.relay_on_btn)
-        
-        # OFF Button
-        self.relay_off_btn = QPushButton("OFF")
-        self.relay_off_btn.setFixedSize(120, 60)
-        self.relay_off_btn.clicked.connect(lambda: self.control_relay(0))
-        self.relay_off_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #e74c3c;
-                color: white;
-                border: none;
-                border-radius: 4px;
-                font-size: 14pt;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #c0392b;
-            }
-            QPushButton:pressed {
-                background-color: #a93226;
-            }
-        """)
-        layout.addWidget(self.relay_off_btn)
-        
-        # Status Label
-        self.relay_status = QLabel("OFF")
-        self.relay_status.setFont(QFont("Arial", 18, QFont.Bold))
-        self.relay_status.setAlignment(Qt.AlignCenter)
-        self.relay_status.setFixedWidth(120)
-        self.relay_status.setStyleSheet("""
-            QLabel {
-                background-color: #2c3e50;
-                color: #e74c3c;
-                border: 2px solid #34495e;
-                border-radius: 4px;
-                padding: 10px;
-            }
-        """)
-        layout.addWidget(self.relay_status)
-        
-        layout.addStretch()
-        group.setLayout(layout)
-        return group
+    def create_segment_frame(self):
+        """Area panel segmen, satu kolom per master bridge"""
+        scroll = QScrollArea()
+        scroll.setWidgetResizable(True)
+        scroll.setFrameShape(QScrollArea.NoFrame)
+        
+        container = QWidget()
+        container.setObjectName("segmentContainer")
+        self.segment_layout = QHBoxLayout(container)
+        self.segment_layout.setContentsMargins(0, 0, 0, 0)
+        
+        self.no_segment_label = QLabel("No segment connected. Select a port and press Connect.")
+        self.no_segment_label.setFont(QFont("Arial", 10))
+        self.no_segment_label.setAlignment(Qt.AlignCenter)
+        self.segment_layout.addWidget(self.no_segment_label)
+        
+        scroll.setWidget(container)
+        return scroll
     
     def create_log_frame(self):
         """Frame untuk log komunikasi"""
@@ -303,12 +242,11 @@ class ModbusGUI(QMainWindow):
         group.setFont(QFont("Arial", 11, QFont.Bold))
         layout = QVBoxLayout()
         
-        # Log Text
-        self.log_text = QTextEdit()
-        self.log_text.setReadOnly(True)
+        # Log Text (ring buffer + flush per frame)
+        self.log_text = LogView(buffer=self.log_buffer)
         self.log_text.setFont(QFont("Courier", 9))
         self.log_text.setStyleSheet("""
-            QTextEdit {
+            QPlainTextEdit {
                 background-color: #1a1a1a;
                 color: #00ff00;
                 border: 2px solid #34495e;
@@ -342,7 +280,7 @@ class ModbusGUI(QMainWindow):
     def apply_dark_theme(self):
         """Apply dark theme to application"""
         self.setStyleSheet("""
-            QMainWindow {
+            QMainWindow, QDialog {
                 background-color: #2c3e50;
             }
             QGroupBox {
@@ -379,6 +317,28 @@ class ModbusGUI(QMainWindow):
             QComboBox::drop-down {
                 border: none;
             }
+            QSpinBox, QDoubleSpinBox, QDateTimeEdit {
+                background-color: #2c3e50;
+                color: white;
+                border: 2px solid #34495e;
+                border-radius: 4px;
+                padding: 3px;
+            }
+            QScrollArea, QWidget#segmentContainer {
+                background-color: #2c3e50;
+            }
+            QTableWidget {
+                background-color: #1a1a1a;
+                color: white;
+                gridline-color: #34495e;
+                border: 2px solid #34495e;
+            }
+            QHeaderView::section {
+                background-color: #2c3e50;
+                color: white;
+                border: none;
+                padding: 3px;
+            }
             QComboBox QAbstractItemView {
                 background-color: #2c3e50;
                 color: white;
@@ -386,60 +346,124 @@ class ModbusGUI(QMainWindow):
             }
         """)
     
-    def refresh_ports(self):
-        """Refresh daftar port serial"""
+    def refresh_ports(self, max_age=None):
+        """Refresh daftar port serial di background (tidak memblokir GUI)"""
+        if self.port_scanner is not None and self.port_scanner.isRunning():
+            return
+        self.port_scanner = PortScanner() if max_age is None else PortScanner(max_age)
+        self.port_scanner.ports_found.connect(self.on_ports_found)
+        self.port_scanner.start()
+    
+    def on_ports_found(self, ports, duration):
+        """Isi combo port dari hasil scan"""
+        current = self.port_combo.currentText()
         self.port_combo.clear()
-        ports = serial.tools.list_ports.comports()
-        for port in ports:
-            self.port_combo.addItem(port.device)
+        self.port_combo.addItems(ports)
+        # Port yang diketik (sim://, URL) atau masih ada tetap terpilih
+        if current and (current in ports or is_url(current)):
+            self.port_combo.setEditText(current)
         
         if self.port_combo.count() == 0:
             self.log("⚠️ No serial ports found!")
+        self.startup_step("ports", f"ports listed ({len(ports)} found, scan {duration * 1000:.1f} ms)")
     
     def toggle_connection(self):
-        """Toggle koneksi serial"""
-        if not self.is_connected:
-            port = self.port_combo.currentText()
-            if not port:
-                self.log("❌ Error: No port selected!")
-                return
-            
-            try:
-                self.serial_port = serial.Serial(port, 9600, timeout=0.5)
-                time.sleep(2)  # Tunggu Arduino reset
-                
-                # Flush buffer awal
-                self.serial_port.reset_input_buffer()
-                self.serial_port.reset_output_buffer()
-                
-                self.is_connected = True
-                self.connect_btn.setText("Disconnect")
-                self.connect_btn.setStyleSheet("""
-                    QPushButton {
-                        background-color: #e74c3c;
-                        color: white;
-                        border: none;
-                        padding: 8px;
-                        border-radius: 4px;
-                        font-size: 11pt;
-                        font-weight: bold;
-                    }
-                    QPushButton:hover {
-                        background-color: #c0392b;
-                    }
-                """)
-                self.status_label.setText("● Connected")
-                self.status_label.setStyleSheet("color: #27ae60;")
-                self.log(f"✅ Connected to {port}")
-                
-            except Exception as e:
-                self.log(f"❌ Connection failed: {str(e)}")
+        """Connect/disconnect port yang dipilih sebagai segmen"""
+        port = self.port_combo.currentText()
+        if not port:
+            self.log("❌ Error: No port selected!")
+            return
+        
+        if port in self.segments:
+            self.disconnect_segment(port)
+        else:
+            self.connect_segment(port)
+    
+    def connect_segment(self, port):
+        """Buka port di worker thread baru, GUI tidak ikut menunggu Arduino reset"""
+        baudrate = self.baud_combo.currentData()
+        self.log(f"🔌 Connecting to {port} @ {baudrate} baud...")
+        self.bridges.open(port, baudrate)
+    
+    def on_bridge_opened(self, port, worker):
+        """Buat panel segmen untuk worker baru"""
+        from segment import SegmentPanel
+        
+        worker.connection_failed.connect(
+            lambda message, port=port: self.on_connection_failed(port, message))
+        
+        panel = SegmentPanel(port, worker, worker.scheduler)
+        panel.log_message.connect(self.log)
+        panel.disconnect_requested.connect(self.disconnect_segment)
+        self.segments[port] = panel
+        
+        self.no_segment_label.hide()
+        self.segment_layout.addWidget(panel)
+        self.update_connection_status()
+    
+    def disconnect_segment(self, port):
+        """Tutup port dan hapus panel segmen"""
+        panel = self.segments.pop(port, None)
+        if panel is None:
+            return
+        
+        self.bridges.close(port)
+        self.segment_layout.removeWidget(panel)
+        panel.deleteLater()
+        
+        if not self.segments:
+            self.no_segment_label.show()
+        self.update_connection_status()
+        self.log(f"🔌 Disconnected {port}")
+    
+    def on_connection_failed(self, port, message):
+        """Port gagal dibuka oleh worker"""
+        self.log(f"❌ Connection failed ({port}): {message}")
+        panel = self.segments.pop(port, None)
+        if panel is not None:
+            self.bridges.close(port)
+            self.segment_layout.removeWidget(panel)
+            panel.deleteLater()
+        if not self.segments:
+            self.no_segment_label.show()
+        self.update_connection_status()
+    
+    def show_history(self):
+        """Buka jendela riwayat rekaman"""
+        if self.history_dialog is None:
+            from historyview import HistoryDialog
+            self.history_dialog = HistoryDialog(self)
+            self.history_dialog.replay_requested.connect(self.replay_recording)
+            self.history_dialog.log_message.connect(self.log)
+        self.history_dialog.refresh_stores()
+        self.history_dialog.show()
+        self.history_dialog.raise_()
+    
+    def replay_recording(self, name, samples, speed):
+        """Putar ulang rekaman ke panel segmen read-only"""
+        # Replay sebelumnya dari store yang sama diganti
+        self.disconnect_segment(name)
+        self.bridges.open_replay(name, samples, speed)
+    
+    def update_connection_status(self):
+        """Sinkronkan tombol Connect dan status dengan segmen aktif"""
+        if self.port_combo.currentText() in self.segments:
+            self.connect_btn.setText("Disconnect")
+            self.connect_btn.setStyleSheet("""
+                QPushButton {
+                    background-color: #e74c3c;
+                    color: white;
+                    border: none;
+                    padding: 8px;
+                    border-radius: 4px;
+                    font-size: 11pt;
+                    font-weight: bold;
+                }
+                QPushButton:hover {
+                    background-color: #c0392b;
+                }
+            """)
         else:
-            if self.serial_port:
-                self.serial_port.close()
-            
-            self.is_connected = False
-            self.auto_read_check.setChecked(False)
             self.connect_btn.setText("Connect")
             self.connect_btn.setStyleSheet("""
                 QPushButton {
@@ -455,230 +479,34 @@ class ModbusGUI(QMainWindow):
                     background-color: #229954;
                 }
             """)
-            self.status_label.setText("● Disconnected")
-            self.status_label.setStyleSheet("color: #e74c3c;")
-            self.log("🔌 Disconnected")
-    
-    def read_ultrasonic(self):
-        """Baca sensor ultrasonik"""
-        if not self.is_connected:
-            self.log("❌ Not connected!")
-            return
         
-        try:
-            # Flush buffer sebelum kirim
-            self.serial_port.reset_input_buffer()
-            
-            # Kirim perintah
-            self.serial_port.write(b'U')
-            
-            # Tunggu response (timeout 500ms)
-            start_time = time.time()
-            while self.serial_port.in_waiting < 3:
-                if time.time() - start_time > 0.5:
-                    self.log("⏱️ Timeout: No response from sensor")
-                    return
-                time.sleep(0.01)
-            
-            # Baca response
-            data = self.serial_port.read(3)
-            
-            # Cek error byte
-            if data[0] == 0xFF:
-                if data[1] == 0xE1:
-                    self.log("❌ Error: CRC mismatch")
-                elif data[1] == 0xE2:
-                    self.log("❌ Error: Slave timeout")
-                return
-            
-            addr, fc, value = data[0], data[1], data[2]
-            
-            if addr == 0x24 and fc == 0x01:
-                self.ultra_value.setText(f"{value} cm")
-                self.log(f"📏 Ultrasonic: {value} cm [0x{addr:02X}][0x{fc:02X}][0x{value:02X}]")
-            else:
-                self.log(f"⚠️ Invalid response: [0x{addr:02X}][0x{fc:02X}][0x{value:02X}]")
-                
-        except Exception as e:
-            self.log(f"❌ Read error: {str(e)}")
-    
-    def read_tcrt(self):
-        """Baca sensor TCRT5000"""
-        if not self.is_connected:
-            self.log("❌ Not connected!")
-            return
-        
-        try:
-            # Flush buffer sebelum kirim
-            self.serial_port.reset_input_buffer()
-            
-            # Kirim perintah
-            self.serial_port.write(b'T')
-            
-            # Tunggu response
-            start_time = time.time()
-            while self.serial_port.in_waiting < 3:
-                if time.time() - start_time > 0.5:
-                    self.log("⏱️ Timeout: No response from sensor")
-                    return
-                time.sleep(0.01)
-            
-            # Baca response
-            data = self.serial_port.read(3)
-            
-            # Cek error byte
-            if data[0] == 0xFF:
-                if data[1] == 0xE1:
-                    self.log("❌ Error: CRC mismatch")
-                elif data[1] == 0xE2:
-                    self.log("❌ Error: Slave timeout")
-                return
-            
-            addr, fc, value = data[0], data[1], data[2]
-            
-            if addr == 0x24 and fc == 0x02:
-                if value == 0x01:
-                    self.tcrt_value.setText("DETECTED")
-                    self.tcrt_value.setStyleSheet("""
-                        QLabel {
-                            background-color: #2c3e50;
-                            color: #e74c3c;
-                            border: 2px solid #34495e;
-                            border-radius: 4px;
-                            padding: 10px;
-                        }
-                    """)
-                    self.log(f"🔴 TCRT: Object DETECTED [0x{addr:02X}][0x{fc:02X}][0x{value:02X}]")
-                else:
-                    self.tcrt_value.setText("NO OBJECT")
-                    self.tcrt_value.setStyleSheet("""
-                        QLabel {
-                            background-color: #2c3e50;
-                            color: #95a5a6;
-                            border: 2px solid #34495e;
-                            border-radius: 4px;
-                            padding: 10px;
-                        }
-                    """)
-                    self.log(f"⚪ TCRT: No object [0x{addr:02X}][0x{fc:02X}][0x{value:02X}]")
-            else:
-                self.log(f"⚠️ Invalid response: [0x{addr:02X}][0x{fc:02X}][0x{value:02X}]")
-                
-        except Exception as e:
-            self.log(f"❌ Read error: {str(e)}")
-    
-    def control_relay(self, state):
-        """Kontrol relay ON/OFF"""
-        if not self.is_connected:
-            self.log("❌ Not connected!")
-            return
-        
-        try:
-            # Flush buffer sebelum kirim
-            self.serial_port.reset_input_buffer()
-            
-            # Kirim perintah
-            cmd = b'R' + bytes([state])
-            self.serial_port.write(cmd)
-            
-            # Tunggu response
-            start_time = time.time()
-            while self.serial_port.in_waiting < 3:
-                if time.time() - start_time > 0.5:
-                    self.log("⏱️ Timeout: No response from actuator")
-                    return
-                time.sleep(0.01)
-            
-            # Baca response
-            data = self.serial_port.read(3)
-            
-            # Cek error byte
-            if data[0] == 0xFF:
-                if data[1] == 0xE1:
-                    self.log("❌ Error: CRC mismatch")
-                elif data[1] == 0xE2:
-                    self.log("❌ Error: Slave timeout")
-                return
-            
-            addr, fc, value = data[0], data[1], data[2]
-            
-            # FIX: Function code untuk relay adalah 0x03, bukan 0x01
-            if addr == 0x66 and fc == 0x03:
-                if value == 0x01:
-                    self.relay_status.setText("ON")
-                    self.relay_status.setStyleSheet("""
-                        QLabel {
-                            background-color: #2c3e50;
-                            color: #27ae60;
-                            border: 2px solid #34495e;
-                            border-radius: 4px;
-                            padding: 10px;
-                        }
-                    """)
-                    self.log(f"✅ Relay: ON [0x{addr:02X}][0x{fc:02X}][0x{value:02X}]")
-                else:
-                    self.relay_status.setText("OFF")
-                    self.relay_status.setStyleSheet("""
-                        QLabel {
-                            background-color: #2c3e50;
-                            color: #e74c3c;
-                            border: 2px solid #34495e;
-                            border-radius: 4px;
-                            padding: 10px;
-                        }
-                    """)
-                    self.log(f"⛔ Relay: OFF [0x{addr:02X}][0x{fc:02X}][0x{value:02X}]")
-            else:
-                self.log(f"⚠️ Invalid response: [0x{addr:02X}][0x{fc:02X}][0x{value:02X}]")
-                
-        except Exception as e:
-            self.log(f"❌ Control error: {str(e)}")
-    
-    def toggle_auto_read(self, state):
-        """Toggle auto read sensor"""
-        if state == Qt.Checked:
-            if not self.is_connected:
-                self.auto_read_check.setChecked(False)
-                self.log("❌ Connect first before enabling auto read!")
-                return
-            
-            self.log("🔄 Auto read enabled")
-            self.auto_read_timer = QTimer()
-            self.auto_read_timer.timeout.connect(self.auto_read_sensors)
-            self.auto_read_timer.start(1000)  # Every 1 second
+        if self.segments:
+            self.status_label.setText(f"● {len(self.segments)} segment(s)")
+            self.status_label.setStyleSheet("color: #27ae60;")
         else:
-            if self.auto_read_timer:
-                self.auto_read_timer.stop()
-                self.auto_read_timer = None
-            self.log("⏸️ Auto read disabled")
-    
-    def auto_read_sensors(self):
-        """Auto read kedua sensor"""
-        self.read_ultrasonic()
-        QTimer.singleShot(500, self.read_tcrt)  # Delay 500ms untuk TCRT
+            self.status_label.setText("● Disconnected")
+            self.status_label.setStyleSheet("color: #e74c3c;")
     
     def log(self, message):
         """Tambah pesan ke log"""
-        timestamp = time.strftime("%H:%M:%S")
-        self.log_text.append(f"[{timestamp}] {message}")
-        # Auto scroll to bottom
-        self.log_text.verticalScrollBar().setValue(
-            self.log_text.verticalScrollBar().maximum()
-        )
+        self.log_buffer.log(message)
     
     def clear_log(self):
         """Bersihkan log"""
-        self.log_text.clear()
+        self.log_text.clear_log()
     
     def closeEvent(self, event):
         """Handle window close event"""
-        if self.is_connected and self.serial_port:
-            self.serial_port.close()
+        self.bridges.close_all()
         event.accept()
 
 
 if __name__ == "__main__":
+    # --startup-time: cetak waktu setiap tahap startup lalu keluar
+    profile_startup = "--startup-time" in sys.argv
+    if profile_startup:
+        sys.argv.remove("--startup-time")
     app = QApplication(sys.argv)
-    window = ModbusGUI()
+    window = ModbusGUI(profile_startup)
     window.show()
     sys.exit(app.exec_())
\ No newline at end of file
@@ -0,0 +1,90 @@
+"""Timeout adaptif dari RTT terukur dan kebijakan retry untuk read
+
+Timeout per (slave, function code) = srtt + K * rttvar, dengan estimator
+EWMA seperti TCP (RFC 6298). Kuncinya per function code karena di slave
+0x24 pembacaan ultrasonik menunggu echo (pulseIn sampai 30 ms), sedangkan
+TCRT hanya analogRead.
+
+Hanya perintah baca (idempoten) yang di-retry; perintah ON/OFF relay
+tidak pernah dikirim ulang otomatis.
+"""
+from protocol import (
+    CMD_READ_ULTRASONIC, CMD_READ_TCRT, CMD_CONTROL_RELAY, CMD_RELAY_STATUS, CMD_READ_SENSORS,
+    CMD_PASSTHROUGH, FC_READ_ULTRASONIC, FC_READ_TCRT5000, FC_READ_SENSORS, FC_READ_REGISTERS,
+    command_target,
+)
+
+# ===== TIMEOUT ADAPTIF =====
+RTT_GAIN = 0.125      # Bobot EWMA rata-rata RTT
+RTTVAR_GAIN = 0.25    # Bobot EWMA deviasi RTT
+TIMEOUT_K = 4.0       # Timeout = srtt + K * rttvar
+TIMEOUT_MIN = 0.05    # Detik, batas bawah timeout adaptif
+MIN_SAMPLES = 3       # Sampel sebelum timeout adaptif dipakai
+
+# ===== RETRY =====
+MAX_RETRIES = 2
+RETRY_BACKOFF = 0.01      # Detik, jeda sebelum retry pertama (lalu x2)
+RETRY_BACKOFF_MAX = 0.05
+
+IDEMPOTENT_COMMANDS = {
+    CMD_READ_ULTRASONIC,
+    CMD_READ_TCRT,
+    CMD_READ_SENSORS,
+    CMD_CONTROL_RELAY + CMD_RELAY_STATUS,
+}
+# Function code baca yang aman di-retry lewat passthrough
+IDEMPOTENT_FUNCTIONS = {
+    FC_READ_ULTRASONIC,
+    FC_READ_TCRT5000,
+    FC_READ_SENSORS,
+    FC_READ_REGISTERS,
+}
+# Kelas error (lihat stats.ERROR_CLASSES) yang layak dicoba ulang
+RETRYABLE_ERRORS = {"timeout", "slave_timeout", "crc_error", "invalid"}
+
+
+def is_idempotent(command):
+    if command[:1] == CMD_PASSTHROUGH:
+        return command_target(command)[1] in IDEMPOTENT_FUNCTIONS
+    return bytes(command) in IDEMPOTENT_COMMANDS
+
+
+class RttEstimator:
+    """Rata-rata dan deviasi RTT (EWMA) untuk satu node"""
+
+    def __init__(self):
+        self.srtt = None
+        self.rttvar = None
+        self.samples = 0
+
+    def update(self, rtt):
+        self.samples += 1
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2.0
+            return
+        self.rttvar += RTTVAR_GAIN * (abs(rtt - self.srtt) - self.rttvar)
+        self.srtt += RTT_GAIN * (rtt - self.srtt)
+
+    def timeout(self, limit):
+        """Timeout adaptif, tidak pernah lebih dari limit"""
+        if self.samples < MIN_SAMPLES:
+            return limit
+        return min(limit, max(TIMEOUT_MIN, self.srtt + TIMEOUT_K * self.rttvar))
+
+
+class RetryPolicy:
+    """Retry terbatas dengan backoff eksponensial"""
+
+    def __init__(self, max_retries=MAX_RETRIES, backoff=RETRY_BACKOFF,
+                 max_backoff=RETRY_BACKOFF_MAX):
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+    def retries_for(self, command):
+        return self.max_retries if is_idempotent(command) else 0
+
+    def delay(self, attempt):
+        """Jeda sebelum retry ke-attempt (mulai 1)"""
+        return min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
@@ -0,0 +1,204 @@
+"""Client asyncio untuk master bridge RS-485
+
+Membutuhkan pyserial-asyncio (pip install pyserial-asyncio).
+
+Contoh:
+    async with await AsyncRS485Client.connect("/dev/ttyUSB0") as client:
+        distance = await client.read_ultrasonic()
+"""
+import asyncio
+
+import serial
+
+from client import RESPONSE_TIMEOUT, RESET_WAIT, PING_INTERVAL
+from protocol import (
+    SLAVE_SENSOR_ADDR, SLAVE_AKTUATOR_ADDR, DEFAULT_BAUD,
+    CMD_READ_ULTRASONIC, CMD_READ_TCRT, CMD_CONTROL_RELAY, CMD_PING, CMD_READ_SENSORS,
+    CMD_RELAY_OFF, CMD_RELAY_ON, CMD_RELAY_STATUS,
+    FC_READ_ULTRASONIC, FC_READ_TCRT5000, FC_CONTROL_RELAY,
+    FrameParser, ResponseTimeout, check_frame, check_sensors_frame, is_ready_frame,
+)
+
+try:
+    import serial_asyncio
+except ImportError:  # pragma: no cover - dependensi opsional
+    serial_asyncio = None
+
+
+class _BridgeProtocol(asyncio.Protocol):
+    """Protocol asyncio: byte masuk langsung ke FrameParser"""
+
+    def __init__(self):
+        self.parser = FrameParser()
+        self.transport = None
+        self.waiter = None
+        self.ready = None  # Future untuk frame READY selama handshake
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def data_received(self, data):
+        for frame in self.parser.feed(data):
+            if is_ready_frame(frame):
+                if self.ready is not None and not self.ready.done():
+                    self.ready.set_result(frame)
+                continue
+            # Frame tanpa request yang menunggu adalah sisa transaksi lama
+            if self.waiter is not None and not self.waiter.done():
+                self.waiter.set_result(frame)
+
+    def connection_lost(self, exc):
+        self.transport = None
+        if self.waiter is not None and not self.waiter.done():
+            self.waiter.set_exception(serial.SerialException("Port closed"))
+
+
+class AsyncRS485Client:
+    """Client asyncio: satu transaksi di bus pada satu waktu
+
+    Beberapa coroutine boleh memanggil client yang sama; akses ke bus
+    half-duplex diserialkan dengan asyncio.Lock. Beberapa client (satu
+    per master bridge) bisa berjalan bersamaan di satu event loop.
+    """
+
+    def __init__(self, baudrate=DEFAULT_BAUD, reset_wait=RESET_WAIT):
+        if serial_asyncio is None:
+            raise ImportError("AsyncRS485Client requires pyserial-asyncio")
+        self.baudrate = baudrate
+        self.reset_wait = reset_wait
+        self.ready_time = None  # Detik sampai frame READY diterima saat open
+        self._protocol = None
+        self._lock = asyncio.Lock()
+        # Transaksi terakhir timeout: jawaban terlambatnya bisa masih di jalan
+        self._needs_resync = False
+
+    @classmethod
+    async def connect(cls, port, baudrate=DEFAULT_BAUD, reset_wait=RESET_WAIT):
+        client = cls(baudrate, reset_wait)
+        await client.open(port)
+        return client
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
+
+    @property
+    def is_open(self):
+        return self._protocol is not None and self._protocol.transport is not None
+
+    async def open(self, port):
+        """Buka port serial dan tunggu master siap"""
+        self.close()
+        loop = asyncio.get_running_loop()
+        transport, self._protocol = await serial_asyncio.create_serial_connection(
+            loop, _BridgeProtocol, port, baudrate=self.baudrate)
+        # connection_made() dijadwalkan lewat call_soon, belum tentu sudah jalan
+        self._protocol.transport = transport
+        self.ready_time = await self._wait_ready()
+        self._protocol.transport.serial.reset_input_buffer()
+        self._protocol.parser.reset()
+        self._needs_resync = False
+
+    async def _wait_ready(self):
+        """Handshake CMD_PING, sama seperti RS485Client._wait_ready"""
+        loop = asyncio.get_running_loop()
+        protocol = self._protocol
+        protocol.ready = loop.create_future()
+        start = loop.time()
+        deadline = start + self.reset_wait
+        try:
+            while loop.time() < deadline:
+                protocol.transport.write(CMD_PING)
+                timeout = min(PING_INTERVAL, deadline - loop.time())
+                try:
+                    await asyncio.wait_for(asyncio.shield(protocol.ready), timeout)
+                    return loop.time() - start
+                except asyncio.TimeoutError:
+                    continue
+            return None
+        finally:
+            protocol.ready = None
+
+    async def _resync(self, timeout):
+        """Kirim CMD_PING dan tunggu READY, True jika master idle
+
+        Sama seperti RS485Client._resync: master memproses perintah
+        berurutan, jadi frame terlambat dari transaksi yang timeout datang
+        sebelum READY dan dibuang (tidak ada waiter).
+        """
+        loop = asyncio.get_running_loop()
+        protocol = self._protocol
+        protocol.parser.reset()
+        protocol.ready = loop.create_future()
+        try:
+            protocol.transport.write(CMD_PING)
+            await asyncio.wait_for(protocol.ready, timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            protocol.ready = None
+
+    def close(self):
+        if self.is_open:
+            self._protocol.transport.close()
+        self._protocol = None
+
+    # ===== TRANSAKSI MENTAH =====
+    async def transact(self, command, timeout=RESPONSE_TIMEOUT):
+        """Kirim perintah, kembalikan frame mentah (data atau error)
+
+        Setelah timeout, perintah berikutnya didahului resync CMD_PING agar
+        jawaban terlambat tidak dianggap jawaban perintah itu.
+        """
+        async with self._lock:
+            if not self.is_open:
+                raise serial.SerialException("Not connected")
+
+            if self._needs_resync:
+                if not await self._resync(timeout):
+                    raise ResponseTimeout("No response from master")
+                self._needs_resync = False
+
+            protocol = self._protocol
+            protocol.transport.serial.reset_input_buffer()
+            protocol.parser.reset()
+            protocol.waiter = asyncio.get_running_loop().create_future()
+            try:
+                protocol.transport.write(command)
+                return await asyncio.wait_for(protocol.waiter, timeout)
+            except asyncio.TimeoutError:
+                self._needs_resync = True
+                raise ResponseTimeout("No response from master") from None
+            finally:
+                protocol.waiter = None
+
+    # ===== API SENSOR / AKTUATOR =====
+    async def read_ultrasonic(self):
+        """Jarak ultrasonik dalam cm"""
+        frame = await self.transact(CMD_READ_ULTRASONIC)
+        return check_frame(frame, SLAVE_SENSOR_ADDR, FC_READ_ULTRASONIC)
+
+    async def read_tcrt(self):
+        """True jika TCRT5000 mendeteksi objek"""
+        frame = await self.transact(CMD_READ_TCRT)
+        return check_frame(frame, SLAVE_SENSOR_ADDR, FC_READ_TCRT5000) == 0x01
+
+    async def read_sensors(self):
+        """(jarak cm, TCRT terdeteksi) dalam satu transaksi (FC 0x04)"""
+        frame = await self.transact(CMD_READ_SENSORS)
+        distance, tcrt = check_sensors_frame(frame)
+        return distance, tcrt == 0x01
+
+    async def set_relay(self, on):
+        """Nyalakan/matikan relay, kembalikan status relay dari aktuator"""
+        command = CMD_CONTROL_RELAY + (CMD_RELAY_ON if on else CMD_RELAY_OFF)
+        frame = await self.transact(command)
+        return check_frame(frame, SLAVE_AKTUATOR_ADDR, FC_CONTROL_RELAY) == 0x01
+
+    async def read_relay(self):
+        """Baca status relay tanpa mengubahnya"""
+        frame = await self.transact(CMD_CONTROL_RELAY + CMD_RELAY_STATUS)
+        return check_frame(frame, SLAVE_AKTUATOR_ADDR, FC_CONTROL_RELAY) == 0x01
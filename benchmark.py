@@ -0,0 +1,182 @@
+"""Benchmark latency dan throughput transaksi end-to-end
+
+Menjalankan RS485Client terhadap bus simulasi (default) atau master
+bridge asli, lalu menulis hasil sebagai JSON.
+
+Contoh:
+    python benchmark.py --transactions 500 -o bench.json
+    python benchmark.py /dev/ttyUSB0 --commands ultrasonic,tcrt --label v2
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+
+from adaptive import MAX_RETRIES, RetryPolicy
+from client import RS485Client
+from protocol import (
+    SLAVE_SENSOR_ADDR, SLAVE_AKTUATOR_ADDR, DEFAULT_BAUD, BAUD_RATES,
+    CMD_READ_ULTRASONIC, CMD_READ_TCRT, CMD_CONTROL_RELAY, CMD_READ_SENSORS,
+    CMD_RELAY_OFF, CMD_RELAY_ON, CMD_RELAY_STATUS,
+    FC_READ_ULTRASONIC, FC_READ_TCRT5000, FC_CONTROL_RELAY, FC_READ_SENSORS,
+    CrcError, SlaveTimeout, ResponseTimeout, InvalidResponse, ProtocolError,
+    check_frame,
+)
+
+# Nama command -> (perintah ke master, alamat slave, function code)
+COMMANDS = {
+    "ultrasonic": (CMD_READ_ULTRASONIC, SLAVE_SENSOR_ADDR, FC_READ_ULTRASONIC),
+    "tcrt": (CMD_READ_TCRT, SLAVE_SENSOR_ADDR, FC_READ_TCRT5000),
+    "sensors": (CMD_READ_SENSORS, SLAVE_SENSOR_ADDR, FC_READ_SENSORS),
+    "relay_on": (CMD_CONTROL_RELAY + CMD_RELAY_ON, SLAVE_AKTUATOR_ADDR, FC_CONTROL_RELAY),
+    "relay_off": (CMD_CONTROL_RELAY + CMD_RELAY_OFF, SLAVE_AKTUATOR_ADDR, FC_CONTROL_RELAY),
+    "relay_status": (CMD_CONTROL_RELAY + CMD_RELAY_STATUS, SLAVE_AKTUATOR_ADDR, FC_CONTROL_RELAY),
+}
+
+ERROR_CLASSES = [
+    (SlaveTimeout, "slave_timeout"),
+    (CrcError, "crc_error"),
+    (InvalidResponse, "invalid"),
+    (ProtocolError, "protocol_error"),
+]
+
+
+def percentile(sorted_values, pct):
+    """Percentile nearest-rank dari list yang sudah terurut"""
+    if not sorted_values:
+        return None
+    rank = max(0, min(len(sorted_values) - 1,
+                      int(round(pct / 100.0 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[rank]
+
+
+def classify(error):
+    for cls, name in ERROR_CLASSES:
+        if isinstance(error, cls):
+            return name
+    return "other"
+
+
+def count_timeouts(errors):
+    """Timeout host + timeout slave yang dilaporkan master"""
+    return errors.get("timeout", 0) + errors.get("slave_timeout", 0)
+
+
+def to_ms(seconds):
+    return None if seconds is None else round(seconds * 1000.0, 3)
+
+
+def summarize(latencies, errors, count):
+    """Ringkasan satu command: percentile latency (ms) dan jumlah error"""
+    ordered = sorted(latencies)
+    ms = to_ms
+    return {
+        "count": count,
+        "ok": count - sum(errors.values()),
+        "errors": errors,
+        "timeout_rate": round(count_timeouts(errors) / count, 6) if count else 0.0,
+        "latency_ms": {
+            "min": ms(ordered[0] if ordered else None),
+            "mean": ms(sum(ordered) / len(ordered) if ordered else None),
+            "p50": ms(percentile(ordered, 50)),
+            "p95": ms(percentile(ordered, 95)),
+            "p99": ms(percentile(ordered, 99)),
+            "max": ms(ordered[-1] if ordered else None),
+        },
+    }
+
+
+def run_benchmark(client, commands, transactions, timeout):
+    """Jalankan command bergiliran, kembalikan dict hasil"""
+    latencies = {name: [] for name in commands}
+    errors = {name: {} for name in commands}
+    counts = {name: 0 for name in commands}
+
+    retries_start = client.retry_count
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    for i in range(transactions):
+        name = commands[i % len(commands)]
+        command, addr, fc = COMMANDS[name]
+
+        counts[name] += 1
+        start = time.perf_counter()
+        try:
+            frame = client.transact(command, timeout)
+        except ResponseTimeout:
+            # Timeout host tidak punya round-trip, hanya dihitung sebagai error
+            errors[name]["timeout"] = errors[name].get("timeout", 0) + 1
+            continue
+
+        # Round-trip dicatat untuk semua frame yang diterima, termasuk
+        # frame error 0xFF 0xEx dari master
+        latencies[name].append(time.perf_counter() - start)
+        try:
+            check_frame(frame, addr, fc)
+        except ProtocolError as e:
+            kind = classify(e)
+            errors[name][kind] = errors[name].get(kind, 0) + 1
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+
+    total_timeouts = sum(count_timeouts(e) for e in errors.values())
+    return {
+        "transactions": transactions,
+        "duration_s": round(wall, 6),
+        "transactions_per_s": round(transactions / wall, 3) if wall > 0 else None,
+        "timeout_rate": round(total_timeouts / transactions, 6) if transactions else 0.0,
+        "retries": client.retry_count - retries_start,
+        "cpu_s": round(cpu, 6),
+        "cpu_percent": round(100.0 * cpu / wall, 3) if wall > 0 else None,
+        "commands": {
+            name: summarize(latencies[name], errors[name], counts[name])
+            for name in commands
+        },
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="RS-485 master bridge transaction benchmark")
+    parser.add_argument("port", nargs="?", default="sim://",
+                        help="Port serial atau URL sim:// (default: sim://)")
+    parser.add_argument("--baud", type=int, default=DEFAULT_BAUD, choices=BAUD_RATES)
+    parser.add_argument("--transactions", "-n", type=int, default=300)
+    parser.add_argument("--commands", default="ultrasonic,tcrt,relay_status",
+                        help="Daftar command dipisah koma: " + ",".join(COMMANDS))
+    parser.add_argument("--timeout", type=float, default=0.5, help="Timeout per transaksi (detik)")
+    parser.add_argument("--max-retries", type=int, default=MAX_RETRIES,
+                        help="Retry maksimum untuk perintah baca (0 = tanpa retry)")
+    parser.add_argument("--label", help="Label bebas untuk membandingkan versi")
+    parser.add_argument("--output", "-o", help="File JSON (default stdout)")
+    args = parser.parse_args(argv)
+
+    commands = [c.strip() for c in args.commands.split(",") if c.strip()]
+    unknown = [c for c in commands if c not in COMMANDS]
+    if unknown:
+        parser.error(f"unknown command(s): {', '.join(unknown)}")
+
+    with RS485Client(args.port, args.baud, retry=RetryPolicy(args.max_retries)) as client:
+        result = run_benchmark(client, commands, args.transactions, args.timeout)
+
+    report = {
+        "label": args.label,
+        "port": args.port,
+        "baudrate": args.baud,
+        "max_retries": args.max_retries,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        **result,
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
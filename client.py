@@ -0,0 +1,305 @@
+import time
+from collections import namedtuple
+
+import serial
+
+from adaptive import RETRYABLE_ERRORS, RetryPolicy, RttEstimator
+from modbus import check_crc, decode_registers, encode_read_registers
+from protocol import (
+    SLAVE_SENSOR_ADDR, SLAVE_AKTUATOR_ADDR, DEFAULT_BAUD, SENSOR_REGISTERS,
+    CMD_READ_ULTRASONIC, CMD_READ_TCRT, CMD_CONTROL_RELAY, CMD_PING, CMD_READ_SENSORS,
+    CMD_RELAY_OFF, CMD_RELAY_ON, CMD_RELAY_STATUS,
+    FC_READ_ULTRASONIC, FC_READ_TCRT5000, FC_CONTROL_RELAY,
+    FrameParser, ResponseTimeout, check_frame, check_passthrough_frame, check_sensors_frame,
+    classify_frame, command_target, frame_node, is_error_frame, is_passthrough_frame,
+    is_ready_frame, passthrough_command,
+)
+
+# ===== RESPONSE TIMEOUT =====
+RESPONSE_TIMEOUT = 0.5  # Detik, batas atas; timeout efektif adaptif per node
+READ_SLICE = 0.05       # Batas satu read() blocking, untuk cek deadline
+RESET_WAIT = 2.0        # Batas tunggu master siap (Arduino reset) setelah open
+PING_INTERVAL = 0.1     # Jeda antar CMD_PING selama handshake
+
+# ===== PRIORITAS REQUEST =====
+PRIORITY_URGENT = 0   # Tulis aktuator (interlock): mendahului antrean dan retry polling
+PRIORITY_CONTROL = 1  # Perintah kontrol worker (open/close/polling/...), tidak pernah di depan tulis relay
+PRIORITY_NORMAL = 2
+
+# Satu transaksi ke master bridge: tag menentukan handler di GUI,
+# slave dipakai untuk menghitung polls/s per node
+Request = namedtuple("Request", ["tag", "command", "slave", "timeout", "priority"])
+Request.__new__.__defaults__ = (RESPONSE_TIMEOUT, PRIORITY_NORMAL)
+
+# Hasil transaksi: data = frame lengkap (3/4 byte data atau 2 byte error),
+# atau None jika timeout/exception. latency = detik dari submit sampai
+# transaksi selesai (termasuk antre), None jika tidak diukur
+Response = namedtuple("Response", ["tag", "command", "data", "error", "latency"])
+Response.__new__.__defaults__ = (None,)
+
+
+def open_serial(port, baudrate=DEFAULT_BAUD, timeout=READ_SLICE, dtr=True):
+    """Buka port serial, URL pyserial (loop://, socket://) atau sim://
+
+    dtr=False membuka port tanpa meng-assert DTR sehingga Arduino tidak
+    auto-reset (tergantung driver; di Linux HUPCL bisa tetap me-reset).
+    """
+    if port.startswith("sim://"):
+        from simulator import SimulatedSerial
+        return SimulatedSerial(port, baudrate=baudrate, timeout=timeout)
+    ser = serial.serial_for_url(port, baudrate=baudrate, timeout=timeout, do_not_open=True)
+    ser.dtr = dtr
+    ser.open()
+    return ser
+
+
+class RS485Client:
+    """Client sinkron untuk master bridge, tanpa dependensi Qt
+
+    Contoh:
+        with RS485Client("/dev/ttyUSB0") as client:
+            print(client.read_ultrasonic())
+            client.set_relay(True)
+    """
+
+    def __init__(self, port=None, baudrate=DEFAULT_BAUD, reset_wait=RESET_WAIT, stats=None, dtr=True,
+                 retry=None):
+        self.baudrate = baudrate
+        self.reset_wait = reset_wait
+        self.stats = stats  # BusStats opsional untuk instrumentasi
+        self.dtr = dtr
+        self.ready_time = None  # Detik sampai frame READY diterima saat open
+        self.retry = RetryPolicy() if retry is None else retry
+        self.rtt = {}  # (slave, fc) -> RttEstimator
+        self.retry_count = 0
+        # Callable opsional: True = ada job mendesak, jangan retry lagi
+        self.preempt = None
+        self._serial = None
+        self._parser = FrameParser()
+        if port is not None:
+            self.open(port)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def is_open(self):
+        return self._serial is not None
+
+    def open(self, port):
+        """Buka port serial dan tunggu master siap"""
+        self.close()
+        self._serial = open_serial(port, self.baudrate, dtr=self.dtr)
+        try:
+            # Flush buffer awal
+            self._serial.reset_input_buffer()
+            self._serial.reset_output_buffer()
+            self.ready_time = self._wait_ready()
+        except Exception:
+            self.close()
+            raise
+
+    def _wait_ready(self):
+        """Handshake CMD_PING sampai master menjawab READY
+
+        Master mengirim READY begitu setup() selesai, jadi port siap
+        dipakai tanpa menunggu reset_wait penuh. Firmware lama yang tidak
+        mengenal CMD_PING tetap menunggu reset_wait seperti sebelumnya.
+        Mengembalikan waktu tunggu (detik), atau None tanpa READY.
+        """
+        start = time.monotonic()
+        deadline = start + self.reset_wait
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            self._serial.write(CMD_PING)
+            self._parser.reset()
+            try:
+                frame = self._read_frame(min(PING_INTERVAL, remaining), skip_ready=False)
+            except ResponseTimeout:
+                continue
+            if is_ready_frame(frame):
+                self._serial.reset_input_buffer()
+                return time.monotonic() - start
+        self._serial.reset_input_buffer()
+        return None
+
+    def close(self):
+        if self._serial:
+            try:
+                self._serial.close()
+            except Exception:
+                pass
+            self._serial = None
+
+    # ===== TRANSAKSI MENTAH =====
+    def transact(self, command, timeout=RESPONSE_TIMEOUT):
+        """Kirim perintah, kembalikan frame mentah (data atau error)
+
+        Perintah baca di-retry (RetryPolicy) jika timeout atau master
+        membalas frame error; frame terakhir tetap dikembalikan apa adanya.
+        Retry dihentikan lebih awal jika preempt() bernilai True.
+        """
+        slave, fc = command_target(command)
+        if slave is None:
+            return self._transact(command, timeout)
+
+        max_retries = self.retry.retries_for(command)
+        retries = 0
+        start = time.perf_counter()
+        frame, error = None, None
+        try:
+            while True:
+                frame, error = None, None
+                try:
+                    frame = self._transact(command, timeout, (slave, fc))
+                    error = classify_frame(frame, slave, fc)
+                    if error is None and is_passthrough_frame(frame) and not check_crc(frame[2:]):
+                        error = "crc_error"
+                except ResponseTimeout:
+                    error = "timeout"
+                    if retries >= max_retries or self._preempted():
+                        raise
+                except Exception:
+                    error = "exception"
+                    raise
+
+                if (error not in RETRYABLE_ERRORS or retries >= max_retries
+                        or self._preempted()):
+                    return frame
+                time.sleep(self.retry.delay(retries + 1))
+                if self._preempted():
+                    # Job mendesak masuk selama backoff: jangan kirim ulang
+                    if frame is None:
+                        raise ResponseTimeout("No response from master")
+                    return frame
+                retries += 1
+                self.retry_count += 1
+        finally:
+            if self.stats is not None:
+                self.stats.record(slave, fc, time.perf_counter() - start,
+                                  len(command) * (retries + 1), len(frame) if frame else 0,
+                                  error, retries)
+
+    def _preempted(self):
+        return self.preempt is not None and self.preempt()
+
+    def timeout_for(self, slave, fc, limit=RESPONSE_TIMEOUT):
+        """Timeout adaptif saat ini untuk satu node/function code"""
+        estimator = self.rtt.get((slave, fc))
+        return limit if estimator is None else estimator.timeout(limit)
+
+    def _transact(self, command, timeout, node=None):
+        if self._serial is None:
+            raise serial.SerialException("Not connected")
+
+        estimator = None
+        wait = timeout
+        if node is not None:
+            estimator = self.rtt.setdefault(node, RttEstimator())
+            wait = estimator.timeout(timeout)
+
+        # Flush buffer sebelum kirim
+        self._serial.reset_input_buffer()
+
+        # Kirim perintah
+        self._serial.write(command)
+        self._parser.reset()
+        sent = time.monotonic()
+        try:
+            frame = self._read_frame(wait)
+        except ResponseTimeout:
+            if wait >= timeout:
+                raise
+            # Timeout adaptif habis lebih dulu: pastikan master idle
+            # sebelum perintah berikutnya, jawaban terlambat tetap dipakai
+            frame = self._resync(sent + timeout)
+            if frame is None:
+                raise
+
+        # RTT hanya dari frame data valid (model node yang sehat)
+        if estimator is not None and not is_error_frame(frame) and frame_node(frame) == node:
+            estimator.update(time.monotonic() - sent)
+        return frame
+
+    def _resync(self, deadline):
+        """Kirim CMD_PING dan baca sampai READY (maks sampai deadline)
+
+        Master memproses perintah berurutan, jadi READY datang setelah
+        transaksi yang masih berjalan selesai. Frame yang datang sebelum
+        READY adalah jawaban terlambat dan dikembalikan; None jika tidak
+        ada (frame hilang, master sudah idle).
+        """
+        self._serial.write(CMD_PING)
+        late = None
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return late
+            try:
+                frame = self._read_frame(remaining, skip_ready=False)
+            except ResponseTimeout:
+                return late
+            if is_ready_frame(frame):
+                return late
+            if late is None:
+                late = frame
+
+    def _read_frame(self, timeout, skip_ready=True):
+        # Blocking read langsung ke parser: frame keluar begitu lengkap,
+        # termasuk frame error 2 byte
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            chunk = self._serial.read(self._parser.needed())
+            for frame in self._parser.feed(chunk):
+                # READY bukan jawaban perintah: sisa handshake atau master
+                # yang baru saja reset
+                if not (skip_ready and is_ready_frame(frame)):
+                    return frame
+
+        raise ResponseTimeout("No response from master")
+
+    # ===== API SENSOR / AKTUATOR =====
+    def read_ultrasonic(self):
+        """Jarak ultrasonik dalam cm"""
+        frame = self.transact(CMD_READ_ULTRASONIC)
+        return check_frame(frame, SLAVE_SENSOR_ADDR, FC_READ_ULTRASONIC)
+
+    def read_tcrt(self):
+        """True jika TCRT5000 mendeteksi objek"""
+        frame = self.transact(CMD_READ_TCRT)
+        return check_frame(frame, SLAVE_SENSOR_ADDR, FC_READ_TCRT5000) == 0x01
+
+    def read_sensors(self):
+        """(jarak cm, TCRT terdeteksi) dalam satu transaksi (FC 0x04)"""
+        frame = self.transact(CMD_READ_SENSORS)
+        distance, tcrt = check_sensors_frame(frame)
+        return distance, tcrt == 0x01
+
+    def passthrough(self, packet, timeout=RESPONSE_TIMEOUT):
+        """Kirim frame slave mentah (lengkap dengan CRC) lewat master
+
+        Mengembalikan response slave apa adanya, termasuk CRC.
+        """
+        frame = self.transact(passthrough_command(packet), timeout)
+        return check_passthrough_frame(frame)
+
+    def read_registers(self, slave=SLAVE_SENSOR_ADDR, start=0, count=SENSOR_REGISTERS):
+        """Blok register 16-bit (FC_READ_REGISTERS) dalam satu transaksi"""
+        response = self.passthrough(encode_read_registers(slave, start, count))
+        return decode_registers(response, slave)
+
+    def set_relay(self, on):
+        """Nyalakan/matikan relay, kembalikan status relay dari aktuator"""
+        command = CMD_CONTROL_RELAY + (CMD_RELAY_ON if on else CMD_RELAY_OFF)
+        frame = self.transact(command)
+        return check_frame(frame, SLAVE_AKTUATOR_ADDR, FC_CONTROL_RELAY) == 0x01
+
+    def read_relay(self):
+        """Baca status relay tanpa mengubahnya"""
+        frame = self.transact(CMD_CONTROL_RELAY + CMD_RELAY_STATUS)
+        return check_frame(frame, SLAVE_AKTUATOR_ADDR, FC_CONTROL_RELAY) == 0x01
@@ -0,0 +1,117 @@
+"""Report-by-exception: deadband dan deteksi perubahan pembacaan sensor
+
+Di antara layer protokol dan konsumen (GUI, recorder, output poller),
+pembacaan hanya diteruskan jika nilainya berubah:
+
+    jarak (FC 0x01)   |baru - terakhir| > max(absolute, percent% * |terakhir|)
+    jarak mm (FC 0x05) sama, absolute tetap dalam cm (dikali 10)
+    TCRT, relay       setiap edge (nilai berbeda dari yang terakhir dilaporkan)
+
+Pembanding selalu nilai terakhir yang *dilaporkan*, bukan yang terakhir
+dibaca, sehingga drift pelan tetap terlapor setelah melewati deadband.
+Heartbeat meneruskan nilai yang sama paling lambat setiap heartbeat
+detik: konsumen yang tidak menerima apa pun lebih lama dari itu tahu
+nilainya basi (link/polling mati), bukan sekadar tidak berubah.
+
+Contoh:
+    change = ChangeFilter(absolute=1.0, percent=2.0, heartbeat=5.0)
+    if change.accept(0x24, FC_READ_ULTRASONIC, distance):
+        publish(distance)
+"""
+import time
+
+from modbus import decode_registers
+from protocol import (
+    FC_READ_ULTRASONIC, FC_READ_TCRT5000, FC_READ_REGISTERS, REG_DISTANCE_MM, REG_TCRT_STATE, SENSOR_REGISTERS,
+    ProtocolError, is_passthrough_frame, split_frame,
+)
+
+HEARTBEAT = 5.0  # Detik, nilai dilaporkan ulang walau tidak berubah
+
+# Function code bernilai analog -> satuan per cm; FC lain (TCRT, relay) dianggap biner
+ANALOG_FUNCTIONS = {FC_READ_ULTRASONIC: 1.0, FC_READ_REGISTERS: 10.0}
+
+
+def frame_readings(frame):
+    """List (slave, fc, value) dari satu frame data
+
+    Frame register (passthrough FC 0x05, blok mulai dari register 0)
+    dipetakan ke jarak sebagai nilai FC 0x05 (mm, resolusi penuh) dan
+    status TCRT sebagai nilai FC 0x02. Frame passthrough lain
+    mengembalikan list kosong.
+    """
+    if is_passthrough_frame(frame):
+        try:
+            registers = decode_registers(frame[2:])
+        except ProtocolError:
+            return []
+        if len(registers) < SENSOR_REGISTERS:
+            return []
+        slave = frame[2]
+        return [(slave, FC_READ_REGISTERS, registers[REG_DISTANCE_MM]),
+                (slave, FC_READ_TCRT5000, registers[REG_TCRT_STATE])]
+    return [(part[0], part[1], part[2]) for part in split_frame(frame)]
+
+
+class ChangeFilter:
+    """Deadband/edge detection per (slave, function code) dengan heartbeat"""
+
+    def __init__(self, absolute=0.0, percent=0.0, heartbeat=HEARTBEAT):
+        self.absolute = absolute
+        self.percent = percent
+        self.heartbeat = heartbeat  # None/0 = tanpa heartbeat
+        self.passed = 0
+        self.suppressed = 0
+        self._last = {}  # (slave, fc) -> (nilai dilaporkan, waktu monotonic)
+
+    def reset(self):
+        """Lupakan nilai terakhir: pembacaan berikutnya selalu diteruskan"""
+        self._last.clear()
+
+    def changed(self, fc, last, value):
+        if fc not in ANALOG_FUNCTIONS:
+            return value != last
+        band = max(self.absolute * ANALOG_FUNCTIONS[fc], abs(last) * self.percent / 100.0)
+        return abs(value - last) > band
+
+    def _due(self, slave, fc, value, now):
+        last = self._last.get((slave, fc))
+        if last is None or self.changed(fc, last[0], value):
+            return True
+        return bool(self.heartbeat) and now - last[1] >= self.heartbeat
+
+    def accept(self, slave, fc, value, now=None):
+        """True jika pembacaan perlu diteruskan ke konsumen"""
+        if now is None:
+            now = time.monotonic()
+        if self._due(slave, fc, value, now):
+            self._last[(slave, fc)] = (value, now)
+            self.passed += 1
+            return True
+        self.suppressed += 1
+        return False
+
+    def accept_frame(self, frame, now=None):
+        """True jika salah satu nilai di frame perlu diteruskan
+
+        Semua nilai frame yang diteruskan menjadi pembanding baru, karena
+        konsumen menerima frame itu utuh.
+        """
+        if now is None:
+            now = time.monotonic()
+        readings = frame_readings(frame)
+        if not readings:
+            return True
+        keep = any(self._due(slave, fc, value, now) for slave, fc, value in readings)
+        if keep:
+            for slave, fc, value in readings:
+                self._last[(slave, fc)] = (value, now)
+            self.passed += 1
+        else:
+            self.suppressed += 1
+        return keep
+
+    def ratio(self):
+        """Fraksi pembacaan yang diteruskan (1.0 = tanpa reduksi)"""
+        total = self.passed + self.suppressed
+        return self.passed / total if total else 1.0
@@ -0,0 +1,132 @@
+"""Query cepat untuk store rekaman recorder.py
+
+Kolom dibuka dengan np.memmap, jadi file tidak pernah di-parse penuh.
+Rentang waktu dicari dengan binary search pada kolom t (recorder
+menulis sampel berurutan waktu).
+
+Contoh:
+    store = RecordingStore("recordings/ttyUSB0")
+    window = store.query(t0, t1, slave=0x24, fc=0x01)
+    buckets = downsample(window["t"], window["value"], 500)
+"""
+import json
+import os
+
+import numpy as np
+
+from recorder import COLUMNS, column_path
+
+
+class RecordingStore:
+    """Akses read-only ke satu direktori rekaman"""
+
+    def __init__(self, path):
+        self.path = path
+        meta_path = os.path.join(path, "meta.json")
+        if not os.path.exists(meta_path):
+            raise FileNotFoundError(f"Not a recording store: {path}")
+        with open(meta_path, encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self.reload()
+
+    def reload(self):
+        """Petakan ulang kolom (mis. setelah recorder menambah data)"""
+        dtypes = {c["name"]: c["dtype"] for c in self.meta["columns"]}
+        columns = {}
+        for name, _ in COLUMNS:
+            dtype = np.dtype(dtypes[name])
+            path = column_path(self.path, name)
+            size = os.path.getsize(path) // dtype.itemsize if os.path.exists(path) else 0
+            columns[name] = (np.memmap(path, dtype=dtype, mode="r", shape=(size,))
+                             if size else np.empty(0, dtype=dtype))
+
+        # Kolom bisa beda panjang jika proses berhenti di tengah flush
+        self.length = min(len(c) for c in columns.values())
+        self.columns = {name: c[:self.length] for name, c in columns.items()}
+
+    def __len__(self):
+        return self.length
+
+    def time_range(self):
+        """(t pertama, t terakhir) atau None jika kosong"""
+        if not self.length:
+            return None
+        t = self.columns["t"]
+        return float(t[0]), float(t[-1])
+
+    def channels(self):
+        """Daftar (slave, fc) yang ada di rekaman"""
+        if not self.length:
+            return []
+        keys = np.unique(self.columns["slave"].astype(np.uint16) << 8 | self.columns["fc"])
+        return [(int(k) >> 8, int(k) & 0xFF) for k in keys]
+
+    def query(self, t_start=None, t_end=None, slave=None, fc=None):
+        """Sampel dalam [t_start, t_end], difilter per slave/fc
+
+        Mengembalikan dict kolom -> array. Tanpa filter, array berupa view
+        memmap (tanpa salinan).
+        """
+        t = self.columns["t"]
+        lo = 0 if t_start is None else int(np.searchsorted(t, t_start, side="left"))
+        hi = self.length if t_end is None else int(np.searchsorted(t, t_end, side="right"))
+        window = {name: c[lo:hi] for name, c in self.columns.items()}
+
+        if slave is None and fc is None:
+            return window
+
+        mask = np.ones(hi - lo, dtype=bool)
+        if slave is not None:
+            mask &= window["slave"] == slave
+        if fc is not None:
+            mask &= window["fc"] == fc
+        return {name: c[mask] for name, c in window.items()}
+
+
+def downsample(t, value, buckets, t_start=None, t_end=None):
+    """Bagi rentang waktu jadi N bucket, hitung min/max/mean per bucket
+
+    Mengembalikan dict array: t (tengah bucket), min, max, mean, count.
+    Bucket tanpa sampel diisi NaN (count = 0).
+    """
+    if t_start is None:
+        t_start = float(t[0]) if len(t) else 0.0
+    if t_end is None:
+        t_end = float(t[-1]) if len(t) else 0.0
+    if t_end <= t_start:
+        t_end = t_start + 1e-6
+
+    edges = np.linspace(t_start, t_end, buckets + 1)
+    starts = np.searchsorted(t, edges[:-1], side="left")
+    ends = np.searchsorted(t, edges[1:], side="left")
+    ends[-1] = np.searchsorted(t, edges[-1], side="right")
+    counts = ends - starts
+
+    result = {
+        "t": (edges[:-1] + edges[1:]) / 2.0,
+        "min": np.full(buckets, np.nan),
+        "max": np.full(buckets, np.nan),
+        "mean": np.full(buckets, np.nan),
+        "count": counts,
+    }
+
+    filled = counts > 0
+    if filled.any():
+        # reduceat menjumlah sampai indeks berikutnya/akhir array: potong ke
+        # rentang bucket agar sampel setelah t_end tidak ikut bucket terakhir
+        first = starts[0]
+        values = np.asarray(value[first:ends[-1]], dtype=np.float64)
+        idx = starts[filled] - first
+        result["min"][filled] = np.minimum.reduceat(values, idx)[:len(idx)]
+        result["max"][filled] = np.maximum.reduceat(values, idx)[:len(idx)]
+        sums = np.add.reduceat(values, idx)[:len(idx)]
+        result["mean"][filled] = sums / counts[filled]
+    return result
+
+
+def iter_replay(store, t_start=None, t_end=None):
+    """Iterasi (t, slave, fc, value) sesuai urutan rekaman"""
+    window = store.query(t_start, t_end)
+    t, slave, fc, value = (window[name] for name, _ in COLUMNS)
+    for i in range(len(t)):
+        yield float(t[i]), int(slave[i]), int(fc[i]), int(value[i])
@@ -0,0 +1,279 @@
+import math
+import os
+import time
+
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
+                             QPushButton, QComboBox, QDateTimeEdit, QFileDialog)
+from PyQt5.QtCore import QDateTime, pyqtSignal
+from PyQt5.QtGui import QFont
+
+from history import RecordingStore, downsample, iter_replay
+from plotwidget import BucketPlot
+from protocol import (SLAVE_SENSOR_ADDR, SLAVE_AKTUATOR_ADDR,
+                      FC_READ_ULTRASONIC, FC_READ_TCRT5000, FC_CONTROL_RELAY, FC_READ_REGISTERS)
+from segment import RECORDINGS_DIR
+
+# Judul, alamat slave, function code, satuan
+HISTORY_CHANNELS = [
+    ("Ultrasonik (0x24 / FC 0x01)", SLAVE_SENSOR_ADDR, FC_READ_ULTRASONIC, " cm"),
+    ("Ultrasonik register (0x24 / FC 0x05)", SLAVE_SENSOR_ADDR, FC_READ_REGISTERS, " mm"),
+    ("TCRT5000 (0x24 / FC 0x02)", SLAVE_SENSOR_ADDR, FC_READ_TCRT5000, ""),
+    ("Relay (0x66 / FC 0x03)", SLAVE_AKTUATOR_ADDR, FC_CONTROL_RELAY, ""),
+]
+HISTORY_SPANS = [
+    ("Last 10 min", 600),
+    ("Last hour", 3600),
+    ("Last 24 h", 86400),
+    ("All", None),
+]
+REPLAY_SPEEDS = [1, 10, 60, 100]
+DATETIME_FORMAT = "yyyy-MM-dd HH:mm:ss"
+
+
+def to_qdatetime(t):
+    return QDateTime.fromMSecsSinceEpoch(int(t * 1000))
+
+
+def from_qdatetime(value):
+    return value.toMSecsSinceEpoch() / 1000.0
+
+
+class HistoryDialog(QDialog):
+    """Lihat rentang waktu dari store rekaman dan putar ulang ke panel segmen"""
+
+    replay_requested = pyqtSignal(str, object, float)  # nama segmen, sampel, speed
+    log_message = pyqtSignal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Recorded History")
+        self.resize(820, 420)
+        self.store = None
+
+        self.init_ui()
+        self.refresh_stores()
+
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setSpacing(10)
+
+        # ===== STORE =====
+        store_layout = QHBoxLayout()
+        store_label = QLabel("Recording:")
+        store_label.setFont(QFont("Arial", 10))
+        store_layout.addWidget(store_label)
+
+        self.store_combo = QComboBox()
+        self.store_combo.setMinimumWidth(250)
+        self.store_combo.setEditable(True)
+        store_layout.addWidget(self.store_combo, 1)
+
+        browse_btn = QPushButton("Browse...")
+        browse_btn.clicked.connect(self.browse_store)
+        browse_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #95a5a6;
+                color: white;
+                border: none;
+                padding: 8px;
+                border-radius: 4px;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background-color: #7f8c8d;
+            }
+        """)
+        store_layout.addWidget(browse_btn)
+
+        open_btn = QPushButton("Open")
+        open_btn.setFixedWidth(100)
+        open_btn.clicked.connect(self.open_store)
+        open_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #3498db;
+                color: white;
+                border: none;
+                padding: 8px;
+                border-radius: 4px;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background-color: #2980b9;
+            }
+        """)
+        store_layout.addWidget(open_btn)
+        layout.addLayout(store_layout)
+
+        # ===== RENTANG WAKTU DAN CHANNEL =====
+        query_layout = QHBoxLayout()
+        self.span_combo = QComboBox()
+        for title, _ in HISTORY_SPANS:
+            self.span_combo.addItem(title)
+        self.span_combo.setCurrentIndex(len(HISTORY_SPANS) - 1)
+        self.span_combo.currentIndexChanged.connect(self.apply_span)
+        query_layout.addWidget(self.span_combo)
+
+        self.start_edit = QDateTimeEdit()
+        self.start_edit.setDisplayFormat(DATETIME_FORMAT)
+        query_layout.addWidget(self.start_edit)
+        to_label = QLabel("→")
+        query_layout.addWidget(to_label)
+        self.end_edit = QDateTimeEdit()
+        self.end_edit.setDisplayFormat(DATETIME_FORMAT)
+        query_layout.addWidget(self.end_edit)
+
+        self.channel_combo = QComboBox()
+        for title, *_ in HISTORY_CHANNELS:
+            self.channel_combo.addItem(title)
+        query_layout.addWidget(self.channel_combo)
+
+        self.load_btn = QPushButton("Load")
+        self.load_btn.setFixedWidth(100)
+        self.load_btn.clicked.connect(self.load_window)
+        self.load_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #27ae60;
+                color: white;
+                border: none;
+                padding: 8px;
+                border-radius: 4px;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background-color: #229954;
+            }
+        """)
+        query_layout.addWidget(self.load_btn)
+        layout.addLayout(query_layout)
+
+        # ===== PLOT =====
+        self.plot = BucketPlot()
+        layout.addWidget(self.plot, 1)
+
+        self.info_label = QLabel("No recording opened")
+        self.info_label.setFont(QFont("Arial", 9))
+        layout.addWidget(self.info_label)
+
+        # ===== REPLAY =====
+        replay_layout = QHBoxLayout()
+        replay_layout.addStretch()
+        speed_label = QLabel("Replay speed:")
+        speed_label.setFont(QFont("Arial", 10))
+        replay_layout.addWidget(speed_label)
+
+        self.speed_combo = QComboBox()
+        for speed in REPLAY_SPEEDS:
+            self.speed_combo.addItem(f"{speed}x", speed)
+        replay_layout.addWidget(self.speed_combo)
+
+        self.replay_btn = QPushButton("▶ Replay")
+        self.replay_btn.setFixedWidth(120)
+        self.replay_btn.clicked.connect(self.replay_window)
+        self.replay_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #8e44ad;
+                color: white;
+                border: none;
+                padding: 8px;
+                border-radius: 4px;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background-color: #7d3c98;
+            }
+        """)
+        replay_layout.addWidget(self.replay_btn)
+        layout.addLayout(replay_layout)
+
+        self.set_store_loaded(False)
+
+    def set_store_loaded(self, loaded):
+        for widget in (self.load_btn, self.replay_btn, self.start_edit, self.end_edit):
+            widget.setEnabled(loaded)
+
+    def refresh_stores(self):
+        """Daftar store di direktori rekaman default"""
+        self.store_combo.clear()
+        if not os.path.isdir(RECORDINGS_DIR):
+            return
+        for name in sorted(os.listdir(RECORDINGS_DIR)):
+            path = os.path.join(RECORDINGS_DIR, name)
+            if os.path.exists(os.path.join(path, "meta.json")):
+                self.store_combo.addItem(path)
+
+    def browse_store(self):
+        path = QFileDialog.getExistingDirectory(self, "Open recording", RECORDINGS_DIR)
+        if path:
+            self.store_combo.setEditText(path)
+            self.open_store()
+
+    def open_store(self):
+        """Buka store dan set rentang waktu ke seluruh rekaman"""
+        path = self.store_combo.currentText()
+        try:
+            self.store = RecordingStore(path)
+        except Exception as e:
+            self.store = None
+            self.set_store_loaded(False)
+            self.info_label.setText(f"❌ {str(e)}")
+            return
+
+        time_range = self.store.time_range()
+        if time_range is None:
+            self.set_store_loaded(False)
+            self.plot.clear()
+            self.info_label.setText(f"Recording {path} is empty")
+            return
+
+        self.set_store_loaded(True)
+        self.apply_span()
+        self.info_label.setText(f"{len(self.store)} samples")
+        self.load_window()
+
+    def apply_span(self):
+        """Set rentang waktu relatif terhadap akhir rekaman"""
+        if self.store is None:
+            return
+        time_range = self.store.time_range()
+        if time_range is None:
+            return
+        first, last = time_range
+        span = HISTORY_SPANS[self.span_combo.currentIndex()][1]
+        start = first if span is None else max(first, last - span)
+        # Resolusi editor 1 detik, bulatkan keluar agar sampel tepi ikut
+        self.start_edit.setDateTime(to_qdatetime(math.floor(start)))
+        self.end_edit.setDateTime(to_qdatetime(math.ceil(last)))
+
+    def selected_window(self):
+        return from_qdatetime(self.start_edit.dateTime()), from_qdatetime(self.end_edit.dateTime())
+
+    def load_window(self):
+        """Query rentang waktu dan tampilkan bucket min/max/mean"""
+        if self.store is None:
+            return
+        started = time.perf_counter()
+        self.store.reload()
+        t_start, t_end = self.selected_window()
+        _, slave, fc, unit = HISTORY_CHANNELS[self.channel_combo.currentIndex()]
+
+        data = self.store.query(t_start, t_end, slave=slave, fc=fc)
+        # Satu bucket per piksel lebar plot
+        buckets = max(100, self.plot.width())
+        result = downsample(data["t"], data["value"], buckets, t_start, t_end)
+        self.plot.unit = unit
+        self.plot.set_buckets(result["t"], result["min"], result["max"], result["mean"])
+
+        elapsed = (time.perf_counter() - started) * 1000.0
+        self.info_label.setText(
+            f"{len(data['t'])} samples in window ({len(self.store)} total), "
+            f"{buckets} buckets, loaded in {elapsed:.0f} ms")
+
+    def replay_window(self):
+        """Putar ulang rentang waktu ke panel segmen read-only"""
+        if self.store is None:
+            return
+        t_start, t_end = self.selected_window()
+        speed = self.speed_combo.currentData()
+        name = f"replay:{os.path.basename(os.path.normpath(self.store.path))}"
+        self.replay_requested.emit(name, iter_replay(self.store, t_start, t_end), float(speed))
+        self.log_message.emit(f"▶ Replaying {self.store.path} at {speed}x")
@@ -0,0 +1,147 @@
+"""Deteksi port hilang dan reconnect otomatis (hot-plug USB)
+
+Saat port pertama kali dibuka, identitas USB-nya (VID:PID + serial number,
+atau lokasi port USB) dicatat. Setelah link putus, list_ports di-enumerate
+ulang di thread worker sampai perangkat yang sama muncul lagi, walaupun
+nama device-nya berubah (mis. /dev/ttyUSB0 menjadi /dev/ttyUSB1).
+
+Port yang tidak terdaftar di list_ports (URL pyserial, sim://, pty dari
+simulator.py) tidak di-enumerate: cukup dicoba dibuka ulang.
+
+Cek presence selama port terbuka berjalan di thread PresenceMonitor:
+list_ports.comports() bisa makan puluhan ms di mesin dengan banyak
+device, dan di thread worker ia akan menunda semua channel polling.
+"""
+import os
+import threading
+import time
+
+from serial.tools import list_ports
+
+PRESENCE_INTERVAL = 1.0    # Detik, cek perangkat masih ada (thread monitor)
+RECONNECT_INTERVAL = 0.2   # Detik, jeda awal antar percobaan reconnect
+RECONNECT_MAX_INTERVAL = 1.0  # Detik, batas backoff agar recovery tetap cepat
+
+
+def is_url(port):
+    """URL pyserial/sim:// tidak muncul di list_ports"""
+    return "://" in port
+
+
+def port_identity(info):
+    """Identitas stabil ListPortInfo, None jika bukan perangkat USB"""
+    if info.vid is None:
+        return None
+    if info.serial_number:
+        return (info.vid, info.pid, info.serial_number)
+    return (info.vid, info.pid, info.location)
+
+
+class PortSupervisor:
+    """State reconnect untuk satu port, dipakai oleh thread worker"""
+
+    def __init__(self, port):
+        self.port = port      # Nama yang dipilih user (kunci segmen)
+        self.device = port    # Nama device yang sedang dipakai
+        self.identity = None
+        self.enumerated = False  # Device terdaftar di list_ports
+        self.lost = False
+        self.attempts = 0
+        self.lost_at = None
+        self._next_check = 0.0
+        self._interval = RECONNECT_INTERVAL
+
+    def attached(self, device):
+        """Port berhasil dibuka: catat identitas USB-nya"""
+        self.device = device
+        self.lost = False
+        self.attempts = 0
+        self._interval = RECONNECT_INTERVAL
+        self.enumerated = False
+        if not is_url(device):
+            for info in list_ports.comports():
+                if info.device == device:
+                    self.enumerated = True
+                    self.identity = port_identity(info) or self.identity
+                    break
+
+    def detached(self):
+        """Link putus: mulai mencoba reconnect"""
+        if not self.lost:
+            self.lost = True
+            self.lost_at = time.monotonic()
+            self._interval = RECONNECT_INTERVAL
+            self._next_check = time.monotonic()
+
+    def wait_time(self, now):
+        """Detik sampai percobaan reconnect berikutnya"""
+        return max(0.0, self._next_check - now)
+
+    def due(self, now):
+        return now >= self._next_check
+
+    def present(self):
+        """Apakah device masih terdaftar (dipanggil dari PresenceMonitor)"""
+        if not self.enumerated:
+            return is_url(self.device) or os.path.exists(self.device)
+        return any(info.device == self.device for info in list_ports.comports())
+
+    def candidate(self):
+        """Device untuk percobaan reconnect berikutnya, None jika belum ada
+
+        Jadwal percobaan berikutnya mundur bertahap sampai
+        RECONNECT_MAX_INTERVAL.
+        """
+        self.attempts += 1
+        self._next_check = time.monotonic() + self._interval
+        self._interval = min(RECONNECT_MAX_INTERVAL, self._interval * 1.5)
+
+        if not self.enumerated:
+            if is_url(self.device) or os.path.exists(self.device):
+                return self.device
+            return None
+
+        devices = list_ports.comports()
+        if self.identity is not None:
+            for info in devices:
+                if port_identity(info) == self.identity:
+                    return info.device
+            return None
+        if any(info.device == self.device for info in devices):
+            return self.device
+        return None
+
+
+class PresenceMonitor:
+    """Cek PortSupervisor.present() periodik di thread sendiri
+
+    Monitor hanya melapor lewat on_removed(device); thread worker yang
+    menutup port dan memulai reconnect, jadi I/O serial tetap di satu
+    thread.
+    """
+
+    def __init__(self, supervisor, on_removed, interval=PRESENCE_INTERVAL):
+        self.supervisor = supervisor
+        self.on_removed = on_removed
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        """Hentikan monitor; setelah kembali on_removed tidak dipanggil lagi"""
+        self._stop.set()
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            # Paling lama selama satu present() yang sedang berjalan
+            self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            supervisor = self.supervisor
+            if supervisor.lost:
+                continue
+            device = supervisor.device
+            if not supervisor.present() and not self._stop.is_set():
+                self.on_removed(device)
@@ -0,0 +1,86 @@
+import threading
+import time
+from collections import deque
+
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import QPlainTextEdit
+
+# ===== KONFIGURASI LOG =====
+LOG_CAPACITY = 5000      # Baris maksimum yang disimpan di view
+FLUSH_INTERVAL = 100     # ms, flush batch ke view
+
+
+class LogBuffer:
+    """Ring buffer baris log dengan kapasitas tetap (thread-safe)"""
+
+    def __init__(self, capacity=LOG_CAPACITY):
+        self._lines = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    def append(self, line):
+        with self._lock:
+            if len(self._lines) == self._lines.maxlen:
+                self.dropped += 1
+            self._lines.append(line)
+
+    def drain(self):
+        """Ambil semua baris yang belum ditampilkan"""
+        with self._lock:
+            lines = list(self._lines)
+            self._lines.clear()
+            dropped, self.dropped = self.dropped, 0
+        return lines, dropped
+
+    def log(self, message):
+        """Tambah pesan dengan timestamp (boleh dari thread mana saja)"""
+        self.append(f"[{time.strftime('%H:%M:%S')}] {message}")
+
+    def clear(self):
+        with self._lock:
+            self._lines.clear()
+            self.dropped = 0
+
+
+class LogView(QPlainTextEdit):
+    """View log dengan jumlah baris terbatas dan update per batch
+
+    log() hanya menambah baris ke LogBuffer. Timer frame memindahkan
+    semua baris baru ke view dalam satu appendPlainText, dan scroll
+    hanya diperbarui sekali per flush. buffer yang sudah ada boleh
+    diberikan, mis. berisi log sebelum view dibuat.
+    """
+
+    def __init__(self, capacity=LOG_CAPACITY, flush_interval=FLUSH_INTERVAL, parent=None,
+                 buffer=None):
+        super().__init__(parent)
+        self.setReadOnly(True)
+        self.setMaximumBlockCount(capacity)
+        self.buffer = LogBuffer(capacity) if buffer is None else buffer
+
+        self._flush_timer = QTimer(self)
+        self._flush_timer.timeout.connect(self.flush)
+        self._flush_timer.start(flush_interval)
+
+    def log(self, message):
+        """Tambah pesan ke log (boleh dari thread mana saja)"""
+        self.buffer.log(message)
+
+    def flush(self):
+        lines, dropped = self.buffer.drain()
+        if not lines:
+            return
+
+        if dropped:
+            lines.insert(0, f"... {dropped} log lines dropped ...")
+
+        scrollbar = self.verticalScrollBar()
+        at_bottom = scrollbar.value() == scrollbar.maximum()
+        self.appendPlainText("\n".join(lines))
+        # Auto scroll hanya jika user tidak sedang melihat log lama
+        if at_bottom:
+            scrollbar.setValue(scrollbar.maximum())
+
+    def clear_log(self):
+        self.buffer.clear()
+        self.clear()
@@ -1,6 +1,28 @@
 #include <Arduino.h>
-#include <SoftwareSerial.h>
-SoftwareSerial rs485(2, 3); // RX=2, TX=3
+
+// ===== BAUD RATE =====
+// RS485_BAUD harus sama di master.ino, sensor.ino dan aktuator.ino.
+// HOST_BAUD = baud rate USB ke Python (pilih yang sama di combo Baud GUI).
+// Pilihan: 9600, 19200, 38400, 57600, 115200. SoftwareSerial di AVR
+// 16 MHz tidak andal di atas 57600; untuk 115200 pakai RS485_HW_UART.
+#define HOST_BAUD            9600
+#define RS485_BAUD           9600
+
+// ===== PORT RS-485 =====
+// Aktifkan untuk board dengan UART hardware kedua (Mega, Leonardo, ...):
+// RS-485 lewat Serial1 (Mega: RX1=19, TX1=18) tanpa overhead interrupt
+// SoftwareSerial. Di Uno hanya ada satu UART hardware (dipakai USB).
+// #define RS485_HW_UART
+
+#ifdef RS485_HW_UART
+  #ifndef HAVE_HWSERIAL1
+    #error "RS485_HW_UART membutuhkan board dengan Serial1"
+  #endif
+  HardwareSerial &rs485 = Serial1;
+#else
+  #include <SoftwareSerial.h>
+  SoftwareSerial rs485(2, 3); // RX=2, TX=3
+#endif
 
 // ===== KONFIGURASI NODE =====
 #define SLAVE_SENSOR_ADDR    0x24
@@ -10,22 +32,67 @@ SoftwareSerial rs485(2, 3); // RX=2, TX=3
 #define CMD_READ_ULTRASONIC  'U'
 #define CMD_READ_TCRT        'T'
 #define CMD_CONTROL_RELAY    'R'
+#define CMD_PING             'P'  // Handshake: jawab frame READY
+#define CMD_READ_SENSORS     'S'  // Ultrasonik + TCRT dalam satu transaksi
+#define CMD_PASSTHROUGH      'X'  // 'X' [LEN] [frame slave mentah dari host]
 
 // ===== FUNCTION CODE MODBUS =====
 #define FC_READ_ULTRASONIC   0x01
 #define FC_READ_TCRT5000     0x02
 #define FC_CONTROL_RELAY     0x03
+#define FC_READ_SENSORS      0x04
+
+// ===== FRAME STATUS KE PYTHON =====
+#define STATUS_MARKER        0xFF
+#define STATUS_READY         0xA5  // [0xFF][0xA5] = master siap
+#define ERR_REQUEST          0xE3  // Request passthrough tidak valid
+
+// ===== PASSTHROUGH =====
+// Ke Python: [0xFE][LEN][response slave LEN byte apa adanya]. Host yang
+// membangun frame dan mengecek CRC; master hanya meneruskan byte.
+#define PASSTHROUGH_MARKER   0xFE
+#define PASSTHROUGH_MAX_REQUEST   16
+#define PASSTHROUGH_MAX_RESPONSE  32
+#define HOST_BYTE_TIMEOUT    100  // ms, sama dengan tunggu byte relay
+#define FRAME_GAP            5    // ms tanpa byte = akhir response slave
 
 // ===== TIMEOUT =====
 #define RESPONSE_TIMEOUT     200  // Timeout lebih panjang untuk modul TX/RX
+// Jeda setelah kirim request (switching modul TX/RX + proses slave).
+// Response slave tetap di-buffer selama jeda, jadi di baud tinggi cukup
+// jeda pendek agar transaksi tidak didominasi delay.
+#if RS485_BAUD >= 57600
+  #define TURNAROUND_DELAY   2
+#else
+  #define TURNAROUND_DELAY   20
+#endif
+#define MIN_SLAVE_TIMEOUT    40   // Batas bawah timeout adaptif (pulseIn ultrasonik maks 30 ms)
+#define TIMEOUT_K            4    // Timeout = rata-rata + K * deviasi latency slave
+
+// Latency byte pertama per (slave, function code) dalam ms, sama seperti
+// RttEstimator di client Python: di slave 0x24 ultrasonik menunggu echo
+// (pulseIn sampai 30 ms) sedangkan TCRT hanya analogRead, jadi sampel TCRT
+// tidak boleh memperpendek timeout pembacaan ultrasonik.
+#define LATENCY_SLOTS        8    // Pasangan (slave, FC) yang dilacak
+struct LatencySlot {
+  uint8_t addr;
+  uint8_t fc;
+  float latency;     // Negatif = belum pernah menjawab, pakai RESPONSE_TIMEOUT penuh
+  float latencyDev;
+};
+LatencySlot latencySlots[LATENCY_SLOTS];
+uint8_t latencySlotCount = 0;
 
 void setup() {
-  Serial.begin(9600);
-  rs485.begin(9600);
+  Serial.begin(HOST_BAUD);
+  rs485.begin(RS485_BAUD);
   
   // Flush buffer awal
   while(rs485.available()) rs485.read();
   while(Serial.available()) Serial.read();
+  
+  // Beri tahu host bahwa master siap (host tidak perlu sleep 2 detik)
+  sendReady();
 }
 
 void loop() {
@@ -38,6 +105,12 @@ void loop() {
     } else if (inByte == CMD_READ_TCRT) {
       requestSensorData(SLAVE_SENSOR_ADDR, FC_READ_TCRT5000);
       
+    } else if (inByte == CMD_READ_SENSORS) {
+      requestSensorData(SLAVE_SENSOR_ADDR, FC_READ_SENSORS);
+      
+    } else if (inByte == CMD_PING) {
+      sendReady();
+      
     } else if (inByte == CMD_CONTROL_RELAY) {
       // Tunggu byte berikutnya untuk relay command
       unsigned long waitStart = millis();
@@ -47,10 +120,60 @@ void loop() {
         uint8_t relayCmd = Serial.read();
         controlRelay(relayCmd);
       }
+      
+    } else if (inByte == CMD_PASSTHROUGH) {
+      passthrough();
     }
   }
 }
 
+// ===== HANDSHAKE =====
+void sendReady() {
+  Serial.write(STATUS_MARKER);
+  Serial.write(STATUS_READY);
+}
+
+// ===== TIMEOUT ADAPTIF PER (SLAVE, FC) =====
+// Index slot untuk (slave, FC), -1 jika belum ada (atau tabel penuh)
+int8_t latencySlot(uint8_t slaveAddr, uint8_t functionCode, bool create) {
+  for (uint8_t i = 0; i < latencySlotCount; i++) {
+    if (latencySlots[i].addr == slaveAddr && latencySlots[i].fc == functionCode) return i;
+  }
+  if (!create || latencySlotCount == LATENCY_SLOTS) return -1;
+  
+  LatencySlot &slot = latencySlots[latencySlotCount];
+  slot.addr = slaveAddr;
+  slot.fc = functionCode;
+  slot.latency = -1;
+  slot.latencyDev = 0;
+  return latencySlotCount++;
+}
+
+unsigned long slaveTimeout(uint8_t slaveAddr, uint8_t functionCode) {
+  int8_t i = latencySlot(slaveAddr, functionCode, false);
+  if (i < 0 || latencySlots[i].latency < 0) return RESPONSE_TIMEOUT;
+  
+  LatencySlot &slot = latencySlots[i];
+  unsigned long t = slot.latency + TIMEOUT_K * slot.latencyDev;
+  return constrain(t, MIN_SLAVE_TIMEOUT, RESPONSE_TIMEOUT);
+}
+
+void updateSlaveLatency(uint8_t slaveAddr, uint8_t functionCode, unsigned long latency) {
+  int8_t i = latencySlot(slaveAddr, functionCode, true);
+  if (i < 0) return;  // Tabel penuh: node ini tetap memakai RESPONSE_TIMEOUT
+  
+  LatencySlot &slot = latencySlots[i];
+  if (slot.latency < 0) {
+    slot.latency = latency;
+    slot.latencyDev = latency / 2.0;
+    return;
+  }
+  // EWMA seperti estimator RTT di client Python
+  float err = latency - slot.latency;
+  slot.latency += 0.125 * err;
+  slot.latencyDev += 0.25 * (fabs(err) - slot.latencyDev);
+}
+
 // ===== REQUEST DATA SENSOR =====
 void requestSensorData(uint8_t slaveAddr, uint8_t functionCode) {
   // Clear RX buffer sebelum kirim
@@ -71,28 +194,37 @@ void requestSensorData(uint8_t slaveAddr, uint8_t functionCode) {
   rs485.flush();  // PENTING: Tunggu transmisi selesai
   
   // Delay untuk switching dan processing
-  delay(20);
+  delay(TURNAROUND_DELAY);
   
-  // Baca response
-  uint8_t response[5];
+  // Baca response: [ADDR][FC][DATA...][CRC_L][CRC_H]
+  // FC_READ_SENSORS membawa 2 byte data (jarak, TCRT), lainnya 1 byte
+  uint8_t dataLen = functionCode == FC_READ_SENSORS ? 2 : 1;
+  uint8_t frameLen = 2 + dataLen;
+  uint8_t responseLen = frameLen + 2;
+  uint8_t response[6];
   uint8_t idx = 0;
-  unsigned long timeout = millis();
+  unsigned long limit = slaveTimeout(slaveAddr, functionCode);
+  unsigned long start = millis();
+  unsigned long timeout = start;
+  unsigned long latency = 0;
   
-  while (idx < 5 && (millis() - timeout) < RESPONSE_TIMEOUT) {
+  while (idx < responseLen && (millis() - timeout) < limit) {
     if (rs485.available() > 0) {
+      if (idx == 0) latency = millis() - start;
       response[idx++] = rs485.read();
       timeout = millis(); // Reset timeout setiap byte diterima
     }
   }
   
   // Validasi response
-  if (idx == 5) {
-    uint16_t receivedCRC = (response[4] << 8) | response[3];
-    uint16_t calculatedCRC = calculateCRC(response, 3);
+  if (idx == responseLen) {
+    uint16_t receivedCRC = (response[frameLen + 1] << 8) | response[frameLen];
+    uint16_t calculatedCRC = calculateCRC(response, frameLen);
     
     if (receivedCRC == calculatedCRC && response[0] == slaveAddr) {
-      // Kirim ke Python: [ADDR][FC][DATA]
-      Serial.write(response, 3);
+      updateSlaveLatency(slaveAddr, functionCode, latency);
+      // Kirim ke Python: [ADDR][FC][DATA] atau [ADDR][FC][JARAK][TCRT]
+      Serial.write(response, frameLen);
     } else {
       // Debug: kirim error indicator
       Serial.write(0xFF); // Error byte
@@ -125,15 +257,19 @@ void controlRelay(uint8_t command) {
   rs485.flush();
   
   // Delay untuk switching dan processing
-  delay(20);
+  delay(TURNAROUND_DELAY);
   
   // Baca response
   uint8_t response[5];
   uint8_t idx = 0;
-  unsigned long timeout = millis();
+  unsigned long limit = slaveTimeout(SLAVE_AKTUATOR_ADDR, FC_CONTROL_RELAY);
+  unsigned long start = millis();
+  unsigned long timeout = start;
+  unsigned long latency = 0;
   
-  while (idx < 5 && (millis() - timeout) < RESPONSE_TIMEOUT) {
+  while (idx < 5 && (millis() - timeout) < limit) {
     if (rs485.available() > 0) {
+      if (idx == 0) latency = millis() - start;
       response[idx++] = rs485.read();
       timeout = millis();
     }
@@ -145,6 +281,7 @@ void controlRelay(uint8_t command) {
     uint16_t calculatedCRC = calculateCRC(response, 3);
     
     if (receivedCRC == calculatedCRC && response[0] == SLAVE_AKTUATOR_ADDR) {
+      updateSlaveLatency(SLAVE_AKTUATOR_ADDR, FC_CONTROL_RELAY, latency);
       Serial.write(response, 3);
     } else {
       Serial.write(0xFF);
@@ -156,22 +293,124 @@ void controlRelay(uint8_t command) {
   }
 }
 
+// ===== PASSTHROUGH FRAME MENTAH =====
+bool readHostByte(uint8_t *value) {
+  unsigned long waitStart = millis();
+  while (!Serial.available()) {
+    if ((millis() - waitStart) >= HOST_BYTE_TIMEOUT) return false;
+  }
+  *value = Serial.read();
+  return true;
+}
+
+void passthrough() {
+  uint8_t len;
+  uint8_t request[PASSTHROUGH_MAX_REQUEST];
+  
+  // Terima [LEN][frame] dari host
+  if (!readHostByte(&len) || len == 0 || len > PASSTHROUGH_MAX_REQUEST) {
+    Serial.write(STATUS_MARKER);
+    Serial.write(ERR_REQUEST);
+    return;
+  }
+  for (uint8_t i = 0; i < len; i++) {
+    if (!readHostByte(&request[i])) {
+      Serial.write(STATUS_MARKER);
+      Serial.write(ERR_REQUEST);
+      return;
+    }
+  }
+  
+  // Kirim frame apa adanya (CRC sudah dihitung host)
+  while(rs485.available()) rs485.read();
+  rs485.write(request, len);
+  rs485.flush();
+  
+  delay(TURNAROUND_DELAY);
+  
+  // Baca response sampai bus diam FRAME_GAP ms (panjang tidak diketahui)
+  uint8_t slaveAddr = request[0];
+  uint8_t functionCode = len > 1 ? request[1] : 0;
+  uint8_t response[PASSTHROUGH_MAX_RESPONSE];
+  uint8_t idx = 0;
+  unsigned long limit = slaveTimeout(slaveAddr, functionCode);
+  unsigned long start = millis();
+  unsigned long last = start;
+  unsigned long latency = 0;
+  
+  while (idx < PASSTHROUGH_MAX_RESPONSE) {
+    if (rs485.available() > 0) {
+      if (idx == 0) latency = millis() - start;
+      response[idx++] = rs485.read();
+      last = millis();
+    } else if ((millis() - last) >= (idx == 0 ? limit : FRAME_GAP)) {
+      break;
+    }
+  }
+  
+  if (idx == 0) {
+    Serial.write(0xFF);
+    Serial.write(0xE2); // Timeout error
+    return;
+  }
+  
+  // Latency hanya dari response utuh, sama seperti requestSensorData
+  if (idx > 2 && response[0] == slaveAddr) {
+    uint16_t receivedCRC = (response[idx - 1] << 8) | response[idx - 2];
+    if (receivedCRC == calculateCRC(response, idx - 2)) {
+      updateSlaveLatency(slaveAddr, functionCode, latency);
+    }
+  }
+  
+  Serial.write(PASSTHROUGH_MARKER);
+  Serial.write(idx);
+  Serial.write(response, idx);
+}
+
 // ===== CRC16 MODBUS =====
+// Tabel CRC16 (polinomial 0xA001) di flash: satu lookup per byte,
+// bukan 8 iterasi shift/xor. Sama dengan CRC_TABLE di modbus.py.
+const uint16_t CRC_TABLE[256] PROGMEM = {
+  0x0000, 0xC0C1, 0xC181, 0x0140, 0xC301, 0x03C0, 0x0280, 0xC241,
+  0xC601, 0x06C0, 0x0780, 0xC741, 0x0500, 0xC5C1, 0xC481, 0x0440,
+  0xCC01, 0x0CC0, 0x0D80, 0xCD41, 0x0F00, 0xCFC1, 0xCE81, 0x0E40,
+  0x0A00, 0xCAC1, 0xCB81, 0x0B40, 0xC901, 0x09C0, 0x0880, 0xC841,
+  0xD801, 0x18C0, 0x1980, 0xD941, 0x1B00, 0xDBC1, 0xDA81, 0x1A40,
+  0x1E00, 0xDEC1, 0xDF81, 0x1F40, 0xDD01, 0x1DC0, 0x1C80, 0xDC41,
+  0x1400, 0xD4C1, 0xD581, 0x1540, 0xD701, 0x17C0, 0x1680, 0xD641,
+  0xD201, 0x12C0, 0x1380, 0xD341, 0x1100, 0xD1C1, 0xD081, 0x1040,
+  0xF001, 0x30C0, 0x3180, 0xF141, 0x3300, 0xF3C1, 0xF281, 0x3240,
+  0x3600, 0xF6C1, 0xF781, 0x3740, 0xF501, 0x35C0, 0x3480, 0xF441,
+  0x3C00, 0xFCC1, 0xFD81, 0x3D40, 0xFF01, 0x3FC0, 0x3E80, 0xFE41,
+  0xFA01, 0x3AC0, 0x3B80, 0xFB41, 0x3900, 0xF9C1, 0xF881, 0x3840,
+  0x2800, 0xE8C1, 0xE981, 0x2940, 0xEB01, 0x2BC0, 0x2A80, 0xEA41,
+  0xEE01, 0x2EC0, 0x2F80, 0xEF41, 0x2D00, 0xEDC1, 0xEC81, 0x2C40,
+  0xE401, 0x24C0, 0x2580, 0xE541, 0x2700, 0xE7C1, 0xE681, 0x2640,
+  0x2200, 0xE2C1, 0xE381, 0x2340, 0xE101, 0x21C0, 0x2080, 0xE041,
+  0xA001, 0x60C0, 0x6180, 0xA141, 0x6300, 0xA3C1, 0xA281, 0x6240,
+  0x6600, 0xA6C1, 0xA781, 0x6740, 0xA501, 0x65C0, 0x6480, 0xA441,
+  0x6C00, 0xACC1, 0xAD81, 0x6D40, 0xAF01, 0x6FC0, 0x6E80, 0xAE41,
+  0xAA01, 0x6AC0, 0x6B80, 0xAB41, 0x6900, 0xA9C1, 0xA881, 0x6840,
+  0x7800, 0xB8C1, 0xB981, 0x7940, 0xBB01, 0x7BC0, 0x7A80, 0xBA41,
+  0xBE01, 0x7EC0, 0x7F80, 0xBF41, 0x7D00, 0xBDC1, 0xBC81, 0x7C40,
+  0xB401, 0x74C0, 0x7580, 0xB541, 0x7700, 0xB7C1, 0xB681, 0x7640,
+  0x7200, 0xB2C1, 0xB381, 0x7340, 0xB101, 0x71C0, 0x7080, 0xB041,
+  0x5000, 0x90C1, 0x9181, 0x5140, 0x9301, 0x53C0, 0x5280, 0x9241,
+  0x9601, 0x56C0, 0x5780, 0x9741, 0x5500, 0x95C1, 0x9481, 0x5440,
+  0x9C01, 0x5CC0, 0x5D80, 0x9D41, 0x5F00, 0x9FC1, 0x9E81, 0x5E40,
+  0x5A00, 0x9AC1, 0x9B81, 0x5B40, 0x9901, 0x59C0, 0x5880, 0x9841,
+  0x8801, 0x48C0, 0x4980, 0x8941, 0x4B00, 0x8BC1, 0x8A81, 0x4A40,
+  0x4E00, 0x8EC1, 0x8F81, 0x4F40, 0x8D01, 0x4DC0, 0x4C80, 0x8C41,
+  0x4400, 0x84C1, 0x8581, 0x4540, 0x8701, 0x47C0, 0x4680, 0x8641,
+  0x8201, 0x42C0, 0x4380, 0x8341, 0x4100, 0x81C1, 0x8081, 0x4040
+};
+
 uint16_t calculateCRC(uint8_t *buf, uint8_t len) {
   uint16_t crc = 0xFFFF;
   
   for (uint8_t pos = 0; pos < len; pos++) {
-    crc ^= (uint16_t)buf[pos];
-    
-    for (uint8_t i = 8; i != 0; i--) {
-      if ((crc & 0x0001) != 0) {
-        crc >>= 1;
-        crc ^= 0xA001;
-      } else {
-        crc >>= 1;
-      }
-    }
+    crc = (crc >> 8) ^ pgm_read_word(&CRC_TABLE[(crc ^ buf[pos]) & 0xFF]);
   }
   
   return crc;
-}
\ No newline at end of file
+}
@@ -0,0 +1,159 @@
+"""Codec frame RS-485 antar master dan slave (Modbus RTU sederhana)
+
+Frame di bus: [ADDR][FC][DATA...][CRC_L][CRC_H], CRC16-Modbus
+(polinomial 0xA001, init 0xFFFF). Request master dan sebagian besar
+response slave membawa satu byte DATA; response FC_READ_SENSORS dua.
+
+FC_READ_REGISTERS (hanya lewat passthrough master) membaca blok register
+16-bit, mirip Modbus "read holding registers":
+    request   [ADDR][0x05][START][COUNT][CRC_L][CRC_H]
+    response  [ADDR][0x05][BYTE_COUNT][REG_H][REG_L]...[CRC_L][CRC_H]
+    exception [ADDR][0x85][KODE][CRC_L][CRC_H]
+
+CRC dihitung dengan tabel 256 entri, sama seperti calculateCRC() di
+firmware. Jalur NumPy (validate_frames/decode_frames) memvalidasi ribuan
+frame hasil capture sekaligus: loop hanya per kolom byte, bukan per frame.
+
+Contoh:
+    frame = encode_frame(0x24, 0x01, [0x00])
+    addr, fc, data = decode_frame(frame)
+    values = decode_registers(client.passthrough(encode_read_registers(0x24, 0, 4)))
+
+    frames = np.frombuffer(capture, np.uint8).reshape(-1, 5)
+    result = decode_frames(frames)
+"""
+from protocol import FC_READ_REGISTERS, EXCEPTION_FLAG, CrcError, InvalidResponse
+
+# NumPy opsional dan baru di-import saat jalur batch pertama kali dipakai:
+# client/GUI yang hanya memakai codec skalar tidak menanggung import-nya
+np = None
+
+CRC_POLY = 0xA001
+CRC_INIT = 0xFFFF
+HEADER_LEN = 2  # [ADDR][FC]
+CRC_LEN = 2
+
+# ===== KODE EXCEPTION SLAVE =====
+EXC_ILLEGAL_FUNCTION = 0x01
+EXC_ILLEGAL_ADDRESS = 0x02
+
+
+def _build_table():
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ CRC_POLY if crc & 1 else crc >> 1
+        table.append(crc)
+    return tuple(table)
+
+
+CRC_TABLE = _build_table()
+
+
+def crc16(data, crc=CRC_INIT):
+    """CRC16-Modbus dari bytes/bytearray/list byte"""
+    table = CRC_TABLE
+    for byte in data:
+        crc = (crc >> 8) ^ table[(crc ^ byte) & 0xFF]
+    return crc
+
+
+def encode_frame(addr, fc, data):
+    """Bangun frame [ADDR][FC][DATA...][CRC_L][CRC_H]"""
+    body = bytes([addr, fc]) + bytes(data)
+    crc = crc16(body)
+    return body + bytes([crc & 0xFF, crc >> 8])
+
+
+def check_crc(frame):
+    """True jika dua byte terakhir frame cocok dengan CRC isinya"""
+    return len(frame) > CRC_LEN and crc16(frame[:-CRC_LEN]) == (frame[-1] << 8 | frame[-2])
+
+
+def decode_frame(frame):
+    """Validasi CRC satu frame, kembalikan (addr, fc, data) atau raise ProtocolError"""
+    if len(frame) < HEADER_LEN + CRC_LEN + 1:
+        raise InvalidResponse(f"Frame too short: {len(frame)} bytes")
+    if not check_crc(frame):
+        raise CrcError("CRC mismatch")
+    return frame[0], frame[1], bytes(frame[HEADER_LEN:-CRC_LEN])
+
+
+def encode_read_registers(addr, start, count):
+    """Request FC_READ_REGISTERS untuk count register mulai dari start"""
+    return encode_frame(addr, FC_READ_REGISTERS, [start, count])
+
+
+def decode_registers(frame, addr=None):
+    """Validasi response FC_READ_REGISTERS, kembalikan list nilai 16-bit"""
+    frame_addr, fc, data = decode_frame(frame)
+    if addr is not None and frame_addr != addr:
+        raise InvalidResponse(f"Response from unexpected slave 0x{frame_addr:02X}")
+    if fc == FC_READ_REGISTERS | EXCEPTION_FLAG:
+        raise InvalidResponse(f"Slave exception 0x{data[0]:02X}")
+    if fc != FC_READ_REGISTERS or data[0] != len(data) - 1 or data[0] % 2:
+        raise InvalidResponse(
+            "Invalid response: " + "".join(f"[0x{b:02X}]" for b in frame))
+    return [data[i] << 8 | data[i + 1] for i in range(1, len(data), 2)]
+
+
+# ===== JALUR BATCH NUMPY =====
+def _require_numpy():
+    global np
+    if np is None:
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError("Batch frame decoding requires numpy") from None
+        np = numpy
+
+
+def crc16_batch(frames):
+    """CRC16 setiap baris array uint8 (N, L), hasil array uint16 (N,)"""
+    _require_numpy()
+    frames = np.asarray(frames, dtype=np.uint8)
+    table = np.asarray(CRC_TABLE, dtype=np.uint16)
+    crc = np.full(len(frames), CRC_INIT, dtype=np.uint16)
+    for column in frames.T:
+        crc = (crc >> 8) ^ table[(crc ^ column) & 0xFF]
+    return crc
+
+
+def validate_frames(frames):
+    """Mask boolean (N,) frame dengan CRC valid dari array uint8 (N, L)"""
+    _require_numpy()
+    frames = np.asarray(frames, dtype=np.uint8)
+    if frames.ndim != 2 or frames.shape[1] < HEADER_LEN + CRC_LEN + 1:
+        raise ValueError(f"expected an (N, L>=5) frame array, got shape {frames.shape}")
+    received = frames[:, -2].astype(np.uint16) | (frames[:, -1].astype(np.uint16) << 8)
+    return crc16_batch(frames[:, :-CRC_LEN]) == received
+
+
+def decode_frames(frames):
+    """Validasi dan pecah frame sekaligus
+
+    Mengembalikan dict array: valid (bool), addr, fc (uint8) dan data
+    (uint8, shape (N, L-4)). Baris dengan CRC salah tetap ada; pakai
+    mask valid untuk menyaringnya.
+    """
+    _require_numpy()
+    frames = np.asarray(frames, dtype=np.uint8)
+    valid = validate_frames(frames)
+    return {
+        "valid": valid,
+        "addr": frames[:, 0].copy(),
+        "fc": frames[:, 1].copy(),
+        "data": frames[:, HEADER_LEN:-CRC_LEN].copy(),
+    }
+
+
+def frames_from_bytes(capture, frame_len=5):
+    """Array (N, frame_len) dari capture byte berisi frame berurutan
+
+    Byte sisa di akhir (frame terpotong) dibuang.
+    """
+    _require_numpy()
+    data = np.frombuffer(bytes(capture), dtype=np.uint8)
+    count = len(data) // frame_len
+    return data[:count * frame_len].reshape(count, frame_len)
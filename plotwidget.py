@@ -0,0 +1,194 @@
+import time
+
+import numpy as np
+from PyQt5.QtWidgets import QWidget
+from PyQt5.QtCore import Qt, QLineF, QPointF, QTimer
+from PyQt5.QtGui import QFont, QPainter, QColor, QPen, QPolygonF
+
+from history import downsample
+
+# ===== WARNA PLOT =====
+PLOT_BACKGROUND = "#1a1a1a"
+PLOT_BAND = "#16a085"   # Pita min-max
+PLOT_LINE = "#1abc9c"   # Garis mean
+PLOT_TEXT = "#95a5a6"
+PLOT_MARGIN_LEFT = 48   # Ruang label sumbu Y
+
+# ===== PLOT LIVE =====
+LIVE_CAPACITY = 200000  # Sampel per series, cukup untuk 1 jam pada 50 Hz
+LIVE_MAX_FPS = 20       # Batas redraw per detik, berapapun rate polling
+LIVE_IDLE_REDRAW = 1.0  # Detik, tetap geser sumbu waktu saat tidak ada data baru
+
+
+class RingBuffer:
+    """Buffer time-series ukuran tetap (array NumPy yang sudah dialokasikan)"""
+
+    def __init__(self, capacity=LIVE_CAPACITY):
+        self.t = np.zeros(capacity)
+        self.value = np.zeros(capacity)
+        self.capacity = capacity
+        self.head = 0   # Indeks tulis berikutnya
+        self.count = 0
+
+    def append(self, t, value):
+        self.t[self.head] = t
+        self.value[self.head] = value
+        self.head = (self.head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def clear(self):
+        self.head = 0
+        self.count = 0
+
+    def since(self, t_start):
+        """(t, value) terurut waktu untuk sampel dengan t >= t_start"""
+        if self.count < self.capacity:
+            i = int(np.searchsorted(self.t[:self.count], t_start, side="left"))
+            return self.t[i:self.count], self.value[i:self.count]
+
+        # Buffer penuh: bagian lama [head:] lalu bagian baru [:head]
+        i = self.head + int(np.searchsorted(self.t[self.head:], t_start, side="left"))
+        if i < self.capacity:
+            return (np.concatenate((self.t[i:], self.t[:self.head])),
+                    np.concatenate((self.value[i:], self.value[:self.head])))
+        j = int(np.searchsorted(self.t[:self.head], t_start, side="left"))
+        return self.t[j:self.head], self.value[j:self.head]
+
+
+class BucketPlot(QWidget):
+    """Plot time-series yang sudah di-bucket: pita min-max plus garis mean
+
+    Biaya gambar sebanding dengan jumlah bucket (kira-kira lebar widget
+    dalam piksel), bukan jumlah sampel mentah.
+    """
+
+    def __init__(self, unit="", parent=None):
+        super().__init__(parent)
+        self.unit = unit
+        self.y_range = None  # (min, max) tetap, None = otomatis dari data
+        self.time_format = "%Y-%m-%d %H:%M:%S"
+        self.setMinimumHeight(160)
+        self.clear()
+
+    def clear(self):
+        empty = np.empty(0)
+        self.t, self.lo, self.hi, self.mean = empty, empty, empty, empty
+        self.update()
+
+    def set_buckets(self, t, lo, hi, mean):
+        """Tampilkan bucket (array sama panjang, NaN = bucket kosong)"""
+        self.t, self.lo, self.hi, self.mean = t, lo, hi, mean
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor(PLOT_BACKGROUND))
+        painter.setFont(QFont("Arial", 7))
+
+        filled = np.isfinite(self.mean)
+        if not filled.any():
+            painter.setPen(QColor(PLOT_TEXT))
+            painter.drawText(self.rect(), Qt.AlignCenter, "No data")
+            painter.end()
+            return
+
+        margin_left, margin_bottom = PLOT_MARGIN_LEFT, 14
+        width = self.plot_width()
+        height = self.height() - margin_bottom - 8
+        if self.y_range is not None:
+            y_min, y_max = self.y_range
+        else:
+            y_min = float(np.nanmin(self.lo))
+            y_max = float(np.nanmax(self.hi))
+        if y_max - y_min < 1e-9:
+            y_min, y_max = y_min - 1.0, y_max + 1.0
+
+        n = len(self.t)
+        xs = margin_left + (np.arange(n) + 0.5) * width / n
+
+        def to_y(values):
+            return 4 + height * (1.0 - (values - y_min) / (y_max - y_min))
+
+        # Pita min-max: satu garis vertikal per bucket
+        lo_y, hi_y = to_y(self.lo), to_y(self.hi)
+        painter.setPen(QPen(QColor(PLOT_BAND), max(1.0, width / n)))
+        painter.drawLines([QLineF(xs[i], lo_y[i], xs[i], hi_y[i])
+                           for i in np.flatnonzero(filled)])
+
+        # Garis mean melewati bucket kosong (data lebih jarang dari piksel)
+        mean_y = to_y(self.mean)
+        painter.setPen(QPen(QColor(PLOT_LINE), 1.5))
+        painter.drawPolyline(QPolygonF([QPointF(xs[i], mean_y[i])
+                                        for i in np.flatnonzero(filled)]))
+
+        # Label sumbu
+        painter.setPen(QColor(PLOT_TEXT))
+        painter.drawText(0, 0, margin_left - 4, 14, Qt.AlignRight,
+                         f"{y_max:g}{self.unit}")
+        painter.drawText(0, height - 6, margin_left - 4, 14, Qt.AlignRight,
+                         f"{y_min:g}{self.unit}")
+        bottom = self.height() - margin_bottom
+        painter.drawText(margin_left, bottom, width // 2, margin_bottom, Qt.AlignLeft,
+                         self.format_time(self.t[0]))
+        painter.drawText(margin_left + width // 2, bottom, width // 2, margin_bottom,
+                         Qt.AlignRight, self.format_time(self.t[-1]))
+        painter.end()
+
+    def plot_width(self):
+        """Lebar area data dalam piksel"""
+        return self.width() - PLOT_MARGIN_LEFT - 4
+
+    def format_time(self, t):
+        return time.strftime(self.time_format, time.localtime(t))
+
+
+class LivePlot(BucketPlot):
+    """Plot bergulir untuk data live
+
+    Sampel hanya ditulis ke RingBuffer; redraw dijalankan timer dengan
+    batas LIVE_MAX_FPS. Setiap frame, jendela waktu di-decimate ke min/max
+    per kolom piksel, jadi biaya gambar tetap sama untuk 1 Hz atau 50 Hz
+    dan untuk jendela 1 menit atau 1 jam.
+    """
+
+    def __init__(self, unit="", span=60.0, capacity=LIVE_CAPACITY, parent=None):
+        super().__init__(unit, parent)
+        self.span = span
+        self.buffer = RingBuffer(capacity)
+        self.time_format = "%H:%M:%S"
+        self._dirty = False
+        self._last_redraw = 0.0
+
+        self.frame_timer = QTimer(self)
+        self.frame_timer.timeout.connect(self.redraw)
+        self.frame_timer.start(int(1000 / LIVE_MAX_FPS))
+
+    def add_sample(self, t, value):
+        """Tambah satu sampel (tidak langsung menggambar ulang)"""
+        self.buffer.append(t, value)
+        self._dirty = True
+
+    def set_span(self, span):
+        """Ubah lebar jendela waktu (detik)"""
+        self.span = span
+        self._dirty = True
+
+    def clear(self):
+        if hasattr(self, "buffer"):
+            self.buffer.clear()
+        super().clear()
+
+    def redraw(self):
+        now = time.time()
+        if not self._dirty and now - self._last_redraw < LIVE_IDLE_REDRAW:
+            return
+        if not self.isVisible() or not self.buffer.count:
+            return
+        self._dirty = False
+        self._last_redraw = now
+
+        t, value = self.buffer.since(now - self.span)
+        # Satu bucket per kolom piksel
+        buckets = max(1, self.plot_width())
+        result = downsample(t, value, buckets, now - self.span, now)
+        self.set_buckets(result["t"], result["min"], result["max"], result["mean"])
@@ -0,0 +1,248 @@
+"""Poller headless untuk master bridge RS-485 (tanpa PyQt5)
+
+Contoh:
+    python poller.py /dev/ttyUSB0 --tcrt 20 --ultrasonic 5 --output data.csv
+
+Dengan --sensors, ultrasonik dan TCRT dibaca dalam satu transaksi
+(FC 0x04); setiap nilai tetap ditulis sebagai satu baris.
+
+Dengan --changes-only, hanya nilai yang berubah (di luar --deadband /
+--deadband-pct untuk jarak, setiap edge untuk TCRT/relay) yang ditulis
+dan direkam, ditambah satu baris per --heartbeat detik per nilai:
+    python poller.py /dev/ttyUSB0 --tcrt 20 --changes-only --deadband 1
+
+Dengan --publish NAME, setiap pembacaan juga ditulis ke ring buffer
+shared memory (sharedbus.py) untuk dibaca proses lokal lain; --quiet
+mematikan output teks (tidak bisa digabung dengan --output):
+    python poller.py /dev/ttyUSB0 --publish rs485 --quiet
+
+Jika port putus (USB dicabut), poller menulis baris error lalu membuka
+ulang device yang sama dengan backoff (hotplug.PortSupervisor).
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import serial
+
+from client import RS485Client
+from deadband import HEARTBEAT, ChangeFilter, frame_readings
+from hotplug import PortSupervisor
+from modbus import decode_registers
+from protocol import (
+    DEFAULT_BAUD, BAUD_RATES,
+    FC_READ_ULTRASONIC, FC_READ_TCRT5000, FC_CONTROL_RELAY, FC_READ_SENSORS, FC_READ_REGISTERS,
+    ProtocolError, check_frame, check_passthrough_frame,
+)
+from scheduler import default_scheduler
+
+CHANNEL_FC = {
+    "ultrasonic": FC_READ_ULTRASONIC,
+    "tcrt": FC_READ_TCRT5000,
+    "relay": FC_CONTROL_RELAY,
+    "sensors": FC_READ_SENSORS,
+    "registers": FC_READ_REGISTERS,
+}
+
+
+def format_reading(fmt, timestamp, channel, slave, fc, value, error):
+    if fmt == "jsonl":
+        return json.dumps({
+            "t": round(timestamp, 6), "channel": channel, "slave": slave,
+            "fc": fc, "value": value, "error": error,
+        })
+    value_text = "" if value is None else str(value)
+    return f"{timestamp:.6f},{channel},0x{slave:02X},0x{fc:02X},{value_text},{error or ''}"
+
+
+def reconnect(client, supervisor, stop_at=None):
+    """Buka ulang port dengan backoff PortSupervisor, False jika stop_at lewat"""
+    while stop_at is None or time.monotonic() < stop_at:
+        wait = supervisor.wait_time(time.monotonic())
+        if stop_at is not None:
+            wait = min(wait, max(0.0, stop_at - time.monotonic()))
+        time.sleep(wait)
+        device = supervisor.candidate()
+        if device is None:
+            continue
+        try:
+            client.open(device)
+        except (serial.SerialException, OSError):
+            client.close()
+            continue
+        supervisor.attached(device)
+        return True
+    return False
+
+
+def poll(client, scheduler, out, fmt="csv", duration=None, count=None, header=True,
+         recorder=None, change_filter=None, publisher=None, supervisor=None):
+    """Jalankan scheduler dan tulis setiap pembacaan ke out
+
+    Dengan change_filter, pembacaan yang tidak berubah dilewati (error
+    selalu ditulis); count tetap menghitung transaksi. out=None hanya
+    merekam/mempublikasikan. Dengan supervisor, error I/O port tidak
+    menghentikan poller: port dibuka ulang lewat reconnect().
+    """
+    if out is not None and fmt == "csv" and header:
+        out.write("timestamp,channel,slave,fc,value,error\n")
+
+    scheduler.reset()
+    start = time.monotonic()
+    done = 0
+    while True:
+        now = time.monotonic()
+        if duration is not None and now - start >= duration:
+            break
+        if count is not None and done >= count:
+            break
+
+        channel = scheduler.next_due(now)
+        if channel is None:
+            wait = scheduler.wait_time(now)
+            if wait is None:
+                break
+            time.sleep(wait)
+            continue
+
+        request = channel.request
+        fc = CHANNEL_FC[channel.name]
+        values = []  # (slave, fc, nilai) per pembacaan
+        error = None
+        lost = False
+        try:
+            frame = client.transact(request.command, request.timeout)
+            if fc == FC_READ_REGISTERS:
+                decode_registers(check_passthrough_frame(frame), request.slave)
+            else:
+                check_frame(frame, request.slave, fc)
+            values = frame_readings(frame)
+        except ProtocolError as e:
+            error = str(e)
+        except (serial.SerialException, OSError) as e:
+            # Error I/O port (USB dicabut), bukan error protokol
+            if supervisor is None:
+                raise
+            error = f"link lost: {e}"
+            lost = True
+
+        end = time.monotonic()
+        scheduler.completed(channel, end - now, end)
+        if change_filter is not None:
+            values = [(slave, reading_fc, value) for slave, reading_fc, value in values
+                      if change_filter.accept(slave, reading_fc, value, end)]
+        timestamp = time.time()
+        for sink in (recorder, publisher):
+            if sink is not None:
+                for slave, reading_fc, value in values:
+                    sink.append(timestamp, slave, reading_fc, value)
+        readings = [(reading_fc, value, None) for _, reading_fc, value in values]
+        if error is not None:
+            readings = [(fc, None, error)]
+        if out is not None:
+            for reading_fc, value, error in readings:
+                out.write(format_reading(fmt, timestamp, channel.name, request.slave,
+                                         reading_fc, value, error) + "\n")
+            out.flush()
+        done += 1
+
+        if lost:
+            client.close()
+            supervisor.detached()
+            stop_at = None if duration is None else start + duration
+            if not reconnect(client, supervisor, stop_at):
+                break
+            # Lanjutkan jadwal dari awal, tanpa catch-up
+            scheduler.reset()
+
+    return done
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless RS-485 master bridge poller")
+    parser.add_argument("port", help="Port serial master bridge, mis. /dev/ttyUSB0")
+    parser.add_argument("--baud", type=int, default=DEFAULT_BAUD, choices=BAUD_RATES)
+    parser.add_argument("--ultrasonic", type=float, default=5.0, metavar="HZ",
+                        help="Rate polling ultrasonik (0 = mati)")
+    parser.add_argument("--tcrt", type=float, default=20.0, metavar="HZ",
+                        help="Rate polling TCRT5000 (0 = mati)")
+    parser.add_argument("--relay", type=float, default=1.0, metavar="HZ",
+                        help="Rate readback relay (0 = mati)")
+    parser.add_argument("--sensors", type=float, default=0.0, metavar="HZ",
+                        help="Rate baca ultrasonik + TCRT sekaligus (FC 0x04, 0 = mati)")
+    parser.add_argument("--registers", type=float, default=0.0, metavar="HZ",
+                        help="Rate baca register sensor lewat passthrough (FC 0x05, 0 = mati)")
+    parser.add_argument("--duration", type=float, help="Berhenti setelah N detik")
+    parser.add_argument("--count", type=int, help="Berhenti setelah N pembacaan")
+    parser.add_argument("--format", choices=["csv", "jsonl"], default="csv")
+    parser.add_argument("--output", "-o", help="File output (default stdout)")
+    parser.add_argument("--record", metavar="DIR", help="Rekam juga ke store biner (recorder.py)")
+    parser.add_argument("--publish", metavar="NAME",
+                        help="Publikasikan ke ring shared memory NAME (sharedbus.py)")
+    parser.add_argument("--quiet", "-q", action="store_true",
+                        help="Tanpa output teks (mis. hanya --publish/--record)")
+    parser.add_argument("--changes-only", action="store_true",
+                        help="Report-by-exception: tulis hanya nilai yang berubah")
+    parser.add_argument("--deadband", type=float, default=0.0, metavar="CM",
+                        help="Deadband absolut jarak untuk --changes-only")
+    parser.add_argument("--deadband-pct", type=float, default=0.0, metavar="PCT",
+                        help="Deadband jarak dalam persen nilai terakhir")
+    parser.add_argument("--heartbeat", type=float, default=HEARTBEAT, metavar="S",
+                        help="Tulis ulang nilai yang tidak berubah setiap S detik (0 = tidak)")
+    args = parser.parse_args(argv)
+    if args.quiet and args.output:
+        parser.error("--quiet and --output are mutually exclusive")
+
+    scheduler = default_scheduler(args.baud)
+    for name in CHANNEL_FC:
+        hz = getattr(args, name)
+        scheduler.configure(name, interval=1.0 / hz if hz > 0 else 0.0)
+
+    load = scheduler.load()
+    if load > 1.0:
+        print(f"warning: requested poll rates exceed bus capacity ({load * 100:.0f}%)",
+              file=sys.stderr)
+
+    publisher = None
+    if args.publish:
+        from sharedbus import Publisher
+        try:
+            publisher = Publisher(args.publish)
+        except FileExistsError as e:
+            parser.exit(1, f"error: {e}\n")
+
+    # Header CSV hanya ditulis sekali, juga saat menambah ke file lama
+    header = not (args.output and os.path.exists(args.output)
+                  and os.path.getsize(args.output) > 0)
+    out = open(args.output, "a", encoding="utf-8") if args.output else sys.stdout
+    if args.quiet:
+        out = None
+    change_filter = None
+    if args.changes_only:
+        change_filter = ChangeFilter(args.deadband, args.deadband_pct, args.heartbeat)
+    recorder = None
+    if args.record:
+        # NumPy hanya dibutuhkan jika merekam
+        from recorder import Recorder
+        recorder = Recorder(args.record)
+    try:
+        with RS485Client(args.port, args.baud) as client:
+            supervisor = PortSupervisor(args.port)
+            supervisor.attached(args.port)
+            poll(client, scheduler, out, args.format, args.duration, args.count, header,
+                 recorder, change_filter, publisher, supervisor)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if recorder is not None:
+            recorder.close()
+        if publisher is not None:
+            publisher.close()
+        if out not in (None, sys.stdout):
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
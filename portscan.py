@@ -0,0 +1,68 @@
+"""Enumerasi port serial di background dengan cache
+
+list_ports.comports() bisa lambat (ratusan ms) di mesin dengan banyak
+device USB/ttyS, jadi GUI tidak pernah memanggilnya di thread utama.
+Hasil scan disimpan di memori (dipakai ulang selama PORT_CACHE_TTL) dan
+di file cache, sehingga saat aplikasi dibuka ulang combo port langsung
+terisi daftar terakhir sambil scan baru berjalan.
+"""
+import json
+import os
+import threading
+import time
+
+from PyQt5.QtCore import QThread, pyqtSignal
+from serial.tools import list_ports
+
+PORT_CACHE_TTL = 5.0  # Detik, hasil scan dipakai ulang tanpa enumerasi
+PORT_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "rs485-ports.json")
+
+_lock = threading.Lock()
+_cache = None  # (waktu monotonic, list device)
+
+
+def load_cached_ports(path=PORT_CACHE_FILE):
+    """Daftar port dari sesi sebelumnya, list kosong jika belum ada"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            ports = json.load(f)
+    except (OSError, ValueError):
+        return []
+    return [port for port in ports if isinstance(port, str)]
+
+
+def save_cached_ports(ports, path=PORT_CACHE_FILE):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(ports, f)
+    except OSError:
+        pass  # Cache hanya optimasi
+
+
+def scan_ports(max_age=PORT_CACHE_TTL):
+    """List nama device, dari cache jika umurnya <= max_age (blocking)"""
+    global _cache
+    with _lock:
+        if _cache is not None and time.monotonic() - _cache[0] <= max_age:
+            return list(_cache[1])
+    ports = [info.device for info in list_ports.comports()]
+    with _lock:
+        _cache = (time.monotonic(), ports)
+    save_cached_ports(ports)
+    return list(ports)
+
+
+class PortScanner(QThread):
+    """Satu scan_ports() di thread terpisah, hasil lewat ports_found"""
+
+    ports_found = pyqtSignal(list, float)  # devices, durasi scan (detik)
+
+    def __init__(self, max_age=PORT_CACHE_TTL, parent=None):
+        super().__init__(parent)
+        self.max_age = max_age
+
+    def run(self):
+        start = time.perf_counter()
+        ports = scan_ports(self.max_age)
+        self.ports_found.emit(ports, time.perf_counter() - start)
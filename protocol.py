@@ -0,0 +1,256 @@
+# ===== KONFIGURASI NODE =====
+SLAVE_SENSOR_ADDR = 0x24
+SLAVE_AKTUATOR_ADDR = 0x66
+
+# ===== BAUD RATE =====
+# Harus sama dengan HOST_BAUD di master.ino
+DEFAULT_BAUD = 9600
+BAUD_RATES = (9600, 19200, 38400, 57600, 115200)
+
+# ===== PERINTAH KE MASTER BRIDGE =====
+CMD_READ_ULTRASONIC = b'U'
+CMD_READ_TCRT = b'T'
+CMD_CONTROL_RELAY = b'R'
+CMD_READ_SENSORS = b'S'  # Ultrasonik + TCRT dalam satu transaksi
+CMD_PING = b'P'  # Master menjawab frame READY, untuk handshake saat open
+CMD_PASSTHROUGH = b'X'  # 'X' [LEN] [frame slave lengkap dengan CRC]
+
+# ===== BYTE KEDUA PERINTAH RELAY =====
+CMD_RELAY_OFF = b'\x00'
+CMD_RELAY_ON = b'\x01'
+CMD_RELAY_STATUS = b'\x02'  # Tidak mengubah relay, hanya baca status
+
+# ===== FUNCTION CODE MODBUS =====
+FC_READ_ULTRASONIC = 0x01
+FC_READ_TCRT5000 = 0x02
+FC_CONTROL_RELAY = 0x03
+FC_READ_SENSORS = 0x04   # Slave 0x24 membalas jarak dan TCRT sekaligus
+FC_READ_REGISTERS = 0x05  # Blok register 16-bit, hanya lewat passthrough
+EXCEPTION_FLAG = 0x80     # FC | 0x80 = slave menolak request
+
+# ===== REGISTER SLAVE SENSOR (FC_READ_REGISTERS) =====
+REG_ECHO_US = 0      # Lebar pulsa echo HC-SR04 mentah (mikrodetik)
+REG_DISTANCE_MM = 1  # Jarak (mm)
+REG_TCRT_RAW = 2     # analogRead TCRT5000 (0..1023)
+REG_TCRT_STATE = 3   # 1 = objek terdeteksi
+SENSOR_REGISTERS = 4
+
+# ===== FRAME ERROR DARI MASTER =====
+ERROR_MARKER = 0xFF
+ERR_CRC = 0xE1
+ERR_TIMEOUT = 0xE2
+ERR_REQUEST = 0xE3  # Request passthrough tidak valid (panjang salah/terpotong)
+
+# ===== FRAME PASSTHROUGH DARI MASTER =====
+# [0xFE][LEN][response slave mentah LEN byte, termasuk CRC]
+PASSTHROUGH_MARKER = 0xFE
+PASSTHROUGH_MAX_REQUEST = 16
+PASSTHROUGH_MAX_RESPONSE = 32
+
+# ===== FRAME STATUS DARI MASTER =====
+# Format sama dengan frame error: [0xFF][kode]. Dikirim sekali setelah
+# setup() selesai dan sebagai jawaban CMD_PING.
+STATUS_READY = 0xA5
+READY_FRAME = bytes([ERROR_MARKER, STATUS_READY])
+
+DATA_FRAME_LEN = 3   # [ADDR][FC][DATA]
+ERROR_FRAME_LEN = 2  # [0xFF][0xEx]
+SENSORS_FRAME_LEN = 4  # [ADDR][FC_READ_SENSORS][JARAK][TCRT]
+
+# Function code dengan frame data yang tidak 3 byte
+FRAME_LENGTHS = {
+    FC_READ_SENSORS: SENSORS_FRAME_LEN,
+}
+
+
+class FrameParser:
+    """Parser inkremental untuk response master bridge
+
+    Byte bisa dimasukkan sedikit demi sedikit lewat feed(). Frame data
+    3 byte dan frame error 2 byte dikeluarkan segera setelah lengkap,
+    jadi frame error tidak perlu menunggu timeout. Panjang frame data
+    ditentukan byte FC (lihat FRAME_LENGTHS), panjang frame passthrough
+    oleh byte LEN.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def reset(self):
+        self._buffer.clear()
+
+    def needed(self):
+        """Jumlah byte yang masih dibutuhkan untuk frame berikutnya"""
+        if not self._buffer:
+            return 1
+        return self._frame_len() - len(self._buffer)
+
+    def feed(self, data):
+        """Tambah byte, kembalikan list frame (bytes) yang sudah lengkap"""
+        frames = []
+        for byte in data:
+            self._buffer.append(byte)
+            if len(self._buffer) == self._frame_len():
+                frames.append(bytes(self._buffer))
+                self._buffer.clear()
+        return frames
+
+    def _frame_len(self):
+        if self._buffer[0] == ERROR_MARKER:
+            return ERROR_FRAME_LEN
+        if self._buffer[0] == PASSTHROUGH_MARKER:
+            # Byte LEN belum masuk: minta satu byte dulu
+            if len(self._buffer) < 2:
+                return 2
+            return 2 + self._buffer[1]
+        if len(self._buffer) >= 2:
+            return FRAME_LENGTHS.get(self._buffer[1], DATA_FRAME_LEN)
+        return DATA_FRAME_LEN
+
+
+def is_error_frame(frame):
+    return frame[0] == ERROR_MARKER
+
+
+def is_ready_frame(frame):
+    return frame == READY_FRAME
+
+
+def is_passthrough_frame(frame):
+    return frame[0] == PASSTHROUGH_MARKER
+
+
+def passthrough_command(packet):
+    """Perintah host untuk meneruskan satu frame slave mentah"""
+    if not 0 < len(packet) <= PASSTHROUGH_MAX_REQUEST:
+        raise ValueError(f"passthrough frame must be 1..{PASSTHROUGH_MAX_REQUEST} bytes")
+    return CMD_PASSTHROUGH + bytes([len(packet)]) + bytes(packet)
+
+
+def frame_node(frame):
+    """(addr, fc) pengirim frame data atau frame passthrough"""
+    if is_passthrough_frame(frame):
+        return tuple(frame[2:4])
+    return tuple(frame[:2])
+
+
+# Perintah host -> (alamat slave, function code) yang dituju master
+COMMAND_TARGETS = {
+    CMD_READ_ULTRASONIC[0]: (SLAVE_SENSOR_ADDR, FC_READ_ULTRASONIC),
+    CMD_READ_TCRT[0]: (SLAVE_SENSOR_ADDR, FC_READ_TCRT5000),
+    CMD_CONTROL_RELAY[0]: (SLAVE_AKTUATOR_ADDR, FC_CONTROL_RELAY),
+    CMD_READ_SENSORS[0]: (SLAVE_SENSOR_ADDR, FC_READ_SENSORS),
+}
+
+
+def command_target(command):
+    """(slave, fc) untuk satu perintah host, (None, None) jika tidak dikenal"""
+    if command[:1] == CMD_PASSTHROUGH:
+        if len(command) < 4:
+            return None, None
+        return command[2], command[3]
+    return COMMAND_TARGETS.get(command[0], (None, None))
+
+
+def data_length(fc):
+    """Jumlah byte DATA pada frame data untuk satu function code"""
+    return FRAME_LENGTHS.get(fc, DATA_FRAME_LEN) - 2
+
+
+def classify_frame(frame, slave, fc):
+    """Kelas error frame untuk statistik, None jika frame valid"""
+    if is_error_frame(frame):
+        if frame[1] == ERR_CRC:
+            return "crc_error"
+        if frame[1] == ERR_TIMEOUT:
+            return "slave_timeout"
+        return "invalid"
+    if is_passthrough_frame(frame):
+        # CRC frame mentah dicek di host (modbus.check_crc)
+        if len(frame) < 7 or frame_node(frame) != (slave, fc):
+            return "invalid"
+        return None
+    if frame[0] != slave or frame[1] != fc:
+        return "invalid"
+    if len(frame) != FRAME_LENGTHS.get(fc, DATA_FRAME_LEN):
+        return "invalid"
+    return None
+
+
+# ===== EXCEPTION PROTOKOL =====
+class ProtocolError(Exception):
+    """Error umum komunikasi dengan master bridge"""
+
+
+class ResponseTimeout(ProtocolError):
+    """Master tidak mengirim frame apa pun sebelum timeout"""
+
+
+class CrcError(ProtocolError):
+    """Master melaporkan CRC mismatch dari slave (0xFF 0xE1)"""
+
+
+class SlaveTimeout(ProtocolError):
+    """Master melaporkan slave tidak menjawab (0xFF 0xE2)"""
+
+
+class InvalidResponse(ProtocolError):
+    """Frame tidak cocok dengan alamat/function code yang diminta"""
+
+
+def _raise_error_frame(frame):
+    if frame[1] == ERR_CRC:
+        raise CrcError("CRC mismatch")
+    if frame[1] == ERR_TIMEOUT:
+        raise SlaveTimeout("Slave timeout")
+    if frame[1] == ERR_REQUEST:
+        raise ProtocolError("Master rejected passthrough request")
+    raise ProtocolError(f"Unknown error code 0x{frame[1]:02X}")
+
+
+def check_frame(frame, addr, fc):
+    """Validasi frame data, kembalikan byte DATA atau raise ProtocolError"""
+    if is_error_frame(frame):
+        _raise_error_frame(frame)
+
+    if frame[0] != addr or frame[1] != fc:
+        raise InvalidResponse(
+            "Invalid response: " + "".join(f"[0x{b:02X}]" for b in frame))
+    return frame[2]
+
+
+def check_sensors_frame(frame, addr=SLAVE_SENSOR_ADDR):
+    """Validasi frame FC_READ_SENSORS, kembalikan (jarak_cm, tcrt)"""
+    check_frame(frame, addr, FC_READ_SENSORS)
+    if len(frame) != SENSORS_FRAME_LEN:
+        raise InvalidResponse(
+            "Invalid response: " + "".join(f"[0x{b:02X}]" for b in frame))
+    return frame[2], frame[3]
+
+
+def check_passthrough_frame(frame):
+    """Kembalikan response slave mentah dari frame passthrough
+
+    CRC response tidak dicek di sini, lihat modbus.decode_frame.
+    """
+    if is_error_frame(frame):
+        _raise_error_frame(frame)
+    if not is_passthrough_frame(frame):
+        raise InvalidResponse(
+            "Invalid response: " + "".join(f"[0x{b:02X}]" for b in frame))
+    return frame[2:]
+
+
+def split_frame(frame):
+    """Pecah frame data menjadi frame [ADDR][FC][DATA] per nilai
+
+    Frame FC_READ_SENSORS menjadi frame ultrasonik dan TCRT, sehingga
+    rekaman dan replay tetap memakai satu nilai per frame. Frame
+    passthrough tidak dipecah (isi register tergantung request).
+    """
+    if is_passthrough_frame(frame):
+        return []
+    if len(frame) == SENSORS_FRAME_LEN and frame[1] == FC_READ_SENSORS:
+        return [bytes([frame[0], FC_READ_ULTRASONIC, frame[2]]),
+                bytes([frame[0], FC_READ_TCRT5000, frame[3]])]
+    return [frame]
@@ -0,0 +1,127 @@
+"""Perekam time-series pembacaan sensor ke store biner kolumnar
+
+Satu store = satu direktori berisi satu file per kolom (array NumPy
+mentah, little-endian) plus meta.json:
+
+    t.bin      float64  waktu unix (detik)
+    slave.bin  uint8    alamat slave
+    fc.bin     uint8    function code
+    value.bin  int32    nilai pembacaan
+
+14 byte per sampel; 20 Hz selama 30 hari sekitar 730 MB. Sampel ditulis
+ke buffer NumPy yang sudah dialokasikan lalu di-flush per blok, jadi
+biaya append hanya beberapa mikrodetik.
+"""
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+from deadband import frame_readings
+
+STORE_VERSION = 1
+COLUMNS = (
+    ("t", "<f8"),
+    ("slave", "u1"),
+    ("fc", "u1"),
+    ("value", "<i4"),
+)
+BLOCK_SIZE = 4096     # Sampel per blok flush
+FLUSH_INTERVAL = 1.0  # Detik, flush paksa walau blok belum penuh
+
+
+def column_path(path, name):
+    return os.path.join(path, f"{name}.bin")
+
+
+def write_meta(path):
+    meta = {
+        "version": STORE_VERSION,
+        "columns": [{"name": name, "dtype": dtype} for name, dtype in COLUMNS],
+    }
+    with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+
+
+class Recorder:
+    """Append-only recorder dengan buffer blok yang sudah dialokasikan"""
+
+    def __init__(self, path, block_size=BLOCK_SIZE, flush_interval=FLUSH_INTERVAL):
+        self.path = path
+        self.block_size = block_size
+        self.flush_interval = flush_interval
+        self.samples = 0
+
+        os.makedirs(path, exist_ok=True)
+        if not os.path.exists(os.path.join(path, "meta.json")):
+            write_meta(path)
+
+        self._buffers = {name: np.empty(block_size, dtype=dtype) for name, dtype in COLUMNS}
+        self._t = self._buffers["t"]
+        self._slave = self._buffers["slave"]
+        self._fc = self._buffers["fc"]
+        self._value = self._buffers["value"]
+        self._count = 0
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._files = {name: open(column_path(path, name), "ab") for name, _ in COLUMNS}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def append(self, t, slave, fc, value):
+        """Tambah satu sampel (waktu unix, slave, fc, nilai; dibulatkan ke int32)"""
+        with self._lock:
+            i = self._count
+            self._t[i] = t
+            self._slave[i] = slave
+            self._fc[i] = fc
+            self._value[i] = round(value)
+            self._count = i + 1
+            self.samples += 1
+
+            if self._count == self.block_size:
+                self._flush()
+            elif time.monotonic() - self._last_flush >= self.flush_interval:
+                self._flush()
+
+    def append_frame(self, frame, t=None):
+        """Rekam frame data dari master bridge
+
+        Frame FC_READ_SENSORS direkam sebagai dua sampel (ultrasonik dan
+        TCRT) dengan waktu yang sama. Frame register (passthrough FC 0x05)
+        direkam dengan pemetaan yang sama seperti deadband.frame_readings:
+        jarak sebagai sampel FC 0x05 (mm, tanpa pembulatan) dan
+        status TCRT sebagai sampel FC 0x02.
+        """
+        t = time.time() if t is None else t
+        for slave, fc, value in frame_readings(frame):
+            self.append(t, slave, fc, value)
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def close(self):
+        with self._lock:
+            if self._files is None:
+                return
+            self._flush()
+            for f in self._files.values():
+                f.close()
+            self._files = None
+
+    def _flush(self):
+        self._last_flush = time.monotonic()
+        if not self._count or self._files is None:
+            return
+        # Semua kolom ditulis dengan panjang yang sama per blok
+        for name, f in self._files.items():
+            self._buffers[name][:self._count].tofile(f)
+            f.flush()
+        self._count = 0
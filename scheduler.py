@@ -0,0 +1,187 @@
+import time
+
+from protocol import (
+    SLAVE_SENSOR_ADDR, SLAVE_AKTUATOR_ADDR,
+    CMD_READ_ULTRASONIC, CMD_READ_TCRT, CMD_CONTROL_RELAY, CMD_RELAY_STATUS, CMD_READ_SENSORS,
+    DEFAULT_BAUD, SENSOR_REGISTERS, command_target, data_length, passthrough_command,
+)
+from adaptive import RETRY_BACKOFF_MAX
+from client import Request
+from modbus import encode_read_registers
+
+# ===== ESTIMASI WAKTU TRANSAKSI =====
+BITS_PER_CHAR = 10         # 8N1: start + 8 data + stop
+MASTER_TURNAROUND = 0.020  # delay(TURNAROUND_DELAY) di master.ino setelah kirim request
+FAST_TURNAROUND = 0.002    # TURNAROUND_DELAY saat RS485_BAUD >= FAST_BAUD
+FAST_BAUD = 57600
+SLAVE_PROCESSING = 0.005   # Baca sensor + switching TX/RX di slave
+RTT_SMOOTHING = 0.2        # Bobot EMA untuk RTT terukur
+
+# Perintah channel "registers": semua register sensor lewat passthrough (FC 0x05)
+REGISTERS_COMMAND = passthrough_command(
+    encode_read_registers(SLAVE_SENSOR_ADDR, 0, SENSOR_REGISTERS))
+
+# ===== DEADLINE TRANSAKSI =====
+MASTER_SLAVE_TIMEOUT = 0.200  # RESPONSE_TIMEOUT di master.ino: setelahnya master kirim 0xFF 0xE2
+HOST_MARGIN = 0.050           # Latency USB-serial dan jitter host
+
+
+def master_turnaround(baudrate=DEFAULT_BAUD):
+    """Jeda master setelah kirim request, sama seperti TURNAROUND_DELAY"""
+    return FAST_TURNAROUND if baudrate >= FAST_BAUD else MASTER_TURNAROUND
+
+
+def estimate_transaction_time(command_len, baudrate=DEFAULT_BAUD, data_len=1):
+    """Estimasi durasi satu transaksi host -> master -> slave -> host"""
+    char_time = BITS_PER_CHAR / baudrate
+    # Host -> master, master -> slave (5 byte), master -> host (2 + data).
+    # Response slave (4 + data byte) diterima selama jeda turnaround master.
+    wire = (command_len + 5 + 2 + data_len) * char_time
+    return wire + max(master_turnaround(baudrate), (4 + data_len) * char_time + SLAVE_PROCESSING)
+
+
+def estimate_command_time(command, baudrate=DEFAULT_BAUD):
+    """estimate_transaction_time untuk satu perintah host"""
+    _, fc = command_target(command)
+    return estimate_transaction_time(len(command), baudrate, data_length(fc))
+
+
+def transaction_deadline(command, baudrate=DEFAULT_BAUD):
+    """Timeout host untuk satu perintah: master pasti menjawab sebelum ini
+
+    Slave yang diam tetap dijawab master dengan frame error setelah
+    MASTER_SLAVE_TIMEOUT, jadi menunggu lebih lama hanya memperpanjang
+    waktu bus terblokir saat master sendiri hilang.
+    """
+    return estimate_command_time(command, baudrate) + MASTER_SLAVE_TIMEOUT + HOST_MARGIN
+
+
+class PollChannel:
+    """Satu channel polling dengan interval dan prioritas sendiri"""
+
+    def __init__(self, name, request, interval, priority=0, enabled=True):
+        self.name = name
+        self.request = request
+        self.interval = interval
+        self.priority = priority
+        self.enabled = enabled
+        self.deadline = 0.0
+        self.rtt = None
+
+    @property
+    def rate(self):
+        return 1.0 / self.interval if self.interval > 0 else 0.0
+
+
+class PollScheduler:
+    """Scheduler polling berbasis deadline (earliest deadline first)
+
+    Setiap channel punya deadline = waktu poll berikutnya. Dari channel
+    yang sudah jatuh tempo, yang deadline-nya paling awal dikirim lebih
+    dulu; prioritas hanya memecah deadline yang sama. Channel yang
+    tertinggal lebih dari satu interval tidak mengejar poll yang hilang.
+    """
+
+    def __init__(self, baudrate=DEFAULT_BAUD):
+        self.baudrate = baudrate
+        self.channels = {}
+
+    def add_channel(self, channel):
+        self.channels[channel.name] = channel
+        channel.deadline = time.monotonic()
+
+    def configure(self, name, interval=None, priority=None, enabled=None):
+        channel = self.channels[name]
+        if interval is not None:
+            channel.interval = interval
+            channel.deadline = min(channel.deadline, time.monotonic() + interval)
+        if priority is not None:
+            channel.priority = priority
+        if enabled is not None:
+            channel.enabled = enabled
+
+    def reset(self):
+        now = time.monotonic()
+        for channel in self.channels.values():
+            channel.deadline = now
+
+    def next_due(self, now):
+        """Channel yang harus dikirim sekarang, atau None"""
+        due = [c for c in self._active() if c.deadline <= now]
+        if not due:
+            return None
+        return min(due, key=lambda c: (c.deadline, -c.priority))
+
+    def wait_time(self, now):
+        """Detik sampai channel berikutnya jatuh tempo (None jika tidak ada)"""
+        active = self._active()
+        if not active:
+            return None
+        return max(0.0, min(c.deadline for c in active) - now)
+
+    def completed(self, channel, rtt, now):
+        """Catat transaksi selesai dan jadwalkan deadline berikutnya"""
+        if channel.rtt is None:
+            channel.rtt = rtt
+        else:
+            channel.rtt += RTT_SMOOTHING * (rtt - channel.rtt)
+
+        channel.deadline += channel.interval
+        if channel.deadline < now - channel.interval:
+            channel.deadline = now
+
+    def transaction_time(self, channel):
+        if channel.rtt is not None:
+            return channel.rtt
+        return estimate_command_time(channel.request.command, self.baudrate)
+
+    def load(self):
+        """Fraksi waktu bus yang diminta semua channel (>1.0 = overload)"""
+        return sum(self.transaction_time(c) / c.interval for c in self._active())
+
+    def latency_bound(self, request, backoff=RETRY_BACKOFF_MAX):
+        """Batas atas submit -> ack untuk satu request mendesak (detik)
+
+        Request mendesak (PRIORITY_URGENT, di depan perintah kontrol)
+        menunggu paling lama satu percobaan poll yang sedang berjalan plus
+        satu jeda backoff retry-nya (preempt dicek sebelum dan sesudah
+        jeda), lalu transaksinya sendiri. Cek presence port berjalan di
+        thread lain. Tidak termasuk request mendesak lain yang antre lebih
+        dulu, dan tidak berlaku saat link putus (reconnect).
+        """
+        blocking = max((c.request.timeout for c in self.channels.values()), default=0.0)
+        return blocking + backoff + request.timeout
+
+    def _active(self):
+        return [c for c in self.channels.values() if c.enabled and c.interval > 0]
+
+
+def default_scheduler(baudrate=DEFAULT_BAUD):
+    """Channel standar: ultrasonik (FC 0x01), TCRT (FC 0x02), relay (FC 0x03)
+
+    Channel "sensors" (FC 0x04) membaca ultrasonik dan TCRT dalam satu
+    transaksi, channel "registers" membaca semua register mentah sensor
+    lewat passthrough (FC 0x05); keduanya mati secara default karena
+    butuh firmware yang mendukung. Timeout setiap poll dibatasi
+    transaction_deadline agar tulis relay tidak lama menunggu.
+    """
+    def request(tag, command, slave):
+        return Request(tag, command, slave, transaction_deadline(command, baudrate))
+
+    scheduler = PollScheduler(baudrate)
+    scheduler.add_channel(PollChannel(
+        "ultrasonic", request("ultrasonic", CMD_READ_ULTRASONIC, SLAVE_SENSOR_ADDR),
+        interval=0.2, priority=1))
+    scheduler.add_channel(PollChannel(
+        "tcrt", request("tcrt", CMD_READ_TCRT, SLAVE_SENSOR_ADDR),
+        interval=0.05, priority=2))
+    scheduler.add_channel(PollChannel(
+        "relay", request("relay", CMD_CONTROL_RELAY + CMD_RELAY_STATUS, SLAVE_AKTUATOR_ADDR),
+        interval=1.0, priority=0))
+    scheduler.add_channel(PollChannel(
+        "sensors", request("sensors", CMD_READ_SENSORS, SLAVE_SENSOR_ADDR),
+        interval=0.0, priority=2))
+    scheduler.add_channel(PollChannel(
+        "registers", request("registers", REGISTERS_COMMAND, SLAVE_SENSOR_ADDR),
+        interval=0.0, priority=2))
+    return scheduler
@@ -0,0 +1,791 @@
+import os
+import re
+import time
+
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
+                             QPushButton, QGroupBox, QCheckBox, QFrame,
+                             QGridLayout, QDoubleSpinBox, QSpinBox, QComboBox)
+from PyQt5.QtCore import QTimer, Qt, pyqtSignal
+from PyQt5.QtGui import QFont
+
+from client import PRIORITY_NORMAL, PRIORITY_URGENT, Request
+from deadband import HEARTBEAT, ChangeFilter
+from protocol import (SLAVE_SENSOR_ADDR, SLAVE_AKTUATOR_ADDR,
+                      CMD_READ_ULTRASONIC, CMD_READ_TCRT, CMD_CONTROL_RELAY, CMD_READ_SENSORS,
+                      FC_READ_SENSORS, ERR_CRC, ERR_TIMEOUT, ERR_REQUEST,
+                      REG_ECHO_US, REG_DISTANCE_MM, REG_TCRT_RAW, REG_TCRT_STATE,
+                      CMD_RELAY_STATUS, ProtocolError, is_error_frame)
+from modbus import decode_registers
+from plotwidget import LivePlot
+from recorder import Recorder
+from scheduler import transaction_deadline
+from statspanel import StatsPanel
+from viewmodel import ViewModel
+
+# ===== DIREKTORI REKAMAN =====
+RECORDINGS_DIR = "recordings"
+
+# Lebar jendela plot live (judul, detik)
+LIVE_SPANS = [("1 min", 60), ("10 min", 600), ("1 hour", 3600)]
+
+
+def value_style(color):
+    """Stylesheet label nilai sensor/relay dengan warna teks tertentu"""
+    return f"""
+            QLabel {{
+                background-color: #2c3e50;
+                color: {color};
+                border: 2px solid #34495e;
+                border-radius: 4px;
+                padding: 10px;
+            }}
+        """
+
+
+# ===== VARIAN STYLE (dibuat sekali, dipakai ViewModel) =====
+STATUS_STYLES = {
+    "connecting": "color: #f39c12;",
+    "connected": "color: #27ae60;",
+    "disconnected": "color: #e74c3c;",
+}
+LOAD_STYLES = {
+    "normal": "color: white;",
+    "overload": "color: #e74c3c;",
+}
+ULTRA_STYLES = {"normal": value_style("#1abc9c")}
+TCRT_STYLES = {
+    "detected": value_style("#e74c3c"),
+    "clear": value_style("#95a5a6"),
+}
+RELAY_STYLES = {
+    "on": value_style("#27ae60"),
+    "off": value_style("#e74c3c"),
+}
+
+
+def recording_path(port):
+    """Direktori store rekaman untuk satu port"""
+    name = re.sub(r"[^A-Za-z0-9_.-]+", "_", port).strip("_") or "port"
+    return os.path.join(RECORDINGS_DIR, name)
+
+
+class SegmentPanel(QWidget):
+    """Panel sensor (0x24) dan aktuator (0x66) untuk satu master bridge"""
+    
+    log_message = pyqtSignal(str)
+    disconnect_requested = pyqtSignal(str)
+    
+    def __init__(self, port, worker, scheduler, parent=None):
+        super().__init__(parent)
+        self.port = port
+        self.worker = worker
+        self.scheduler = scheduler
+        
+        # Variables
+        self.is_connected = False
+        self.bus_overloaded = False
+        self.link_lost_at = None
+        self.ack_max = 0.0     # ms, latency ack relay terburuk sesi ini
+        self.ack_bound = None  # ms, batas atas dari scheduler.latency_bound
+        self.change_filter = None   # ChangeFilter aktif di worker
+        self.last_reading = None    # monotonic, frame data terakhir dari worker
+        self.stale_reported = False
+        
+        self.worker.connected.connect(self.on_connected)
+        self.worker.disconnected.connect(self.on_disconnected)
+        self.worker.link_lost.connect(self.on_link_lost)
+        self.worker.response_received.connect(self.on_response)
+        self.worker.poll_load_changed.connect(self.on_poll_load_changed)
+        
+        # Setup UI
+        self.view = ViewModel(parent=self)
+        self.init_ui()
+        
+        # Update tampilan polls/s tiap detik
+        self.rate_timer = QTimer(self)
+        self.rate_timer.timeout.connect(self.update_poll_rates)
+        self.rate_timer.start(1000)
+    
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setSpacing(10)
+        layout.setContentsMargins(0, 0, 0, 0)
+        
+        # ===== SEGMENT HEADER =====
+        header_layout = QHBoxLayout()
+        
+        port_label = QLabel(f"🧩 {self.port}")
+        port_label.setFont(QFont("Arial", 11, QFont.Bold))
+        header_layout.addWidget(port_label)
+        
+        # Status Label
+        self.status_label = QLabel("● Connecting...")
+        self.status_label.setFont(QFont("Arial", 10, QFont.Bold))
+        self.view.bind("status", self.status_label, STATUS_STYLES, "connecting")
+        header_layout.addWidget(self.status_label)
+        
+        header_layout.addStretch()
+        
+        # Poll Rate Label
+        self.rate_label = QLabel("0x24: 0.0 polls/s | 0x66: 0.0 polls/s")
+        self.rate_label.setFont(QFont("Arial", 10))
+        self.view.bind("rate", self.rate_label)
+        header_layout.addWidget(self.rate_label)
+        
+        # Record Checkbox
+        self.record_check = QCheckBox("⏺ Record")
+        self.record_check.setFont(QFont("Arial", 10))
+        self.record_check.stateChanged.connect(self.toggle_recording)
+        header_layout.addWidget(self.record_check)
+        
+        # Disconnect Button
+        disconnect_btn = QPushButton("Disconnect")
+        disconnect_btn.setFixedWidth(120)
+        disconnect_btn.clicked.connect(lambda: self.disconnect_requested.emit(self.port))
+        disconnect_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #e74c3c;
+                color: white;
+                border: none;
+                padding: 8px;
+                border-radius: 4px;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background-color: #c0392b;
+            }
+        """)
+        header_layout.addWidget(disconnect_btn)
+        layout.addLayout(header_layout)
+        
+        # ===== SENSOR FRAME =====
+        sensor_frame = self.create_sensor_frame()
+        layout.addWidget(sensor_frame)
+        
+        # ===== ACTUATOR FRAME =====
+        actuator_frame = self.create_actuator_frame()
+        layout.addWidget(actuator_frame)
+        
+        # ===== PLOT FRAME =====
+        plot_frame = self.create_plot_frame()
+        layout.addWidget(plot_frame)
+        
+        # ===== STATISTICS FRAME =====
+        self.stats_panel = StatsPanel()
+        layout.addWidget(self.stats_panel)
+        
+        # Mode replay: baca/kontrol manual, polling, rekam dan report-by-exception
+        # (ChangeFilter hanya menyaring poll live) tidak berlaku
+        if self.worker.read_only:
+            for widget in [self.ultra_btn, self.tcrt_btn, self.sensors_btn, self.relay_on_btn,
+                           self.relay_off_btn, self.auto_read_check,
+                           self.record_check, self.exception_check, self.deadband_spin,
+                           self.deadband_pct_spin, self.heartbeat_spin] + self.poll_spins:
+                widget.setEnabled(False)
+    
+    def create_sensor_frame(self):
+        """Frame untuk slave sensor"""
+        group = QGroupBox("📡 Slave Sensor (0x24)")
+        group.setFont(QFont("Arial", 12, QFont.Bold))
+        layout = QVBoxLayout()
+        layout.setSpacing(15)
+        
+        # === ULTRASONIK ===
+        ultra_layout = QHBoxLayout()
+        
+        ultra_label = QLabel("Sensor Ultrasonik:")
+        ultra_label.setFont(QFont("Arial", 11, QFont.Bold))
+        ultra_layout.addWidget(ultra_label)
+        
+        self.ultra_btn = QPushButton("Read Distance")
+        self.ultra_btn.setFixedWidth(150)
+        self.ultra_btn.clicked.connect(self.read_ultrasonic)
+        self.ultra_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #3498db;
+                color: white;
+                border: none;
+                padding: 10px;
+                border-radius: 4px;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background-color: #2980b9;
+            }
+        """)
+        ultra_layout.addWidget(self.ultra_btn)
+        
+        self.ultra_value = QLabel("-- cm")
+        self.ultra_value.setFont(QFont("Arial", 18, QFont.Bold))
+        self.ultra_value.setAlignment(Qt.AlignCenter)
+        self.ultra_value.setFixedWidth(150)
+        self.view.bind("ultra", self.ultra_value, ULTRA_STYLES, "normal")
+        ultra_layout.addWidget(self.ultra_value)
+        ultra_layout.addStretch()
+        
+        layout.addLayout(ultra_layout)
+        
+        # Separator
+        line = QFrame()
+        line.setFrameShape(QFrame.HLine)
+        line.setFrameShadow(QFrame.Sunken)
+        layout.addWidget(line)
+        
+        # === TCRT5000 ===
+        tcrt_layout = QHBoxLayout()
+        
+        tcrt_label = QLabel("Sensor TCRT5000:")
+        tcrt_label.setFont(QFont("Arial", 11, QFont.Bold))
+        tcrt_layout.addWidget(tcrt_label)
+        
+        self.tcrt_btn = QPushButton("Read Status")
+        self.tcrt_btn.setFixedWidth(150)
+        self.tcrt_btn.clicked.connect(self.read_tcrt)
+        self.tcrt_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #3498db;
+                color: white;
+                border: none;
+                padding: 10px;
+                border-radius: 4px;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background-color: #2980b9;
+            }
+        """)
+        tcrt_layout.addWidget(self.tcrt_btn)
+        
+        self.tcrt_value = QLabel("NO OBJECT")
+        self.tcrt_value.setFont(QFont("Arial", 16, QFont.Bold))
+        self.tcrt_value.setAlignment(Qt.AlignCenter)
+        self.tcrt_value.setFixedWidth(180)
+        self.view.bind("tcrt", self.tcrt_value, TCRT_STYLES, "clear")
+        tcrt_layout.addWidget(self.tcrt_value)
+        tcrt_layout.addStretch()
+        
+        layout.addLayout(tcrt_layout)
+        
+        # Auto Read Checkbox
+        auto_layout = QHBoxLayout()
+        
+        # Baca ultrasonik + TCRT dalam satu transaksi (FC 0x04)
+        self.sensors_btn = QPushButton("Read Both")
+        self.sensors_btn.setFixedWidth(150)
+        self.sensors_btn.clicked.connect(self.read_sensors)
+        self.sensors_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #3498db;
+                color: white;
+                border: none;
+                padding: 10px;
+                border-radius: 4px;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background-color: #2980b9;
+            }
+        """)
+        auto_layout.addWidget(self.sensors_btn)
+        
+        self.auto_read_check = QCheckBox("Auto Read")
+        self.auto_read_check.setFont(QFont("Arial", 10))
+        self.auto_read_check.stateChanged.connect(self.toggle_auto_read)
+        auto_layout.addWidget(self.auto_read_check)
+        auto_layout.addStretch()
+        
+        self.load_label = QLabel("Bus load: --")
+        self.load_label.setFont(QFont("Arial", 10))
+        self.view.bind("load", self.load_label, LOAD_STYLES)
+        auto_layout.addWidget(self.load_label)
+        layout.addLayout(auto_layout)
+        
+        # Rate dan prioritas per channel polling
+        poll_grid = QGridLayout()
+        self.poll_spins = []
+        for col, title in enumerate(["Channel", "Rate", "Priority"]):
+            header = QLabel(title)
+            header.setFont(QFont("Arial", 9, QFont.Bold))
+            poll_grid.addWidget(header, 0, col)
+        
+        channel_titles = [
+            ("ultrasonic", "Ultrasonik (0x24 / FC 0x01)"),
+            ("tcrt", "TCRT5000 (0x24 / FC 0x02)"),
+            ("relay", "Relay readback (0x66 / FC 0x03)"),
+            ("sensors", "Ultrasonik + TCRT (0x24 / FC 0x04)"),
+            ("registers", "Register mentah (0x24 / FC 0x05)"),
+        ]
+        for row, (name, title) in enumerate(channel_titles, start=1):
+            channel = self.scheduler.channels[name]
+            
+            channel_label = QLabel(title)
+            channel_label.setFont(QFont("Arial", 10))
+            poll_grid.addWidget(channel_label, row, 0)
+            
+            rate_spin = QDoubleSpinBox()
+            rate_spin.setRange(0.0, 50.0)
+            rate_spin.setDecimals(1)
+            rate_spin.setSuffix(" Hz")
+            rate_spin.setValue(channel.rate)
+            rate_spin.valueChanged.connect(
+                lambda hz, name=name: self.worker.configure_channel(
+                    name, interval=1.0 / hz if hz > 0 else 0.0))
+            poll_grid.addWidget(rate_spin, row, 1)
+            self.poll_spins.append(rate_spin)
+            
+            priority_spin = QSpinBox()
+            priority_spin.setRange(0, 9)
+            priority_spin.setValue(channel.priority)
+            priority_spin.valueChanged.connect(
+                lambda prio, name=name: self.worker.configure_channel(
+                    name, priority=prio))
+            poll_grid.addWidget(priority_spin, row, 2)
+            self.poll_spins.append(priority_spin)
+        
+        layout.addLayout(poll_grid)
+        
+        # Report-by-exception: hanya perubahan nilai yang ditampilkan/direkam
+        exception_layout = QHBoxLayout()
+        self.exception_check = QCheckBox("Report by exception")
+        self.exception_check.setFont(QFont("Arial", 10))
+        self.exception_check.stateChanged.connect(self.update_change_filter)
+        exception_layout.addWidget(self.exception_check)
+        
+        self.deadband_spin = QDoubleSpinBox()
+        self.deadband_spin.setRange(0.0, 50.0)
+        self.deadband_spin.setDecimals(1)
+        self.deadband_spin.setPrefix("± ")
+        self.deadband_spin.setSuffix(" cm")
+        self.deadband_spin.setValue(1.0)
+        self.deadband_spin.valueChanged.connect(self.update_change_filter)
+        exception_layout.addWidget(self.deadband_spin)
+        
+        self.deadband_pct_spin = QDoubleSpinBox()
+        self.deadband_pct_spin.setRange(0.0, 50.0)
+        self.deadband_pct_spin.setDecimals(1)
+        self.deadband_pct_spin.setPrefix("± ")
+        self.deadband_pct_spin.setSuffix(" %")
+        self.deadband_pct_spin.valueChanged.connect(self.update_change_filter)
+        exception_layout.addWidget(self.deadband_pct_spin)
+        
+        self.heartbeat_spin = QDoubleSpinBox()
+        self.heartbeat_spin.setRange(0.0, 600.0)
+        self.heartbeat_spin.setDecimals(1)
+        self.heartbeat_spin.setPrefix("Heartbeat ")
+        self.heartbeat_spin.setSuffix(" s")
+        self.heartbeat_spin.setValue(HEARTBEAT)
+        self.heartbeat_spin.valueChanged.connect(self.update_change_filter)
+        exception_layout.addWidget(self.heartbeat_spin)
+        exception_layout.addStretch()
+        layout.addLayout(exception_layout)
+        
+        group.setLayout(layout)
+        return group
+    
+    def create_actuator_frame(self):
+        """Frame untuk slave aktuator"""
+        group = QGroupBox("🔌 Slave Aktuator (0x66)")
+        group.setFont(QFont("Arial", 12, QFont.Bold))
+        layout = QHBoxLayout()
+        
+        relay_label = QLabel("Relay Control:")
+        relay_label.setFont(QFont("Arial", 11, QFont.Bold))
+        layout.addWidget(relay_label)
+        
+        # ON Button
+        self.relay_on_btn = QPushButton("ON")
+        self.relay_on_btn.setFixedSize(120, 60)
+        self.relay_on_btn.clicked.connect(lambda: self.control_relay(1))
+        self.relay_on_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #27ae60;
+                color: white;
+                border: none;
+                border-radius: 4px;
+                font-size: 14pt;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background-color: #229954;
+            }
+            QPushButton:pressed {
+                background-color: #1e8449;
+            }
+        """)
+        layout.addWidget(self.relay_on_btn)
+        
+        # OFF Button
+        self.relay_off_btn = QPushButton("OFF")
+        self.relay_off_btn.setFixedSize(120, 60)
+        self.relay_off_btn.clicked.connect(lambda: self.control_relay(0))
+        self.relay_off_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #e74c3c;
+                color: white;
+                border: none;
+                border-radius: 4px;
+                font-size: 14pt;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background-color: #c0392b;
+            }
+            QPushButton:pressed {
+                background-color: #a93226;
+            }
+        """)
+        layout.addWidget(self.relay_off_btn)
+        
+        # Status Label
+        self.relay_status = QLabel("OFF")
+        self.relay_status.setFont(QFont("Arial", 18, QFont.Bold))
+        self.relay_status.setAlignment(Qt.AlignCenter)
+        self.relay_status.setFixedWidth(120)
+        self.view.bind("relay", self.relay_status, RELAY_STYLES, "off")
+        layout.addWidget(self.relay_status)
+        
+        # Latency perintah -> ack relay (interlock)
+        self.ack_label = QLabel("Ack: --")
+        self.ack_label.setFont(QFont("Arial", 10))
+        self.view.bind("ack", self.ack_label, LOAD_STYLES)
+        layout.addWidget(self.ack_label)
+        
+        layout.addStretch()
+        group.setLayout(layout)
+        return group
+    
+    def create_plot_frame(self):
+        """Frame plot live jarak dan status TCRT"""
+        group = QGroupBox("📈 Live Plot")
+        group.setFont(QFont("Arial", 12, QFont.Bold))
+        layout = QVBoxLayout()
+        
+        span_layout = QHBoxLayout()
+        span_label = QLabel("Window:")
+        span_label.setFont(QFont("Arial", 10))
+        span_layout.addWidget(span_label)
+        
+        self.span_combo = QComboBox()
+        for title, span in LIVE_SPANS:
+            self.span_combo.addItem(title, span)
+        self.span_combo.currentIndexChanged.connect(self.change_plot_span)
+        span_layout.addWidget(self.span_combo)
+        span_layout.addStretch()
+        layout.addLayout(span_layout)
+        
+        # Distance Plot
+        self.ultra_plot = LivePlot(" cm", span=LIVE_SPANS[0][1])
+        self.ultra_plot.setMinimumHeight(140)
+        layout.addWidget(self.ultra_plot)
+        
+        # TCRT Plot (0 = no object, 1 = detected)
+        self.tcrt_plot = LivePlot("", span=LIVE_SPANS[0][1])
+        self.tcrt_plot.y_range = (0.0, 1.0)
+        self.tcrt_plot.setMinimumHeight(70)
+        layout.addWidget(self.tcrt_plot)
+        
+        group.setLayout(layout)
+        return group
+    
+    def change_plot_span(self):
+        """Ubah lebar jendela waktu kedua plot"""
+        span = self.span_combo.currentData()
+        self.ultra_plot.set_span(span)
+        self.tcrt_plot.set_span(span)
+    
+    def on_connected(self, port):
+        """Port berhasil dibuka oleh worker"""
+        self.is_connected = True
+        self.view.set("status", "● Connected", "connected")
+        if self.link_lost_at is not None:
+            elapsed = (time.monotonic() - self.link_lost_at) * 1000.0
+            self.link_lost_at = None
+            self.log(f"🔁 Reconnected to {port} after {elapsed:.0f} ms")
+        else:
+            self.log(f"✅ Connected to {port}")
+    
+    def on_link_lost(self, message):
+        """Port hilang; worker mencoba reconnect di background"""
+        self.is_connected = False
+        self.link_lost_at = time.monotonic()
+        self.view.set("status", "● Reconnecting...", "connecting")
+        self.log(f"⚠️ Link lost ({message}), reconnecting...")
+    
+    def on_disconnected(self):
+        """Port ditutup worker atau rekaman selesai diputar"""
+        self.is_connected = False
+        if self.worker.read_only:
+            self.view.set("status", "● Replay finished", "disconnected")
+            self.log("⏹ Replay finished")
+        else:
+            self.view.set("status", "● Disconnected", "disconnected")
+    
+    def read_ultrasonic(self):
+        """Baca sensor ultrasonik"""
+        if not self.is_connected:
+            self.log("❌ Not connected!")
+            return
+        
+        self.worker.submit(self.make_request("ultrasonic", CMD_READ_ULTRASONIC, SLAVE_SENSOR_ADDR))
+    
+    def read_tcrt(self):
+        """Baca sensor TCRT5000"""
+        if not self.is_connected:
+            self.log("❌ Not connected!")
+            return
+        
+        self.worker.submit(self.make_request("tcrt", CMD_READ_TCRT, SLAVE_SENSOR_ADDR))
+    
+    def read_sensors(self):
+        """Baca ultrasonik dan TCRT5000 dalam satu transaksi"""
+        if not self.is_connected:
+            self.log("❌ Not connected!")
+            return
+        
+        self.worker.submit(self.make_request("sensors", CMD_READ_SENSORS, SLAVE_SENSOR_ADDR))
+    
+    def make_request(self, tag, command, slave, priority=PRIORITY_NORMAL):
+        """Request manual dengan timeout yang sama seperti polling"""
+        timeout = transaction_deadline(command, self.scheduler.baudrate)
+        return Request(tag, command, slave, timeout, priority)
+    
+    def control_relay(self, state):
+        """Kontrol relay ON/OFF sebagai job mendesak (mendahului polling)"""
+        if not self.is_connected:
+            self.log("❌ Not connected!")
+            return
+        
+        request = self.make_request("relay", CMD_CONTROL_RELAY + bytes([state]),
+                                    SLAVE_AKTUATOR_ADDR, PRIORITY_URGENT)
+        self.ack_bound = self.scheduler.latency_bound(request) * 1000.0
+        self.worker.submit(request)
+    
+    def on_relay_ack(self, response):
+        """Tampilkan latency perintah -> ack relay terhadap batas atasnya"""
+        ms = response.latency * 1000.0
+        data = response.data
+        if response.error or not data or is_error_frame(data):
+            self.view.set("ack", f"Ack: failed after {ms:.0f} ms", "overload")
+            return
+        
+        self.ack_max = max(self.ack_max, ms)
+        late = self.ack_bound is not None and ms > self.ack_bound
+        bound = "--" if self.ack_bound is None else f"{self.ack_bound:.0f}"
+        self.view.set("ack", f"Ack: {ms:.0f} ms (max {self.ack_max:.0f} / bound {bound} ms)",
+                      "overload" if late else "normal")
+        if late:
+            self.log(f"⚠️ Relay ack took {ms:.0f} ms, over the {bound} ms bound")
+    
+    def on_response(self, response):
+        """Terima hasil transaksi dari worker thread"""
+        if (response.tag == "relay" and response.latency is not None
+                and response.command[1:] != CMD_RELAY_STATUS):
+            self.on_relay_ack(response)
+        
+        handler = {
+            "ultrasonic": self.handle_ultrasonic,
+            "tcrt": self.handle_tcrt,
+            "relay": self.handle_relay,
+            "sensors": self.handle_sensors,
+            "registers": self.handle_registers,
+        }[response.tag]
+        
+        if response.error == "timeout":
+            if response.tag == "relay":
+                self.log("⏱️ Timeout: No response from actuator")
+            else:
+                self.log("⏱️ Timeout: No response from sensor")
+            return
+        
+        if response.error:
+            if response.tag == "relay":
+                self.log(f"❌ Control error: {response.error}")
+            else:
+                self.log(f"❌ Read error: {response.error}")
+            return
+        
+        data = response.data
+        
+        # Cek frame error (2 byte, langsung dikirim parser tanpa timeout)
+        if is_error_frame(data):
+            if data[1] == ERR_CRC:
+                self.log("❌ Error: CRC mismatch")
+            elif data[1] == ERR_TIMEOUT:
+                self.log("❌ Error: Slave timeout")
+            elif data[1] == ERR_REQUEST:
+                self.log("❌ Error: Passthrough request rejected")
+            return
+        
+        if response.tag != "relay":
+            self.last_reading = time.monotonic()
+            self.stale_reported = False
+        
+        if response.tag in ("sensors", "registers"):
+            handler(data)
+        else:
+            handler(data[0], data[1], data[2])
+    
+    def handle_ultrasonic(self, addr, fc, value):
+        """Tampilkan hasil sensor ultrasonik"""
+        if addr == 0x24 and fc == 0x01:
+            self.view.set("ultra", f"{value} cm")
+            self.ultra_plot.add_sample(time.time(), value)
+            self.log(f"📏 Ultrasonic: {value} cm [0x{addr:02X}][0x{fc:02X}][0x{value:02X}]")
+        else:
+            self.log(f"⚠️ Invalid response: [0x{addr:02X}][0x{fc:02X}][0x{value:02X}]")
+    
+    def handle_tcrt(self, addr, fc, value):
+        """Tampilkan hasil sensor TCRT5000"""
+        if addr == 0x24 and fc == 0x02:
+            self.tcrt_plot.add_sample(time.time(), 1 if value == 0x01 else 0)
+            if value == 0x01:
+                self.view.set("tcrt", "DETECTED", "detected")
+                self.log(f"🔴 TCRT: Object DETECTED [0x{addr:02X}][0x{fc:02X}][0x{value:02X}]")
+            else:
+                self.view.set("tcrt", "NO OBJECT", "clear")
+                self.log(f"⚪ TCRT: No object [0x{addr:02X}][0x{fc:02X}][0x{value:02X}]")
+        else:
+            self.log(f"⚠️ Invalid response: [0x{addr:02X}][0x{fc:02X}][0x{value:02X}]")
+    
+    def handle_sensors(self, frame):
+        """Tampilkan jarak dan status TCRT dari satu frame FC 0x04"""
+        if len(frame) == 4 and frame[0] == 0x24 and frame[1] == FC_READ_SENSORS:
+            distance, tcrt = frame[2], frame[3]
+            now = time.time()
+            self.view.set("ultra", f"{distance} cm")
+            self.ultra_plot.add_sample(now, distance)
+            self.tcrt_plot.add_sample(now, 1 if tcrt == 0x01 else 0)
+            if tcrt == 0x01:
+                self.view.set("tcrt", "DETECTED", "detected")
+            else:
+                self.view.set("tcrt", "NO OBJECT", "clear")
+            state = "DETECTED" if tcrt == 0x01 else "no object"
+            raw = "".join(f"[0x{b:02X}]" for b in frame)
+            self.log(f"📡 Sensors: {distance} cm, TCRT {state} {raw}")
+        else:
+            self.log("⚠️ Invalid response: " + "".join(f"[0x{b:02X}]" for b in frame))
+    
+    def handle_registers(self, frame):
+        """Tampilkan register mentah sensor (resolusi mm, TCRT analog)"""
+        if len(frame) == 3:
+            # Sampel replay (slave, FC 0x05, jarak mm): hanya jarak
+            distance = frame[2] / 10.0
+            self.view.set("ultra", f"{distance:.1f} cm")
+            self.ultra_plot.add_sample(time.time(), distance)
+            self.log(f"🧾 Registers: {distance:.1f} cm")
+            return
+        
+        try:
+            registers = decode_registers(frame[2:], 0x24)
+        except ProtocolError as e:
+            self.log(f"❌ Register read error: {e}")
+            return
+        
+        distance = registers[REG_DISTANCE_MM] / 10.0
+        tcrt = registers[REG_TCRT_STATE]
+        now = time.time()
+        self.view.set("ultra", f"{distance:.1f} cm")
+        self.ultra_plot.add_sample(now, distance)
+        self.tcrt_plot.add_sample(now, 1 if tcrt == 0x01 else 0)
+        if tcrt == 0x01:
+            self.view.set("tcrt", "DETECTED", "detected")
+        else:
+            self.view.set("tcrt", "NO OBJECT", "clear")
+        self.log(f"🧾 Registers: {distance:.1f} cm (echo {registers[REG_ECHO_US]} us), "
+                 f"TCRT raw {registers[REG_TCRT_RAW]}")
+    
+    def handle_relay(self, addr, fc, value):
+        """Tampilkan status relay"""
+        # FIX: Function code untuk relay adalah 0x03, bukan 0x01
+        if addr == 0x66 and fc == 0x03:
+            if value == 0x01:
+                self.view.set("relay", "ON", "on")
+                self.log(f"✅ Relay: ON [0x{addr:02X}][0x{fc:02X}][0x{value:02X}]")
+            else:
+                self.view.set("relay", "OFF", "off")
+                self.log(f"⛔ Relay: OFF [0x{addr:02X}][0x{fc:02X}][0x{value:02X}]")
+        else:
+            self.log(f"⚠️ Invalid response: [0x{addr:02X}][0x{fc:02X}][0x{value:02X}]")
+    
+    def toggle_auto_read(self, state):
+        """Toggle auto read sensor"""
+        if state == Qt.Checked:
+            if not self.is_connected:
+                self.auto_read_check.setChecked(False)
+                self.log("❌ Connect first before enabling auto read!")
+                return
+            
+            self.log("🔄 Auto read enabled")
+            self.worker.set_polling(True)
+        else:
+            self.worker.set_polling(False)
+            self.log("⏸️ Auto read disabled")
+    
+    def update_change_filter(self, *args):
+        """Pasang ulang ChangeFilter di worker sesuai pengaturan deadband"""
+        if self.exception_check.isChecked():
+            self.change_filter = ChangeFilter(self.deadband_spin.value(),
+                                              self.deadband_pct_spin.value(),
+                                              self.heartbeat_spin.value())
+        else:
+            self.change_filter = None
+        self.worker.set_change_filter(self.change_filter)
+        
+    def on_poll_load_changed(self, load):
+        """Tampilkan beban bus dari rate polling yang diminta"""
+        if load > 1.0:
+            self.view.set("load", f"Bus load: {load * 100:.0f}%", "overload")
+            if not self.bus_overloaded:
+                self.log(f"⚠️ Requested poll rates exceed bus capacity ({load * 100:.0f}%)")
+        else:
+            self.view.set("load", f"Bus load: {load * 100:.0f}%", "normal")
+        self.bus_overloaded = load > 1.0
+    
+    def update_poll_rates(self):
+        """Tampilkan polls/s untuk node sensor dan aktuator"""
+        self.view.set(
+            "rate",
+            f"0x24: {self.worker.stats.rate(SLAVE_SENSOR_ADDR):.1f} polls/s | "
+            f"0x66: {self.worker.stats.rate(SLAVE_AKTUATOR_ADDR):.1f} polls/s"
+            + self.exception_summary()
+        )
+        self.stats_panel.update_snapshot(self.worker.stats.snapshot())
+        # Beban bus dihitung ulang dari RTT terukur selama polling
+        if self.auto_read_check.isChecked():
+            self.on_poll_load_changed(self.scheduler.load())
+            self.check_stale()
+    
+    def exception_summary(self):
+        """Fraksi hasil polling yang diteruskan oleh ChangeFilter"""
+        if self.change_filter is None:
+            return ""
+        return f" | reported {self.change_filter.ratio() * 100:.0f}%"
+    
+    def check_stale(self):
+        """Tanpa data lebih dari 2x heartbeat: nilai di layar sudah basi"""
+        change_filter = self.change_filter
+        if change_filter is None or not change_filter.heartbeat or self.last_reading is None:
+            return
+        age = time.monotonic() - self.last_reading
+        if age > 2 * change_filter.heartbeat and not self.stale_reported:
+            self.stale_reported = True
+            self.log(f"⚠️ No sensor update for {age:.1f} s, displayed values are stale")
+    
+    def toggle_recording(self, state):
+        """Mulai/berhenti merekam pembacaan ke store biner"""
+        if state == Qt.Checked:
+            path = recording_path(self.port)
+            try:
+                self.worker.set_recorder(Recorder(path))
+            except Exception as e:
+                self.record_check.setChecked(False)
+                self.log(f"❌ Recording failed: {str(e)}")
+                return
+            self.log(f"⏺ Recording to {path}")
+        else:
+            self.worker.set_recorder(None)
+            self.log("⏹ Recording stopped")
+    
+    def log(self, message):
+        """Kirim pesan ke log utama dengan prefix port"""
+        self.log_message.emit(f"[{self.port}] {message}")
@@ -1,6 +1,20 @@
 #include <Arduino.h>
-#include <SoftwareSerial.h>
-SoftwareSerial rs485(2, 3); // RX, TX
+
+// ===== BAUD RATE =====
+// Harus sama dengan RS485_BAUD di master.ino dan aktuator.ino
+#define RS485_BAUD 9600
+
+// ===== PORT RS-485 =====
+// Aktifkan untuk memakai UART hardware (pin 0/1) untuk RS-485, wajib
+// untuk 115200. Serial tidak bisa lagi dipakai untuk debug.
+// #define RS485_HW_UART
+
+#ifdef RS485_HW_UART
+  HardwareSerial &rs485 = Serial;
+#else
+  #include <SoftwareSerial.h>
+  SoftwareSerial rs485(2, 3); // RX, TX
+#endif
 
 // ===== KONFIGURASI NODE =====
 #define SLAVE_ADDRESS 0x24
@@ -23,10 +37,25 @@ unsigned long lastByteTime = 0;
 #define FC_READ_ULTRASONIC   0x01
 #define FC_READ_TCRT5000     0x02
 #define FC_CONTROL_RELAY     0x03
+#define FC_READ_SENSORS      0x04  // Jarak + TCRT dalam satu response
+#define FC_READ_REGISTERS    0x05  // Blok register 16-bit (passthrough master)
+#define EXCEPTION_FLAG       0x80
+#define EXC_ILLEGAL_ADDRESS  0x02
+
+// ===== REGISTER (FC_READ_REGISTERS) =====
+// Request:  [ADDR][0x05][START][COUNT][CRC_L][CRC_H]
+// Response: [ADDR][0x05][BYTE_COUNT][REG_H][REG_L]...[CRC_L][CRC_H]
+#define REG_ECHO_US          0  // Lebar pulsa echo mentah (us)
+#define REG_DISTANCE_MM      1  // Jarak (mm)
+#define REG_TCRT_RAW         2  // analogRead TCRT5000 (0..1023)
+#define REG_TCRT_STATE       3  // 1 = objek terdeteksi
+#define SENSOR_REGISTERS     4
 
 void setup() {
-  rs485.begin(9600);
+  rs485.begin(RS485_BAUD);
+#ifndef RS485_HW_UART
   Serial.begin(9600);
+#endif
   // Setup pin Ultrasonik
   pinMode(TRIG_PIN, OUTPUT);
   pinMode(ECHO_PIN, INPUT);
@@ -47,8 +76,9 @@ void loop() {
     lastByteTime = millis();
     rxBuffer[rxIndex++] = inByte;
     
-    // Proses paket jika sudah 5 byte: [ADDR][FC][DATA][CRC_L][CRC_H]
-    if (rxIndex >= 5) {
+    // Proses paket jika sudah lengkap: [ADDR][FC][DATA][CRC_L][CRC_H],
+    // request register 6 byte
+    if (rxIndex >= 2 && rxIndex >= requestLength(rxBuffer[1])) {
       processModbusPacket();
       rxIndex = 0;
     }
@@ -61,6 +91,10 @@ void loop() {
 }
 
 // ===== PROSES PAKET MODBUS =====
+uint8_t requestLength(uint8_t functionCode) {
+  return functionCode == FC_READ_REGISTERS ? 6 : 5;
+}
+
 void processModbusPacket() {
   uint8_t deviceAddr = rxBuffer[0];
   uint8_t functionCode = rxBuffer[1];
@@ -71,8 +105,9 @@ void processModbusPacket() {
   }
   
   // Verifikasi CRC
-  uint16_t receivedCRC = (rxBuffer[4] << 8) | rxBuffer[3];
-  uint16_t calculatedCRC = calculateCRC(rxBuffer, 3);
+  uint8_t len = requestLength(functionCode);
+  uint16_t receivedCRC = (rxBuffer[len - 1] << 8) | rxBuffer[len - 2];
+  uint16_t calculatedCRC = calculateCRC(rxBuffer, len - 2);
   
   if (receivedCRC != calculatedCRC) {
     return;  // CRC tidak valid, abaikan paket
@@ -88,11 +123,21 @@ void processModbusPacket() {
     // Baca sensor TCRT5000
     uint8_t tcrtStatus = readTCRT5000();
     sendResponse(tcrtStatus);
+    
+  } else if (functionCode == FC_READ_SENSORS) {
+    // Baca kedua sensor sekaligus: satu transaksi bus untuk dua nilai
+    uint8_t distance = readUltrasonic();
+    uint8_t tcrtStatus = readTCRT5000();
+    sendSensorsResponse(distance, tcrtStatus);
+    
+  } else if (functionCode == FC_READ_REGISTERS) {
+    // Nilai mentah 16-bit, tidak dibatasi 1 byte
+    readRegisters(rxBuffer[2], rxBuffer[3]);
   }
 }
 
 // ===== BACA SENSOR ULTRASONIK =====
-uint8_t readUltrasonic() {
+unsigned long readEchoTime() {
   // Kirim trigger pulse
   digitalWrite(TRIG_PIN, LOW);
   delayMicroseconds(2);
@@ -100,9 +145,14 @@ uint8_t readUltrasonic() {
   delayMicroseconds(10);
   digitalWrite(TRIG_PIN, LOW);
   
+  // Lebar pulsa echo (us), 0 jika timeout
+  return pulseIn(ECHO_PIN, HIGH, 30000);  // Timeout 30ms
+}
+
+uint8_t readUltrasonic() {
   // Baca echo dan hitung jarak
-  long duration = pulseIn(ECHO_PIN, HIGH, 30000);  // Timeout 30ms
-  uint8_t distance = duration * 0.034 / 2;  // Konversi ke cm
+  long duration = readEchoTime();
+  long distance = duration * 0.034 / 2;  // Konversi ke cm
   
   // Batasi range 0-255
   if (distance > 255) distance = 255;
@@ -141,22 +191,120 @@ void sendResponse(uint8_t sensorData) {
   rs485.flush();
 }
 
+// ===== KIRIM RESPONSE GABUNGAN =====
+void sendSensorsResponse(uint8_t distance, uint8_t tcrtStatus) {
+  // Paket response 6 byte: [ADDR][FC][JARAK][TCRT][CRC_L][CRC_H]
+  uint8_t response[6];
+  response[0] = SLAVE_ADDRESS;
+  response[1] = FC_READ_SENSORS;
+  response[2] = distance;
+  response[3] = tcrtStatus;
+  
+  uint16_t crc = calculateCRC(response, 4);
+  response[4] = crc & 0xFF;
+  response[5] = (crc >> 8) & 0xFF;
+  
+  rs485.write(response, 6);
+  rs485.flush();
+}
+
+// ===== BACA BLOK REGISTER =====
+void readRegisters(uint8_t start, uint8_t count) {
+  if (count == 0 || start + count > SENSOR_REGISTERS) {
+    sendException(EXC_ILLEGAL_ADDRESS);
+    return;
+  }
+  
+  uint16_t registers[SENSOR_REGISTERS] = {0, 0, 0, 0};
+  
+  // Ultrasonik (sampai 30 ms) hanya jika registernya diminta
+  if (start <= REG_DISTANCE_MM) {
+    unsigned long echo = readEchoTime();
+    registers[REG_ECHO_US] = echo;
+    registers[REG_DISTANCE_MM] = echo * 0.343 / 2;
+  }
+  int analogValue = analogRead(TCRT_PIN);
+  registers[REG_TCRT_RAW] = analogValue;
+  registers[REG_TCRT_STATE] = analogValue < TCRT_THRESHOLD ? 0x01 : 0x00;
+  
+  // [ADDR][FC][BYTE_COUNT][REG_H][REG_L]...[CRC_L][CRC_H]
+  uint8_t response[3 + 2 * SENSOR_REGISTERS + 2];
+  uint8_t len = 3;
+  response[0] = SLAVE_ADDRESS;
+  response[1] = FC_READ_REGISTERS;
+  response[2] = count * 2;
+  for (uint8_t i = start; i < start + count; i++) {
+    response[len++] = registers[i] >> 8;
+    response[len++] = registers[i] & 0xFF;
+  }
+  
+  uint16_t crc = calculateCRC(response, len);
+  response[len++] = crc & 0xFF;
+  response[len++] = (crc >> 8) & 0xFF;
+  
+  rs485.write(response, len);
+  rs485.flush();
+}
+
+void sendException(uint8_t code) {
+  // [ADDR][FC | 0x80][KODE][CRC_L][CRC_H]
+  uint8_t response[5];
+  response[0] = SLAVE_ADDRESS;
+  response[1] = rxBuffer[1] | EXCEPTION_FLAG;
+  response[2] = code;
+  
+  uint16_t crc = calculateCRC(response, 3);
+  response[3] = crc & 0xFF;
+  response[4] = (crc >> 8) & 0xFF;
+  
+  rs485.write(response, 5);
+  rs485.flush();
+}
+
 // ===== HITUNG CRC16 MODBUS =====
+// Tabel CRC16 (polinomial 0xA001) di flash: satu lookup per byte,
+// bukan 8 iterasi shift/xor. Sama dengan CRC_TABLE di modbus.py.
+const uint16_t CRC_TABLE[256] PROGMEM = {
+  0x0000, 0xC0C1, 0xC181, 0x0140, 0xC301, 0x03C0, 0x0280, 0xC241,
+  0xC601, 0x06C0, 0x0780, 0xC741, 0x0500, 0xC5C1, 0xC481, 0x0440,
+  0xCC01, 0x0CC0, 0x0D80, 0xCD41, 0x0F00, 0xCFC1, 0xCE81, 0x0E40,
+  0x0A00, 0xCAC1, 0xCB81, 0x0B40, 0xC901, 0x09C0, 0x0880, 0xC841,
+  0xD801, 0x18C0, 0x1980, 0xD941, 0x1B00, 0xDBC1, 0xDA81, 0x1A40,
+  0x1E00, 0xDEC1, 0xDF81, 0x1F40, 0xDD01, 0x1DC0, 0x1C80, 0xDC41,
+  0x1400, 0xD4C1, 0xD581, 0x1540, 0xD701, 0x17C0, 0x1680, 0xD641,
+  0xD201, 0x12C0, 0x1380, 0xD341, 0x1100, 0xD1C1, 0xD081, 0x1040,
+  0xF001, 0x30C0, 0x3180, 0xF141, 0x3300, 0xF3C1, 0xF281, 0x3240,
+  0x3600, 0xF6C1, 0xF781, 0x3740, 0xF501, 0x35C0, 0x3480, 0xF441,
+  0x3C00, 0xFCC1, 0xFD81, 0x3D40, 0xFF01, 0x3FC0, 0x3E80, 0xFE41,
+  0xFA01, 0x3AC0, 0x3B80, 0xFB41, 0x3900, 0xF9C1, 0xF881, 0x3840,
+  0x2800, 0xE8C1, 0xE981, 0x2940, 0xEB01, 0x2BC0, 0x2A80, 0xEA41,
+  0xEE01, 0x2EC0, 0x2F80, 0xEF41, 0x2D00, 0xEDC1, 0xEC81, 0x2C40,
+  0xE401, 0x24C0, 0x2580, 0xE541, 0x2700, 0xE7C1, 0xE681, 0x2640,
+  0x2200, 0xE2C1, 0xE381, 0x2340, 0xE101, 0x21C0, 0x2080, 0xE041,
+  0xA001, 0x60C0, 0x6180, 0xA141, 0x6300, 0xA3C1, 0xA281, 0x6240,
+  0x6600, 0xA6C1, 0xA781, 0x6740, 0xA501, 0x65C0, 0x6480, 0xA441,
+  0x6C00, 0xACC1, 0xAD81, 0x6D40, 0xAF01, 0x6FC0, 0x6E80, 0xAE41,
+  0xAA01, 0x6AC0, 0x6B80, 0xAB41, 0x6900, 0xA9C1, 0xA881, 0x6840,
+  0x7800, 0xB8C1, 0xB981, 0x7940, 0xBB01, 0x7BC0, 0x7A80, 0xBA41,
+  0xBE01, 0x7EC0, 0x7F80, 0xBF41, 0x7D00, 0xBDC1, 0xBC81, 0x7C40,
+  0xB401, 0x74C0, 0x7580, 0xB541, 0x7700, 0xB7C1, 0xB681, 0x7640,
+  0x7200, 0xB2C1, 0xB381, 0x7340, 0xB101, 0x71C0, 0x7080, 0xB041,
+  0x5000, 0x90C1, 0x9181, 0x5140, 0x9301, 0x53C0, 0x5280, 0x9241,
+  0x9601, 0x56C0, 0x5780, 0x9741, 0x5500, 0x95C1, 0x9481, 0x5440,
+  0x9C01, 0x5CC0, 0x5D80, 0x9D41, 0x5F00, 0x9FC1, 0x9E81, 0x5E40,
+  0x5A00, 0x9AC1, 0x9B81, 0x5B40, 0x9901, 0x59C0, 0x5880, 0x9841,
+  0x8801, 0x48C0, 0x4980, 0x8941, 0x4B00, 0x8BC1, 0x8A81, 0x4A40,
+  0x4E00, 0x8EC1, 0x8F81, 0x4F40, 0x8D01, 0x4DC0, 0x4C80, 0x8C41,
+  0x4400, 0x84C1, 0x8581, 0x4540, 0x8701, 0x47C0, 0x4680, 0x8641,
+  0x8201, 0x42C0, 0x4380, 0x8341, 0x4100, 0x81C1, 0x8081, 0x4040
+};
+
 uint16_t calculateCRC(uint8_t *buf, uint8_t len) {
   uint16_t crc = 0xFFFF;
   
   for (uint8_t pos = 0; pos < len; pos++) {
-    crc ^= (uint16_t)buf[pos];
-    
-    for (uint8_t i = 8; i != 0; i--) {
-      if ((crc & 0x0001) != 0) {
-        crc >>= 1;
-        crc ^= 0xA001;
-      } else {
-        crc >>= 1;
-      }
-    }
+    crc = (crc >> 8) ^ pgm_read_word(&CRC_TABLE[(crc ^ buf[pos]) & 0xFF]);
   }
   
   return crc;
-}
\ No newline at end of file
+}
@@ -0,0 +1,261 @@
+"""Fan-out pembacaan live lewat shared memory ke banyak proses lokal
+
+Satu proses publisher (poller.py --publish NAME) memegang port serial dan
+menulis setiap pembacaan ke ring buffer di multiprocessing.shared_memory.
+GUI lain, logger atau proses analitik cukup attach dengan nama yang sama:
+tidak ada copy lewat socket/pipe dan tidak ada rebutan port.
+
+Layout segmen (NumPy structured array, little-endian):
+
+    header  magic u4, version u4, capacity u8, head u8, pid u8
+    ring    capacity x (seq u8, t f8, slave u1, fc u1, value f8)
+
+Sequence dimulai dari 1; head = sequence terakhir yang selesai ditulis,
+slot = seq % capacity. Writer meng-nol-kan seq slot, menulis isi, lalu
+menulis seq baru dan terakhir head (seqlock per slot). Reader menyalin
+slot dan mengecek seq sebelum dan sesudah salinan, jadi record yang
+tertimpa saat dibaca dibuang dan dihitung sebagai lost, tidak pernah
+dikembalikan setengah jadi. Hanya ada satu writer per segmen.
+
+pid di header adalah proses writer. Segmen yang tertinggal karena
+publisher mati tanpa close() (kill -9, crash) dikenali dari pid yang
+sudah tidak hidup dan dibuat ulang; jika writer masih hidup Publisher
+menolak dengan FileExistsError. Karena itu segmen tidak didaftarkan ke
+resource tracker multiprocessing: tracker milik publisher yang mati bisa
+meng-unlink segmen baru yang sudah dibuat ulang dengan nama yang sama.
+
+Contoh:
+    with Subscriber("rs485") as sub:
+        while True:
+            for record in sub.read(timeout=1.0):
+                print(record["seq"], record["slave"], record["fc"], record["value"])
+            distance = sub.latest(SLAVE_SENSOR_ADDR, FC_READ_ULTRASONIC)
+"""
+import os
+import time
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from deadband import frame_readings
+
+MAGIC = 0x52533438  # "RS48"
+LAYOUT_VERSION = 2
+RING_CAPACITY = 4096  # Record; 20 Hz x 3 channel = lebih dari 1 menit riwayat
+READ_POLL = 0.005     # Detik, jeda cek head saat read() menunggu data baru
+
+HEADER_DTYPE = np.dtype([
+    ("magic", "<u4"),
+    ("version", "<u4"),
+    ("capacity", "<u8"),
+    ("head", "<u8"),
+    ("pid", "<u8"),
+])
+RECORD_DTYPE = np.dtype([
+    ("seq", "<u8"),
+    ("t", "<f8"),
+    ("slave", "u1"),
+    ("fc", "u1"),
+    ("value", "<f8"),
+], align=True)
+
+
+def segment_size(capacity):
+    return HEADER_DTYPE.itemsize + capacity * RECORD_DTYPE.itemsize
+
+
+def _untrack(shm):
+    """Lepas segmen dari resource tracker proses ini (Python < 3.13 tidak punya track=False)"""
+    if os.name != "nt":
+        resource_tracker.unregister(shm._name, "shared_memory")
+
+
+def _pid_alive(pid):
+    if os.name == "nt":
+        # Windows menghapus segmen bersama proses terakhir yang memegangnya,
+        # jadi segmen yang masih ada pasti milik proses hidup
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass  # Proses milik user lain
+    return True
+
+
+def _remove_stale(name):
+    """Unlink segmen name jika writer-nya sudah mati, selain itu FileExistsError"""
+    shm = shared_memory.SharedMemory(name)
+    header = None
+    if shm.size >= HEADER_DTYPE.itemsize:
+        header = np.ndarray((), dtype=HEADER_DTYPE, buffer=shm.buf).copy()
+    if (header is not None and header["magic"] == MAGIC
+            and header["version"] == LAYOUT_VERSION and header["pid"]
+            and not _pid_alive(int(header["pid"]))):
+        shm.close()
+        shm.unlink()
+        return
+    shm.close()
+    _untrack(shm)
+    if header is None or header["magic"] != MAGIC:
+        reason = "is not an RS-485 reading ring"
+    elif header["version"] != LAYOUT_VERSION:
+        reason = f"uses layout version {int(header['version'])}"
+    else:
+        reason = f"is in use by publisher pid {int(header['pid'])}"
+    raise FileExistsError(f"Shared memory '{name}' already exists and {reason}")
+
+
+def _views(shm, capacity):
+    header = np.ndarray((), dtype=HEADER_DTYPE, buffer=shm.buf)
+    ring = np.ndarray((capacity,), dtype=RECORD_DTYPE, buffer=shm.buf,
+                      offset=HEADER_DTYPE.itemsize)
+    return header, ring
+
+
+class Publisher:
+    """Writer ring buffer, API sama dengan Recorder (append/append_frame)"""
+
+    def __init__(self, name, capacity=RING_CAPACITY):
+        self.name = name
+        self.capacity = capacity
+        self.samples = 0
+        size = segment_size(capacity)
+        try:
+            self._shm = shared_memory.SharedMemory(name, create=True, size=size)
+        except FileExistsError:
+            _remove_stale(name)
+            self._shm = shared_memory.SharedMemory(name, create=True, size=size)
+        _untrack(self._shm)
+        self._header, self._ring = _views(self._shm, capacity)
+        self._ring[:] = 0
+        self._header["capacity"] = capacity
+        self._header["head"] = 0
+        self._header["version"] = LAYOUT_VERSION
+        self._header["pid"] = os.getpid()
+        # Magic terakhir: subscriber menolak segmen yang belum siap
+        self._header["magic"] = MAGIC
+        self._seq = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def append(self, t, slave, fc, value):
+        """Publikasikan satu pembacaan (waktu unix, slave, fc, nilai)"""
+        seq = self._seq + 1
+        i = seq % self.capacity
+        ring = self._ring
+        ring["seq"][i] = 0
+        ring["t"][i] = t
+        ring["slave"][i] = slave
+        ring["fc"][i] = fc
+        ring["value"][i] = value
+        ring["seq"][i] = seq
+        self._header["head"] = seq
+        self._seq = seq
+        self.samples += 1
+
+    def append_frame(self, frame, t=None):
+        """Publikasikan semua nilai dalam satu frame data master bridge"""
+        t = time.time() if t is None else t
+        for slave, fc, value in frame_readings(frame):
+            self.append(t, slave, fc, value)
+
+    def close(self, unlink=True):
+        if self._shm is None:
+            return
+        # View NumPy harus dilepas sebelum buffer shared memory ditutup
+        self._header = self._ring = None
+        self._shm.close()
+        if unlink:
+            # unlink() juga membatalkan registrasi tracker yang sudah dilepas
+            if os.name != "nt":
+                resource_tracker.register(self._shm._name, "shared_memory")
+            self._shm.unlink()
+        self._shm = None
+
+
+class Subscriber:
+    """Reader ring buffer; banyak subscriber boleh attach ke satu publisher"""
+
+    def __init__(self, name, from_start=False):
+        self.name = name
+        self.lost = 0  # Record yang tertimpa sebelum sempat dibaca
+        self._shm = shared_memory.SharedMemory(name)
+        # Segmen milik publisher: jangan di-unlink resource tracker proses ini
+        _untrack(self._shm)
+        header = np.ndarray((), dtype=HEADER_DTYPE, buffer=self._shm.buf)
+        if header["magic"] != MAGIC or header["version"] != LAYOUT_VERSION:
+            self._shm.close()
+            raise ValueError(f"Shared memory '{name}' is not an RS-485 reading ring")
+        self.capacity = int(header["capacity"])
+        self._header, self._ring = _views(self._shm, self.capacity)
+        # Default hanya record baru; from_start = semua yang masih ada di ring
+        self.last_seq = 0 if from_start else self.head()
+        self._latest = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def head(self):
+        """Sequence terakhir yang sudah ditulis publisher"""
+        return int(self._header["head"])
+
+    def read(self, timeout=0.0, max_records=None):
+        """Record baru sejak read() terakhir (array RECORD_DTYPE)
+
+        timeout > 0 menunggu sampai ada record baru; hasil bisa kosong.
+        """
+        deadline = time.monotonic() + timeout
+        head = self.head()
+        while head == self.last_seq and time.monotonic() < deadline:
+            time.sleep(READ_POLL)
+            head = self.head()
+
+        first = self.last_seq + 1
+        if head - first + 1 > self.capacity:
+            # Subscriber terlalu lambat: record tertua sudah tertimpa
+            self.lost += head - first + 1 - self.capacity
+            first = head - self.capacity + 1
+        if max_records is not None:
+            head = min(head, first + max_records - 1)
+        if head < first:
+            return np.empty(0, dtype=RECORD_DTYPE)
+
+        seqs = np.arange(first, head + 1, dtype=np.uint64)
+        slots = seqs % self.capacity
+        records = self._ring[slots]
+        # Cek ulang setelah salinan: slot yang ditulis ulang di tengah jalan dibuang
+        valid = (records["seq"] == seqs) & (self._ring["seq"][slots] == seqs)
+        self.lost += int(len(seqs) - np.count_nonzero(valid))
+        records = records[valid]
+        self.last_seq = head
+
+        for record in records:
+            self._latest[(int(record["slave"]), int(record["fc"]))] = (
+                float(record["value"]), float(record["t"]))
+        return records
+
+    def latest(self, slave, fc):
+        """Nilai terakhir (slave, fc) dari record yang sudah dibaca, atau None"""
+        entry = self._latest.get((slave, fc))
+        return None if entry is None else entry[0]
+
+    def age(self, slave, fc):
+        """Detik sejak nilai terakhir (slave, fc), None jika belum ada"""
+        entry = self._latest.get((slave, fc))
+        return None if entry is None else time.time() - entry[1]
+
+    def close(self):
+        if self._shm is None:
+            return
+        self._header = self._ring = None
+        self._shm.close()
+        self._shm = None
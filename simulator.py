@@ -0,0 +1,440 @@
+"""Simulasi master bridge + slave sensor/aktuator tanpa hardware
+
+Dua cara pakai:
+  - Di dalam proses: buka port "sim://?latency=0.03&crc_error=0.05&timeout=0.02"
+    lewat RS485Client / GUI (port combo bisa diketik).
+  - Lewat pty (Linux): python simulator.py --crc-error 0.05
+    lalu sambungkan GUI/poller/aioclient ke path /dev/pts/N yang dicetak.
+
+Opsi URL / CLI:
+  latency    detik per transaksi (default: estimasi dari baud rate)
+  jitter     variasi latency acak, detik (+/-)
+  crc_error  peluang master membalas 0xFF 0xE1
+  timeout    peluang master membalas 0xFF 0xE2 (setelah timeout slave master)
+  baud       baud rate untuk estimasi latency (default: baud rate port)
+  seed       seed random agar hasil bisa diulang
+"""
+import argparse
+import heapq
+import itertools
+import os
+import random
+import threading
+import time
+import urllib.parse
+
+from serial.serialutil import SerialBase, SerialException, PortNotOpenError
+
+from protocol import (
+    SLAVE_SENSOR_ADDR, SLAVE_AKTUATOR_ADDR, DEFAULT_BAUD, BAUD_RATES,
+    CMD_READ_ULTRASONIC, CMD_READ_TCRT, CMD_CONTROL_RELAY, CMD_PING, CMD_READ_SENSORS,
+    CMD_PASSTHROUGH, PASSTHROUGH_MARKER, PASSTHROUGH_MAX_REQUEST,
+    FC_READ_ULTRASONIC, FC_READ_TCRT5000, FC_CONTROL_RELAY, FC_READ_SENSORS, FC_READ_REGISTERS,
+    EXCEPTION_FLAG, SENSOR_REGISTERS,
+    REG_ECHO_US, REG_DISTANCE_MM, REG_TCRT_RAW, REG_TCRT_STATE,
+    ERROR_MARKER, ERR_CRC, ERR_TIMEOUT, ERR_REQUEST, READY_FRAME, command_target,
+)
+from modbus import EXC_ILLEGAL_ADDRESS, check_crc, encode_frame
+from scheduler import estimate_command_time, master_turnaround
+
+SIM_URL_SCHEME = "sim"
+
+# ===== TIMING FIRMWARE MASTER =====
+# Ditambah jeda turnaround master (scheduler.master_turnaround)
+SLAVE_TIMEOUT = 0.200     # RESPONSE_TIMEOUT 200 ms di master.ino
+ADAPTIVE_SLAVE_TIMEOUT = 0.040  # MIN_SLAVE_TIMEOUT setelah (slave, FC) pernah menjawab
+RELAY_ARG_TIMEOUT = 0.100  # Master menunggu byte state relay maks 100 ms
+
+
+class BridgeSimulator:
+    """Meniru perilaku byte master.ino beserta slave 0x24 dan 0x66"""
+
+    def __init__(self, latency=None, jitter=0.0, crc_error_rate=0.0,
+                 timeout_rate=0.0, baudrate=DEFAULT_BAUD, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.crc_error_rate = crc_error_rate
+        self.timeout_rate = timeout_rate
+        self.baudrate = baudrate
+        self.random = random.Random(seed)
+
+        # State slave
+        self.distance = 100
+        self.tcrt = 0
+        self.relay = 0
+
+        # State master: perintah 'R' yang menunggu byte state
+        self._pending_relay = None
+        self._pending_passthrough = None  # (waktu byte terakhir, [LEN][frame])
+        self._busy_until = 0.0
+        self._answered = set()  # (slave, FC) yang sudah pernah menjawab (timeout adaptif)
+
+        # Statistik injeksi
+        self.transactions = 0
+        self.injected_crc_errors = 0
+        self.injected_timeouts = 0
+
+    @classmethod
+    def from_url(cls, url, baudrate=DEFAULT_BAUD):
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme != SIM_URL_SCHEME:
+            raise SerialException(f"expected a sim:// URL, got {url!r}")
+
+        options = {"baudrate": baudrate}
+        for option, values in urllib.parse.parse_qs(parts.query, True).items():
+            value = values[0]
+            if option == "latency":
+                options["latency"] = float(value)
+            elif option == "jitter":
+                options["jitter"] = float(value)
+            elif option == "crc_error":
+                options["crc_error_rate"] = float(value)
+            elif option == "timeout":
+                options["timeout_rate"] = float(value)
+            elif option == "baud":
+                options["baudrate"] = int(value)
+            elif option == "seed":
+                options["seed"] = int(value)
+            else:
+                raise SerialException(f"unknown sim:// option: {option!r}")
+        return cls(**options)
+
+    def reset(self):
+        self._pending_relay = None
+        self._pending_passthrough = None
+        self._busy_until = 0.0
+
+    def feed(self, data, now):
+        """Proses byte dari host, kembalikan list (waktu_siap, bytes reply)"""
+        replies = []
+        for byte in data:
+            command = bytes([byte])
+
+            if self._pending_relay is not None:
+                started = self._pending_relay
+                self._pending_relay = None
+                if now - started <= RELAY_ARG_TIMEOUT:
+                    replies.append(self._transaction(CMD_CONTROL_RELAY + command, now))
+                continue
+
+            if self._pending_passthrough is not None:
+                started, packet = self._pending_passthrough
+                if now - started <= RELAY_ARG_TIMEOUT:
+                    reply = self._collect_passthrough(packet, byte, now)
+                    if reply is not None:
+                        replies.append(reply)
+                    continue
+                # Byte berikutnya terlambat: master sudah menolak request
+                self._pending_passthrough = None
+                replies.append((max(started + RELAY_ARG_TIMEOUT, self._busy_until),
+                                bytes([ERROR_MARKER, ERR_REQUEST])))
+
+            if command == CMD_CONTROL_RELAY:
+                self._pending_relay = now
+            elif command == CMD_PASSTHROUGH:
+                self._pending_passthrough = (now, bytearray())
+            elif command in (CMD_READ_ULTRASONIC, CMD_READ_TCRT, CMD_READ_SENSORS):
+                replies.append(self._transaction(command, now))
+            elif command == CMD_PING:
+                # Tidak menyentuh bus RS-485, dijawab setelah transaksi berjalan
+                replies.append((max(now, self._busy_until), READY_FRAME))
+            # Perintah lain diabaikan, sama seperti loop() di master.ino
+        return replies
+
+    def _collect_passthrough(self, packet, byte, now):
+        """Kumpulkan 'X' [LEN] [frame], kembalikan reply jika sudah lengkap"""
+        packet.append(byte)
+        self._pending_passthrough = (now, packet)
+        if len(packet) == 1 and not 0 < byte <= PASSTHROUGH_MAX_REQUEST:
+            self._pending_passthrough = None
+            return max(now, self._busy_until), bytes([ERROR_MARKER, ERR_REQUEST])
+        if len(packet) == 1 + packet[0]:
+            self._pending_passthrough = None
+            return self._transaction(CMD_PASSTHROUGH + bytes(packet), now)
+        return None
+
+    def _transaction(self, command, now):
+        self.transactions += 1
+        start = max(now, self._busy_until)
+        node = command_target(command)
+
+        response = None
+        roll = self.random.random()
+        if roll < self.timeout_rate:
+            self.injected_timeouts += 1
+        else:
+            response = self._slave_respond(self._slave_request(command))
+
+        if response is None:
+            reply = bytes([ERROR_MARKER, ERR_TIMEOUT])
+            duration = ADAPTIVE_SLAVE_TIMEOUT if node in self._answered else SLAVE_TIMEOUT
+            duration += master_turnaround(self.baudrate)
+        else:
+            duration = self._latency(command)
+            # Error CRC = satu bit rusak di jalan, dideteksi master (atau
+            # host untuk passthrough) seperti di firmware
+            packet = bytearray(response)
+            if roll < self.timeout_rate + self.crc_error_rate:
+                self.injected_crc_errors += 1
+                packet[self.random.randrange(len(packet))] ^= 1 << self.random.randrange(8)
+            reply = self._forward(command, packet)
+
+        self._busy_until = start + duration
+        return self._busy_until, reply
+
+    def _forward(self, command, packet):
+        """Teruskan paket slave seperti master.ino, kembalikan frame ke host"""
+        valid = check_crc(packet)
+        if valid:
+            self._answered.add(command_target(command))
+        if command[:1] == CMD_PASSTHROUGH:
+            # Passthrough: diteruskan apa adanya, CRC dicek host
+            return bytes([PASSTHROUGH_MARKER, len(packet)]) + bytes(packet)
+        if not valid:
+            return bytes([ERROR_MARKER, ERR_CRC])
+        return bytes(packet[:-2])
+
+    def _latency(self, command):
+        if self.latency is None:
+            latency = estimate_command_time(command, self.baudrate)
+        else:
+            latency = self.latency
+        if self.jitter:
+            latency += self.random.uniform(-self.jitter, self.jitter)
+        return max(0.0, latency)
+
+    # ===== SLAVE 0x24 DAN 0x66 =====
+    def _slave_request(self, command):
+        """Paket yang dikirim master ke bus untuk satu perintah host"""
+        if command[:1] == CMD_PASSTHROUGH:
+            return command[2:]
+        slave, fc = command_target(command)
+        data = command[1] if command[:1] == CMD_CONTROL_RELAY else 0x00
+        return encode_frame(slave, fc, [data])
+
+    def _slave_respond(self, request):
+        """Response slave (dengan CRC), None jika slave diam
+
+        Sama seperti sensor.ino/aktuator.ino: paket dengan alamat lain,
+        CRC salah, panjang salah atau FC tidak dikenal diabaikan.
+        """
+        if not check_crc(request):
+            return None
+        addr, fc = request[0], request[1]
+
+        if addr == SLAVE_SENSOR_ADDR:
+            if fc == FC_READ_REGISTERS and len(request) == 6:
+                return self._read_registers(request[2], request[3])
+            if len(request) != 5:
+                return None
+            if fc == FC_READ_ULTRASONIC:
+                return encode_frame(addr, fc, [self._read_distance()])
+            if fc == FC_READ_TCRT5000:
+                return encode_frame(addr, fc, [self._read_tcrt()])
+            if fc == FC_READ_SENSORS:
+                return encode_frame(addr, fc, [self._read_distance(), self._read_tcrt()])
+            return None
+
+        if addr == SLAVE_AKTUATOR_ADDR and fc == FC_CONTROL_RELAY and len(request) == 5:
+            # State selain 0x00/0x01 hanya membaca status
+            state = request[2]
+            if state in (0x00, 0x01):
+                self.relay = state
+            return encode_frame(addr, fc, [self.relay])
+        return None
+
+    def _read_registers(self, start, count):
+        if count == 0 or start + count > SENSOR_REGISTERS:
+            return encode_frame(SLAVE_SENSOR_ADDR, FC_READ_REGISTERS | EXCEPTION_FLAG,
+                                [EXC_ILLEGAL_ADDRESS])
+        registers = [0] * SENSOR_REGISTERS
+        # Ultrasonik hanya diukur jika registernya diminta, seperti sensor.ino
+        if start <= REG_DISTANCE_MM:
+            distance_mm = self._read_distance() * 10 + self.random.randint(0, 9)
+            registers[REG_ECHO_US] = round(distance_mm * 2 / 0.343)
+            registers[REG_DISTANCE_MM] = distance_mm
+        tcrt = self._read_tcrt()
+        registers[REG_TCRT_RAW] = (self.random.randint(250, 350) if tcrt
+                                   else self.random.randint(750, 850))
+        registers[REG_TCRT_STATE] = tcrt
+        registers = registers[start:start + count]
+        data = [len(registers) * 2]
+        for value in registers:
+            data += [value >> 8, value & 0xFF]
+        return encode_frame(SLAVE_SENSOR_ADDR, FC_READ_REGISTERS, data)
+
+    def _read_distance(self):
+        # Random walk jarak 2..255 cm
+        self.distance = min(255, max(2, self.distance + self.random.randint(-3, 3)))
+        return self.distance
+
+    def _read_tcrt(self):
+        if self.random.random() < 0.05:
+            self.tcrt ^= 0x01
+        return self.tcrt
+
+
+class SimulatedSerial(SerialBase):
+    """Port serial di dalam proses yang tersambung ke BridgeSimulator"""
+
+    def __init__(self, *args, simulator=None, **kwargs):
+        self.simulator = simulator
+        self._rx = bytearray()
+        self._pending = []  # Heap (waktu siap, urutan antre, reply)
+        self._order = itertools.count()
+        self._lock = threading.Condition()
+        super().__init__(*args, **kwargs)
+
+    def open(self):
+        if self.is_open:
+            raise SerialException("Port is already open.")
+        if self._port is None:
+            raise SerialException("Port must be configured before it can be used.")
+        if self.simulator is None:
+            # Tanpa opsi baud di URL, timing mengikuti baud rate port
+            self.simulator = BridgeSimulator.from_url(self._port, self._baudrate)
+        self.is_open = True
+        self.reset_input_buffer()
+
+    def close(self):
+        with self._lock:
+            self.is_open = False
+            self._lock.notify_all()
+
+    def _reconfigure_port(self):
+        pass
+
+    def _deliver(self, now):
+        while self._pending and self._pending[0][0] <= now:
+            _, _, reply = heapq.heappop(self._pending)
+            self._rx += reply
+
+    @property
+    def in_waiting(self):
+        if not self.is_open:
+            raise PortNotOpenError()
+        with self._lock:
+            self._deliver(time.monotonic())
+            return len(self._rx)
+
+    def read(self, size=1):
+        if not self.is_open:
+            raise PortNotOpenError()
+        deadline = None if self._timeout is None else time.monotonic() + self._timeout
+        with self._lock:
+            while self.is_open:
+                now = time.monotonic()
+                self._deliver(now)
+                if len(self._rx) >= size:
+                    break
+                if deadline is not None and now >= deadline:
+                    break
+
+                # Tidur sampai reply berikutnya siap atau timeout habis
+                wake = self._pending[0][0] if self._pending else None
+                if deadline is not None:
+                    wake = deadline if wake is None else min(wake, deadline)
+                self._lock.wait(None if wake is None else max(0.0, wake - now))
+
+            data = bytes(self._rx[:size])
+            del self._rx[:size]
+            return data
+
+    def write(self, data):
+        if not self.is_open:
+            raise PortNotOpenError()
+        now = time.monotonic()
+        with self._lock:
+            for ready, reply in self.simulator.feed(bytes(data), now):
+                # Urutan antre memecah waktu siap yang sama: READY dari
+                # CMD_PING keluar setelah frame transaksi yang sedang berjalan
+                heapq.heappush(self._pending, (ready, next(self._order), reply))
+            self._lock.notify_all()
+        return len(data)
+
+    def reset_input_buffer(self):
+        with self._lock:
+            self._rx.clear()
+            # Reply yang belum siap tetap datang, sama seperti UART asli
+            self._pending = [p for p in self._pending if p[0] > time.monotonic()]
+            heapq.heapify(self._pending)
+
+    def reset_output_buffer(self):
+        pass
+
+
+class PtyBridge:
+    """Sajikan BridgeSimulator lewat pasangan pty (Linux/macOS)"""
+
+    def __init__(self, simulator):
+        import pty
+        import tty
+
+        self.simulator = simulator
+        self._master_fd, self._slave_fd = pty.openpty()
+        tty.setraw(self._master_fd)
+        tty.setraw(self._slave_fd)
+        self.device = os.ttyname(self._slave_fd)
+        self._pending = []  # Heap (waktu siap, urutan antre, reply)
+        self._order = itertools.count()
+        self._lock = threading.Condition()
+        self._running = True
+
+    def start(self):
+        threading.Thread(target=self._read_loop, daemon=True).start()
+        threading.Thread(target=self._write_loop, daemon=True).start()
+        return self
+
+    def stop(self):
+        with self._lock:
+            self._running = False
+            self._lock.notify_all()
+        os.close(self._master_fd)
+        os.close(self._slave_fd)
+
+    def _read_loop(self):
+        while self._running:
+            try:
+                data = os.read(self._master_fd, 64)
+            except OSError:
+                return
+            with self._lock:
+                for ready, reply in self.simulator.feed(data, time.monotonic()):
+                    heapq.heappush(self._pending, (ready, next(self._order), reply))
+                self._lock.notify_all()
+
+    def _write_loop(self):
+        with self._lock:
+            while self._running:
+                now = time.monotonic()
+                if self._pending and self._pending[0][0] <= now:
+                    _, _, reply = heapq.heappop(self._pending)
+                    os.write(self._master_fd, reply)
+                    continue
+                wait = self._pending[0][0] - now if self._pending else None
+                self._lock.wait(wait)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulated RS-485 master bridge on a pty")
+    parser.add_argument("--latency", type=float, help="Detik per transaksi")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--crc-error", type=float, default=0.0, help="Peluang 0xFF 0xE1")
+    parser.add_argument("--timeout", type=float, default=0.0, help="Peluang 0xFF 0xE2")
+    parser.add_argument("--baud", type=int, default=DEFAULT_BAUD, choices=BAUD_RATES)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+
+    simulator = BridgeSimulator(args.latency, args.jitter, args.crc_error,
+                                args.timeout, args.baud, args.seed)
+    bridge = PtyBridge(simulator).start()
+    print(f"Simulated master bridge on {bridge.device}", flush=True)
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        bridge.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+
+# ===== KONFIGURASI STATISTIK =====
+STATS_WINDOW = 10.0  # Detik, jendela untuk rate dan utilisasi bus
+RTT_BUCKETS_MS = (5, 10, 20, 30, 50, 75, 100, 150, 200, 300, 500)
+
+# Kelas error transaksi
+ERROR_CLASSES = ("timeout", "slave_timeout", "crc_error", "invalid", "exception")
+
+
+class NodeStats:
+    """Counter untuk satu pasangan (alamat slave, function code)"""
+
+    def __init__(self):
+        self.count = 0
+        self.errors = dict.fromkeys(ERROR_CLASSES, 0)
+        self.retries = 0
+        self.bytes_out = 0
+        self.bytes_in = 0
+        self.rtt_sum = 0.0
+        self.rtt_min = None
+        self.rtt_max = None
+        self.histogram = [0] * (len(RTT_BUCKETS_MS) + 1)
+        self.last_time = None
+        self.last_error = None
+        self.recent = deque()  # (waktu selesai, rtt) dalam jendela
+
+    def snapshot(self, now, window, span):
+        while self.recent and now - self.recent[0][0] > window:
+            self.recent.popleft()
+
+        error_total = sum(self.errors.values())
+        return {
+            "count": self.count,
+            "rate_per_s": len(self.recent) / span,
+            "errors": dict(self.errors),
+            "error_percent": 100.0 * error_total / self.count if self.count else 0.0,
+            "retries": self.retries,
+            "bytes_out": self.bytes_out,
+            "bytes_in": self.bytes_in,
+            "rtt_ms": {
+                "mean": 1000.0 * self.rtt_sum / self.count if self.count else None,
+                "min": None if self.rtt_min is None else 1000.0 * self.rtt_min,
+                "max": None if self.rtt_max is None else 1000.0 * self.rtt_max,
+            },
+            "histogram": list(self.histogram),
+            "busy_s": sum(rtt for _, rtt in self.recent),
+            "last_time": self.last_time,
+            "last_error": self.last_error,
+        }
+
+
+class BusStats:
+    """Instrumentasi transaksi per slave dan function code (thread-safe)
+
+    record() dipanggil dari hot path setiap transaksi, jadi hanya
+    menambah counter. Agregasi dilakukan di snapshot().
+    """
+
+    def __init__(self, window=STATS_WINDOW):
+        self.window = window
+        self._nodes = {}
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+
+    def record(self, slave, fc, rtt, bytes_out, bytes_in, error=None, retries=0):
+        now = time.monotonic()
+        with self._lock:
+            node = self._nodes.get((slave, fc))
+            if node is None:
+                node = self._nodes[(slave, fc)] = NodeStats()
+
+            node.count += 1
+            node.retries += retries
+            node.bytes_out += bytes_out
+            node.bytes_in += bytes_in
+            node.rtt_sum += rtt
+            node.rtt_min = rtt if node.rtt_min is None else min(node.rtt_min, rtt)
+            node.rtt_max = rtt if node.rtt_max is None else max(node.rtt_max, rtt)
+            node.histogram[bisect_left(RTT_BUCKETS_MS, rtt * 1000.0)] += 1
+            node.last_time = time.time()
+            if error is not None:
+                node.errors[error] += 1
+                node.last_error = error
+
+            node.recent.append((now, rtt))
+            while now - node.recent[0][0] > self.window:
+                node.recent.popleft()
+
+    def _span(self, now):
+        # Jendela efektif: lebih pendek dari window sesaat setelah reset
+        return max(1e-3, min(self.window, now - self._started))
+
+    def rate(self, slave=None, fc=None):
+        """Transaksi per detik, difilter per slave dan/atau function code"""
+        now = time.monotonic()
+        total = 0
+        with self._lock:
+            span = self._span(now)
+            for (node_slave, node_fc), node in self._nodes.items():
+                if slave is not None and node_slave != slave:
+                    continue
+                if fc is not None and node_fc != fc:
+                    continue
+                total += sum(1 for t, _ in node.recent if now - t <= self.window)
+        return total / span
+
+    def reset(self):
+        with self._lock:
+            self._nodes.clear()
+            self._started = time.monotonic()
+
+    def snapshot(self):
+        """Salinan statistik saat ini (dict, aman untuk JSON)"""
+        now = time.monotonic()
+        with self._lock:
+            span = self._span(now)
+            nodes = {
+                f"0x{slave:02X}/0x{fc:02X}": node.snapshot(now, self.window, span)
+                for (slave, fc), node in sorted(self._nodes.items())
+            }
+            uptime = now - self._started
+
+        busy = sum(n["busy_s"] for n in nodes.values())
+        return {
+            "uptime_s": uptime,
+            "window_s": self.window,
+            "rtt_buckets_ms": list(RTT_BUCKETS_MS),
+            # Fraksi waktu bus terpakai; mendekati 1.0 berarti bus jenuh
+            "bus_utilisation": min(1.0, busy / span),
+            "nodes": nodes,
+        }
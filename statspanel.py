@@ -0,0 +1,132 @@
+from PyQt5.QtWidgets import (QGroupBox, QVBoxLayout, QHBoxLayout, QLabel,
+                             QTableWidget, QTableWidgetItem, QHeaderView, QWidget)
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QFont, QPainter, QColor
+
+from stats import RTT_BUCKETS_MS
+
+# ===== AMBANG BATAS TAMPILAN =====
+SATURATION_WARN = 0.7   # Utilisasi bus mulai kuning
+SATURATION_ALERT = 0.9  # Utilisasi bus merah (jenuh)
+ERROR_ALERT = 5.0       # Persen error per node yang dianggap menurun
+
+UTILISATION_COLORS = {"ok": "#27ae60", "warn": "#f39c12", "alert": "#e74c3c"}
+
+TABLE_COLUMNS = ["Node", "Rate/s", "Count", "Err %", "RTT mean", "RTT max",
+                 "Bytes out/in", "Retries", "Last error"]
+
+
+class HistogramWidget(QWidget):
+    """Histogram RTT sederhana (gabungan semua node)"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.counts = [0] * (len(RTT_BUCKETS_MS) + 1)
+        self.setMinimumHeight(90)
+
+    def set_counts(self, counts):
+        if counts != self.counts:
+            self.counts = counts
+            self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor("#1a1a1a"))
+
+        n = len(self.counts)
+        label_h = 14
+        width = self.width() / n
+        height = self.height() - label_h - 4
+        peak = max(self.counts) or 1
+
+        painter.setFont(QFont("Arial", 7))
+        for i, count in enumerate(self.counts):
+            bar_h = int(height * count / peak)
+            x = int(i * width)
+            painter.fillRect(x + 2, int(height - bar_h) + 2, max(1, int(width) - 4), bar_h,
+                             QColor("#1abc9c"))
+            label = f"<{RTT_BUCKETS_MS[i]}" if i < len(RTT_BUCKETS_MS) else f"{RTT_BUCKETS_MS[-1]}+"
+            painter.setPen(QColor("#95a5a6"))
+            painter.drawText(x, self.height() - label_h, int(width), label_h,
+                             Qt.AlignCenter, label)
+        painter.end()
+
+
+class StatsPanel(QGroupBox):
+    """Panel statistik bus live dari BusStats.snapshot()"""
+
+    def __init__(self, parent=None):
+        super().__init__("📊 Bus Statistics", parent)
+        self.setFont(QFont("Arial", 11, QFont.Bold))
+        layout = QVBoxLayout()
+
+        summary_layout = QHBoxLayout()
+        self.utilisation_label = QLabel("Bus utilisation: --")
+        self.utilisation_label.setFont(QFont("Arial", 10, QFont.Bold))
+        self._utilisation_level = None  # Level warna yang sedang terpasang
+        summary_layout.addWidget(self.utilisation_label)
+        summary_layout.addStretch()
+        self.total_label = QLabel("")
+        self.total_label.setFont(QFont("Arial", 10))
+        summary_layout.addWidget(self.total_label)
+        layout.addLayout(summary_layout)
+
+        self.table = QTableWidget(0, len(TABLE_COLUMNS))
+        self.table.setHorizontalHeaderLabels(TABLE_COLUMNS)
+        self.table.setFont(QFont("Courier", 9))
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setMaximumHeight(130)
+        layout.addWidget(self.table)
+
+        hist_label = QLabel("RTT histogram (ms)")
+        hist_label.setFont(QFont("Arial", 9))
+        layout.addWidget(hist_label)
+        self.histogram = HistogramWidget()
+        layout.addWidget(self.histogram)
+
+        self.setLayout(layout)
+
+    def update_snapshot(self, snapshot):
+        """Render satu snapshot BusStats"""
+        utilisation = snapshot["bus_utilisation"]
+        self.utilisation_label.setText(f"Bus utilisation: {utilisation * 100:.0f}%")
+        if utilisation >= SATURATION_ALERT:
+            level = "alert"
+        elif utilisation >= SATURATION_WARN:
+            level = "warn"
+        else:
+            level = "ok"
+        # setStyleSheet memicu re-polish widget: hanya saat level berubah
+        if level != self._utilisation_level:
+            self._utilisation_level = level
+            self.utilisation_label.setStyleSheet(f"color: {UTILISATION_COLORS[level]};")
+
+        nodes = snapshot["nodes"]
+        self.table.setRowCount(len(nodes))
+        histogram = [0] * (len(RTT_BUCKETS_MS) + 1)
+        total = 0
+        for row, (key, node) in enumerate(nodes.items()):
+            total += node["count"]
+            histogram = [a + b for a, b in zip(histogram, node["histogram"])]
+            rtt = node["rtt_ms"]
+            cells = [
+                key,
+                f"{node['rate_per_s']:.1f}",
+                str(node["count"]),
+                f"{node['error_percent']:.1f}",
+                "--" if rtt["mean"] is None else f"{rtt['mean']:.1f}",
+                "--" if rtt["max"] is None else f"{rtt['max']:.1f}",
+                f"{node['bytes_out']}/{node['bytes_in']}",
+                str(node["retries"]),
+                node["last_error"] or "",
+            ]
+            for col, text in enumerate(cells):
+                item = QTableWidgetItem(text)
+                if col == 3 and node["error_percent"] >= ERROR_ALERT:
+                    item.setForeground(QColor("#e74c3c"))
+                self.table.setItem(row, col, item)
+
+        self.total_label.setText(f"{total} transactions")
+        self.histogram.set_counts(histogram)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Modul repo berada di root, bukan paket terinstal
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
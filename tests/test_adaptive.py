@@ -0,0 +1,89 @@
+import pytest
+
+from adaptive import (
+    MAX_RETRIES, MIN_SAMPLES, RETRY_BACKOFF, RETRY_BACKOFF_MAX, TIMEOUT_MIN,
+    RetryPolicy, RttEstimator,
+)
+from client import RESPONSE_TIMEOUT, RS485Client
+from modbus import encode_read_registers
+from protocol import (
+    CMD_CONTROL_RELAY, CMD_READ_ULTRASONIC, CMD_RELAY_ON, CMD_RELAY_STATUS,
+    FC_READ_TCRT5000, FC_READ_ULTRASONIC, SLAVE_SENSOR_ADDR, CrcError, passthrough_command,
+)
+
+
+def test_first_sample_initialises_estimator():
+    rtt = RttEstimator()
+    rtt.update(0.04)
+    assert rtt.srtt == 0.04
+    assert rtt.rttvar == 0.02
+
+
+def test_limit_used_until_enough_samples():
+    rtt = RttEstimator()
+    for _ in range(MIN_SAMPLES - 1):
+        rtt.update(0.01)
+        assert rtt.timeout(0.5) == 0.5
+    rtt.update(0.01)
+    assert rtt.timeout(0.5) < 0.5
+
+
+def test_timeout_tracks_rtt_within_bounds():
+    rtt = RttEstimator()
+    for _ in range(50):
+        rtt.update(0.001)
+    # RTT stabil dan kecil: timeout turun sampai batas bawah
+    assert rtt.timeout(0.5) == TIMEOUT_MIN
+    for _ in range(50):
+        rtt.update(0.3)
+    timeout = rtt.timeout(0.5)
+    assert 0.3 < timeout <= 0.5
+    # Tidak pernah melewati limit
+    assert rtt.timeout(0.2) == 0.2
+
+
+def test_retry_only_idempotent_commands():
+    policy = RetryPolicy()
+    assert policy.retries_for(CMD_READ_ULTRASONIC) == MAX_RETRIES
+    assert policy.retries_for(CMD_CONTROL_RELAY + CMD_RELAY_STATUS) == MAX_RETRIES
+    assert policy.retries_for(CMD_CONTROL_RELAY + CMD_RELAY_ON) == 0
+    registers = passthrough_command(encode_read_registers(SLAVE_SENSOR_ADDR, 0, 4))
+    assert policy.retries_for(registers) == MAX_RETRIES
+
+
+def test_backoff_doubles_up_to_cap():
+    policy = RetryPolicy()
+    assert policy.delay(1) == RETRY_BACKOFF
+    assert policy.delay(2) == 2 * RETRY_BACKOFF
+    assert policy.delay(10) == RETRY_BACKOFF_MAX
+
+
+def test_read_retried_on_crc_error():
+    with RS485Client("sim://?crc_error=1&latency=0.001&seed=1") as client:
+        with pytest.raises(CrcError):
+            client.read_ultrasonic()
+        assert client.retry_count == MAX_RETRIES
+
+
+def test_relay_write_never_retried():
+    with RS485Client("sim://?crc_error=1&latency=0.001&seed=1") as client:
+        with pytest.raises(CrcError):
+            client.set_relay(True)
+        assert client.retry_count == 0
+
+
+def test_preempt_stops_retries():
+    with RS485Client("sim://?crc_error=1&latency=0.001&seed=1") as client:
+        client.preempt = lambda: True
+        with pytest.raises(CrcError):
+            client.read_tcrt()
+        assert client.retry_count == 0
+
+
+def test_adaptive_timeout_learned_per_node():
+    with RS485Client("sim://?latency=0.002&seed=1") as client:
+        for _ in range(MIN_SAMPLES + 2):
+            client.read_ultrasonic()
+        assert client.timeout_for(SLAVE_SENSOR_ADDR, FC_READ_ULTRASONIC) < RESPONSE_TIMEOUT
+        # Estimator per function code: TCRT belum punya sampel
+        assert client.timeout_for(SLAVE_SENSOR_ADDR, FC_READ_TCRT5000) == RESPONSE_TIMEOUT
@@ -0,0 +1,32 @@
+import asyncio
+import os
+
+import pytest
+
+pytest.importorskip("serial_asyncio")
+
+from aioclient import AsyncRS485Client  # noqa: E402
+from protocol import CMD_READ_ULTRASONIC, ResponseTimeout  # noqa: E402
+from simulator import BridgeSimulator, PtyBridge  # noqa: E402
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="PtyBridge butuh pty")
+
+
+@pytest.fixture
+def bridge():
+    bridge = PtyBridge(BridgeSimulator(latency=0.15, seed=1)).start()
+    yield bridge
+    bridge.stop()
+
+
+def test_late_frame_not_taken_as_next_reply(bridge):
+    async def run():
+        async with await AsyncRS485Client.connect(bridge.device, reset_wait=1.0) as client:
+            assert client.ready_time is not None
+            with pytest.raises(ResponseTimeout):
+                await client.transact(CMD_READ_ULTRASONIC, timeout=0.05)
+            # Jawaban ultrasonik terlambat tidak boleh jadi jawaban TCRT/relay
+            assert await client.read_tcrt() is False
+            assert await client.read_relay() is False
+
+    asyncio.run(run())
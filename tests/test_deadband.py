@@ -0,0 +1,87 @@
+from deadband import ChangeFilter, frame_readings
+from modbus import encode_frame
+from protocol import (
+    FC_READ_REGISTERS, FC_READ_SENSORS, FC_READ_TCRT5000, FC_READ_ULTRASONIC, PASSTHROUGH_MARKER,
+    SLAVE_SENSOR_ADDR,
+)
+
+S = SLAVE_SENSOR_ADDR
+
+
+def test_first_reading_always_passes():
+    change = ChangeFilter(absolute=5.0, heartbeat=None)
+    assert change.accept(S, FC_READ_ULTRASONIC, 100, now=0.0)
+
+
+def test_absolute_deadband():
+    change = ChangeFilter(absolute=2.0, heartbeat=None)
+    assert change.accept(S, FC_READ_ULTRASONIC, 100, now=0.0)
+    assert not change.accept(S, FC_READ_ULTRASONIC, 102, now=0.1)
+    assert change.accept(S, FC_READ_ULTRASONIC, 103, now=0.2)
+    assert (change.passed, change.suppressed) == (2, 1)
+
+
+def test_percent_deadband():
+    change = ChangeFilter(absolute=0.5, percent=10.0, heartbeat=None)
+    change.accept(S, FC_READ_ULTRASONIC, 200, now=0.0)
+    assert not change.accept(S, FC_READ_ULTRASONIC, 219, now=0.1)
+    assert change.accept(S, FC_READ_ULTRASONIC, 221, now=0.2)
+
+
+def test_slow_drift_reported_against_last_reported_value():
+    change = ChangeFilter(absolute=2.0, heartbeat=None)
+    reported = [value for i, value in enumerate(range(100, 110))
+                if change.accept(S, FC_READ_ULTRASONIC, value, now=i)]
+    assert reported == [100, 103, 106, 109]
+
+
+def test_binary_channels_report_every_edge():
+    change = ChangeFilter(absolute=10.0, heartbeat=None)
+    states = [0, 0, 1, 1, 0, 1]
+    reported = [s for i, s in enumerate(states) if change.accept(S, FC_READ_TCRT5000, s, now=i)]
+    assert reported == [0, 1, 0, 1]
+
+
+def test_heartbeat_repeats_unchanged_value():
+    change = ChangeFilter(absolute=1.0, heartbeat=5.0)
+    assert change.accept(S, FC_READ_ULTRASONIC, 50, now=0.0)
+    assert not change.accept(S, FC_READ_ULTRASONIC, 50, now=4.9)
+    assert change.accept(S, FC_READ_ULTRASONIC, 50, now=5.0)
+    assert not change.accept(S, FC_READ_ULTRASONIC, 50, now=9.0)
+
+
+def test_channels_tracked_independently_and_reset():
+    change = ChangeFilter(heartbeat=None)
+    assert change.accept(S, FC_READ_ULTRASONIC, 1, now=0.0)
+    assert change.accept(S, FC_READ_TCRT5000, 1, now=0.0)
+    assert change.accept(0x66, FC_READ_TCRT5000, 1, now=0.0)
+    assert not change.accept(S, FC_READ_TCRT5000, 1, now=1.0)
+    change.reset()
+    assert change.accept(S, FC_READ_TCRT5000, 1, now=2.0)
+
+
+def test_sensors_frame_passes_if_any_value_changed():
+    change = ChangeFilter(absolute=2.0, heartbeat=None)
+    assert change.accept_frame(bytes([S, FC_READ_SENSORS, 100, 0]), now=0.0)
+    assert not change.accept_frame(bytes([S, FC_READ_SENSORS, 101, 0]), now=1.0)
+    assert change.accept_frame(bytes([S, FC_READ_SENSORS, 101, 1]), now=2.0)
+    # Semua nilai frame yang diteruskan jadi pembanding baru (jarak = 101)
+    assert not change.accept_frame(bytes([S, FC_READ_SENSORS, 103, 1]), now=3.0)
+    assert change.ratio() == 0.5
+
+
+def test_register_distance_deadband_in_cm():
+    change = ChangeFilter(absolute=2.0, heartbeat=None)
+    assert change.accept(S, FC_READ_REGISTERS, 1000, now=0.0)
+    assert not change.accept(S, FC_READ_REGISTERS, 1020, now=1.0)
+    assert change.accept(S, FC_READ_REGISTERS, 1021, now=2.0)
+
+
+def test_register_frame_readings():
+    response = encode_frame(S, FC_READ_REGISTERS, [8, 0x16, 0x00, 0x04, 0x45, 0x01, 0x2C, 0x00, 0x01])
+    frame = bytes([PASSTHROUGH_MARKER, len(response)]) + response
+    assert frame_readings(frame) == [(S, FC_READ_REGISTERS, 1093), (S, FC_READ_TCRT5000, 1)]
+    # Frame register rusak tidak menghasilkan pembacaan
+    broken = frame[:-1] + bytes([frame[-1] ^ 0xFF])
+    assert frame_readings(broken) == []
+    assert ChangeFilter().accept_frame(broken)
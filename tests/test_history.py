@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from history import RecordingStore, downsample, iter_replay
+from modbus import encode_frame
+from protocol import FC_READ_REGISTERS, FC_READ_TCRT5000, PASSTHROUGH_MARKER
+from recorder import Recorder
+
+
+def test_downsample_ignores_samples_outside_range():
+    t = np.arange(10.0)
+    result = downsample(t, t, 2, 0, 4)
+    assert result["count"].tolist() == [2, 3]
+    assert result["min"].tolist() == [0.0, 2.0]
+    assert result["max"].tolist() == [1.0, 4.0]
+    assert result["mean"].tolist() == [0.5, 3.0]
+
+
+def test_downsample_window_inside_data():
+    t = np.arange(10.0)
+    result = downsample(t, t * 10, 3, 2.5, 7)
+    assert result["count"].tolist() == [1, 2, 2]
+    assert result["max"].tolist() == [30.0, 50.0, 70.0]
+    assert result["mean"].tolist() == [30.0, 45.0, 65.0]
+
+
+def test_downsample_empty_buckets_are_nan():
+    t = np.array([0.0, 0.1, 9.9, 10.0])
+    value = np.array([1.0, 3.0, 5.0, 7.0])
+    result = downsample(t, value, 5)
+    assert result["count"].tolist() == [2, 0, 0, 0, 2]
+    assert np.isnan(result["mean"][1:4]).all()
+    assert result["mean"][[0, 4]].tolist() == [2.0, 6.0]
+    assert result["t"].tolist() == pytest.approx([1.0, 3.0, 5.0, 7.0, 9.0])
+
+
+def test_downsample_matches_naive_reduction():
+    rng = np.random.default_rng(4)
+    t = np.sort(rng.uniform(0, 100, 2000))
+    value = rng.normal(size=2000)
+    t_start, t_end, buckets = 20.0, 70.0, 13
+    result = downsample(t, value, buckets, t_start, t_end)
+    edges = np.linspace(t_start, t_end, buckets + 1)
+    for i in range(buckets):
+        upper = t <= edges[i + 1] if i == buckets - 1 else t < edges[i + 1]
+        chunk = value[(t >= edges[i]) & upper]
+        assert result["count"][i] == len(chunk)
+        assert result["max"][i] == chunk.max()
+        assert result["min"][i] == chunk.min()
+        assert result["mean"][i] == pytest.approx(chunk.mean())
+
+
+def test_downsample_no_samples():
+    result = downsample(np.empty(0), np.empty(0), 4)
+    assert result["count"].tolist() == [0, 0, 0, 0]
+    assert np.isnan(result["max"]).all()
+
+
+def test_store_query_and_replay(tmp_path):
+    path = str(tmp_path / "rec")
+    with Recorder(path) as recorder:
+        for i in range(6):
+            recorder.append(float(i), 0x24, 1 + i % 2, i * 10)
+    store = RecordingStore(path)
+    assert len(store) == 6
+    assert store.time_range() == (0.0, 5.0)
+    assert store.channels() == [(0x24, 1), (0x24, 2)]
+    window = store.query(1.0, 4.0, fc=1)
+    assert window["t"].tolist() == [2.0, 4.0]
+    assert list(iter_replay(store, 4.0)) == [(4.0, 0x24, 1, 40), (5.0, 0x24, 2, 50)]
+
+
+def test_register_frames_keep_mm_resolution(tmp_path):
+    response = encode_frame(0x24, FC_READ_REGISTERS, [8, 0x16, 0x00, 0x04, 0x45, 0x01, 0x2C, 0x00, 0x01])
+    frame = bytes([PASSTHROUGH_MARKER, len(response)]) + response
+    path = str(tmp_path / "rec")
+    with Recorder(path) as recorder:
+        recorder.append_frame(frame, t=1.0)
+    samples = list(iter_replay(RecordingStore(path)))
+    assert samples == [(1.0, 0x24, FC_READ_REGISTERS, 1093), (1.0, 0x24, FC_READ_TCRT5000, 1)]
@@ -0,0 +1,55 @@
+import threading
+import time
+
+from hotplug import PresenceMonitor
+
+
+class FakeSupervisor:
+    def __init__(self, present=True, delay=0.0):
+        self.device = "/dev/ttyUSB0"
+        self.lost = False
+        self.is_present = present
+        self.delay = delay
+        self.checking = threading.Event()
+
+    def present(self):
+        self.checking.set()
+        time.sleep(self.delay)
+        return self.is_present
+
+
+def test_removal_reported_with_device():
+    removed = []
+    supervisor = FakeSupervisor(present=False)
+    monitor = PresenceMonitor(supervisor, removed.append, interval=0.01)
+    monitor.start()
+    deadline = time.monotonic() + 2.0
+    while not removed and time.monotonic() < deadline:
+        time.sleep(0.01)
+    monitor.stop()
+    assert removed[0] == "/dev/ttyUSB0"
+
+
+def test_no_check_while_link_lost():
+    supervisor = FakeSupervisor(present=False)
+    supervisor.lost = True
+    removed = []
+    monitor = PresenceMonitor(supervisor, removed.append, interval=0.01)
+    monitor.start()
+    time.sleep(0.1)
+    monitor.stop()
+    assert not supervisor.checking.is_set()
+    assert removed == []
+
+
+def test_stop_waits_for_running_check():
+    # Cek yang sedang berjalan saat stop() tidak boleh melapor sesudahnya
+    removed = []
+    supervisor = FakeSupervisor(present=False, delay=0.2)
+    monitor = PresenceMonitor(supervisor, removed.append, interval=0.01)
+    monitor.start()
+    assert supervisor.checking.wait(2.0)
+    monitor.stop()
+    assert not monitor._thread.is_alive()
+    time.sleep(0.1)
+    assert removed == []
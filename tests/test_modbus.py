@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from modbus import (
+    CRC_INIT, crc16, crc16_batch, decode_frame, decode_frames, decode_registers, encode_frame,
+    encode_read_registers, frames_from_bytes, validate_frames,
+)
+from protocol import FC_READ_REGISTERS, FC_READ_ULTRASONIC, CrcError, InvalidResponse
+
+
+def crc16_bitwise(data):
+    crc = CRC_INIT
+    for byte in data:
+        crc ^= byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+    return crc
+
+
+def decode_ok(frame):
+    try:
+        decode_frame(frame)
+    except CrcError:
+        return False
+    return True
+
+
+def test_crc16_known_vectors():
+    # Contoh standar Modbus: read holding registers slave 1
+    assert crc16(bytes([0x01, 0x03, 0x00, 0x00, 0x00, 0x0A])) == 0xCDC5
+    assert crc16(b"123456789") == 0x4B37
+    assert crc16(b"") == CRC_INIT
+
+
+def test_crc16_table_matches_bitwise():
+    rng = np.random.default_rng(1)
+    for length in range(1, 40):
+        data = bytes(rng.integers(0, 256, length, dtype=np.uint8))
+        assert crc16(data) == crc16_bitwise(data)
+
+
+def test_encode_decode_roundtrip():
+    frame = encode_frame(0x24, FC_READ_ULTRASONIC, [0x2A])
+    assert decode_frame(frame) == (0x24, FC_READ_ULTRASONIC, b"\x2a")
+    corrupted = bytearray(frame)
+    corrupted[2] ^= 0x01
+    with pytest.raises(CrcError):
+        decode_frame(bytes(corrupted))
+    with pytest.raises(InvalidResponse):
+        decode_frame(frame[:4])
+
+
+def test_decode_registers():
+    response = encode_frame(0x24, FC_READ_REGISTERS, [4, 0x12, 0x34, 0x00, 0x01])
+    assert decode_registers(response, 0x24) == [0x1234, 0x0001]
+    with pytest.raises(InvalidResponse):
+        decode_registers(response, 0x66)
+    request = encode_read_registers(0x24, 0, 4)
+    assert decode_frame(request) == (0x24, FC_READ_REGISTERS, b"\x00\x04")
+
+
+def test_batch_crc_matches_scalar():
+    rng = np.random.default_rng(2)
+    frames = rng.integers(0, 256, (500, 7), dtype=np.uint8)
+    expected = [crc16(bytes(row)) for row in frames]
+    assert crc16_batch(frames).tolist() == expected
+
+
+def test_validate_frames_flags_corrupt_rows():
+    rng = np.random.default_rng(3)
+    frames = np.array([list(encode_frame(0x24, 0x01, [int(v)])) for v in rng.integers(0, 256, 100)],
+                      dtype=np.uint8)
+    bad = [5, 17, 99]
+    frames[bad, 2] ^= 0x80
+    valid = validate_frames(frames)
+    assert valid.dtype == bool
+    assert np.flatnonzero(~valid).tolist() == bad
+    assert valid.tolist() == [decode_ok(bytes(row)) for row in frames]
+
+
+def test_decode_frames_from_capture():
+    capture = b"".join(encode_frame(0x24, 0x02, [i % 2]) for i in range(10)) + b"\x24\x02"
+    frames = frames_from_bytes(capture)
+    assert frames.shape == (10, 5)
+    result = decode_frames(frames)
+    assert result["valid"].all()
+    assert result["addr"].tolist() == [0x24] * 10
+    assert result["data"][:, 0].tolist() == [i % 2 for i in range(10)]
+
+
+def test_validate_frames_rejects_bad_shape():
+    with pytest.raises(ValueError):
+        validate_frames(np.zeros((3, 4), dtype=np.uint8))
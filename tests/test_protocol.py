@@ -0,0 +1,94 @@
+import pytest
+
+from client import RS485Client
+from modbus import decode_registers, encode_frame
+from protocol import (
+    ERR_CRC, ERR_TIMEOUT, ERROR_MARKER, FC_READ_REGISTERS, FC_READ_SENSORS, FC_READ_ULTRASONIC,
+    PASSTHROUGH_MARKER, READY_FRAME, SLAVE_SENSOR_ADDR,
+    CrcError, FrameParser, SlaveTimeout, check_passthrough_frame, check_sensors_frame,
+)
+
+
+def passthrough_frame(response):
+    return bytes([PASSTHROUGH_MARKER, len(response)]) + response
+
+
+def test_data_frame_byte_by_byte():
+    parser = FrameParser()
+    frame = bytes([SLAVE_SENSOR_ADDR, FC_READ_ULTRASONIC, 42])
+    assert parser.needed() == 1
+    assert parser.feed(frame[:1]) == []
+    assert parser.needed() == 2
+    assert parser.feed(frame[1:2]) == []
+    assert parser.feed(frame[2:]) == [frame]
+    assert parser.needed() == 1
+
+
+def test_error_frame_completes_after_two_bytes():
+    parser = FrameParser()
+    assert parser.feed(bytes([ERROR_MARKER])) == []
+    assert parser.needed() == 1
+    assert parser.feed(bytes([ERR_TIMEOUT])) == [bytes([ERROR_MARKER, ERR_TIMEOUT])]
+
+
+def test_ready_frame_is_emitted():
+    assert FrameParser().feed(READY_FRAME) == [READY_FRAME]
+
+
+def test_sensors_frame_is_four_bytes():
+    parser = FrameParser()
+    frame = bytes([SLAVE_SENSOR_ADDR, FC_READ_SENSORS, 120, 1])
+    assert parser.feed(frame[:3]) == []
+    assert parser.needed() == 1
+    assert parser.feed(frame[3:]) == [frame]
+    assert check_sensors_frame(frame) == (120, 1)
+
+
+def test_passthrough_length_from_len_byte():
+    response = encode_frame(SLAVE_SENSOR_ADDR, FC_READ_REGISTERS, [4, 0x01, 0x02, 0x03, 0x04])
+    frame = passthrough_frame(response)
+    parser = FrameParser()
+    assert parser.feed(frame[:1]) == []
+    assert parser.needed() == 1
+    assert parser.feed(frame[1:2]) == []
+    assert parser.needed() == len(response)
+    assert parser.feed(frame[2:]) == [frame]
+    assert decode_registers(check_passthrough_frame(frame)) == [0x0102, 0x0304]
+
+
+def test_several_frames_in_one_chunk():
+    frames = [
+        READY_FRAME,
+        bytes([SLAVE_SENSOR_ADDR, FC_READ_SENSORS, 7, 0]),
+        bytes([ERROR_MARKER, ERR_CRC]),
+        bytes([SLAVE_SENSOR_ADDR, FC_READ_ULTRASONIC, 99]),
+    ]
+    assert FrameParser().feed(b"".join(frames)) == frames
+
+
+def test_reset_drops_partial_frame():
+    # Sisa frame terpotong dari transaksi sebelumnya tidak boleh
+    # menggeser batas frame berikutnya
+    parser = FrameParser()
+    assert parser.feed(bytes([SLAVE_SENSOR_ADDR, FC_READ_SENSORS, 5])) == []
+    parser.reset()
+    frame = bytes([SLAVE_SENSOR_ADDR, FC_READ_ULTRASONIC, 50])
+    assert parser.feed(frame) == [frame]
+
+
+def test_error_frames_raise():
+    with pytest.raises(CrcError):
+        check_passthrough_frame(bytes([ERROR_MARKER, ERR_CRC]))
+    with pytest.raises(SlaveTimeout):
+        check_sensors_frame(bytes([ERROR_MARKER, ERR_TIMEOUT]))
+
+
+def test_client_reads_over_simulator():
+    with RS485Client("sim://?seed=1&latency=0.002") as client:
+        assert client.ready_time is not None
+        distance, _ = client.read_sensors()
+        assert 0 <= distance <= 255
+        registers = client.read_registers()
+        assert len(registers) == 4
+        assert client.set_relay(True) is True
+        assert client.read_relay() is True
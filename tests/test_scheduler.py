@@ -0,0 +1,104 @@
+import pytest
+
+from adaptive import RETRY_BACKOFF_MAX
+from client import Request, RS485Client
+from protocol import (
+    CMD_READ_TCRT, CMD_READ_ULTRASONIC, ERR_CRC, ERROR_MARKER, SLAVE_SENSOR_ADDR,
+)
+from scheduler import (
+    PollChannel, PollScheduler, default_scheduler, estimate_command_time, transaction_deadline,
+)
+
+
+def make_scheduler(*channels):
+    scheduler = PollScheduler()
+    for name, interval, priority in channels:
+        request = Request(name, CMD_READ_TCRT, SLAVE_SENSOR_ADDR)
+        scheduler.add_channel(PollChannel(name, request, interval, priority))
+    return scheduler
+
+
+def test_earliest_deadline_first():
+    scheduler = make_scheduler(("a", 0.1, 0), ("b", 0.1, 5))
+    scheduler.channels["a"].deadline = 1.0
+    scheduler.channels["b"].deadline = 2.0
+    assert scheduler.next_due(0.5) is None
+    assert scheduler.wait_time(0.5) == pytest.approx(0.5)
+    # Prioritas tinggi tidak mendahului deadline yang lebih awal
+    assert scheduler.next_due(3.0).name == "a"
+
+
+def test_priority_breaks_deadline_ties():
+    scheduler = make_scheduler(("low", 0.1, 0), ("high", 0.1, 5))
+    for channel in scheduler.channels.values():
+        channel.deadline = 1.0
+    assert scheduler.next_due(1.0).name == "high"
+
+
+def test_completed_schedules_next_interval():
+    scheduler = make_scheduler(("a", 0.1, 0))
+    channel = scheduler.channels["a"]
+    channel.deadline = 1.0
+    scheduler.completed(channel, 0.01, 1.02)
+    assert channel.deadline == pytest.approx(1.1)
+    assert channel.rtt == 0.01
+
+
+def test_late_channel_does_not_catch_up():
+    scheduler = make_scheduler(("a", 0.1, 0))
+    channel = scheduler.channels["a"]
+    channel.deadline = 1.0
+    # Tertinggal jauh (mis. bus sibuk): tidak ada rentetan poll susulan
+    scheduler.completed(channel, 0.01, 5.0)
+    assert channel.deadline == 5.0
+
+
+def test_disabled_and_zero_rate_channels_skipped():
+    scheduler = make_scheduler(("a", 0.0, 0), ("b", 0.1, 0))
+    scheduler.configure("b", enabled=False)
+    assert scheduler.next_due(1e9) is None
+    assert scheduler.wait_time(0.0) is None
+    assert scheduler.load() == 0.0
+
+
+def test_load_uses_estimate_then_measured_rtt():
+    scheduler = make_scheduler(("a", 0.1, 0))
+    channel = scheduler.channels["a"]
+    estimate = estimate_command_time(CMD_READ_TCRT)
+    assert scheduler.load() == pytest.approx(estimate / 0.1)
+    scheduler.completed(channel, 0.05, channel.deadline)
+    assert scheduler.load() == pytest.approx(0.5)
+    scheduler.configure("a", interval=0.025)
+    assert scheduler.load() > 1.0
+
+
+def test_default_channels_within_bus_capacity():
+    scheduler = default_scheduler()
+    assert 0.0 < scheduler.load() < 1.0
+    ultrasonic = scheduler.channels["ultrasonic"].request
+    assert ultrasonic.command == CMD_READ_ULTRASONIC
+    assert ultrasonic.timeout == pytest.approx(transaction_deadline(CMD_READ_ULTRASONIC))
+
+
+def test_latency_bound_covers_longest_poll_and_backoff():
+    scheduler = default_scheduler()
+    urgent = Request("relay", CMD_READ_TCRT, SLAVE_SENSOR_ADDR, timeout=0.1)
+    longest = max(c.request.timeout for c in scheduler.channels.values())
+    assert scheduler.latency_bound(urgent) == pytest.approx(longest + RETRY_BACKOFF_MAX + 0.1)
+    assert scheduler.latency_bound(urgent, backoff=0.0) == pytest.approx(longest + 0.1)
+
+
+def test_preempt_during_backoff_skips_retry():
+    calls = []
+
+    def preempt():
+        # False saat memutuskan retry, True setelah jeda backoff
+        calls.append(None)
+        return len(calls) > 1
+
+    with RS485Client("sim://?crc_error=1&latency=0.001&seed=1") as client:
+        client.preempt = preempt
+        frame = client.transact(CMD_READ_ULTRASONIC)
+        assert frame == bytes([ERROR_MARKER, ERR_CRC])
+        assert client.retry_count == 0
+        assert len(calls) == 2
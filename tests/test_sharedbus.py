@@ -0,0 +1,92 @@
+import os
+import signal
+import subprocess
+import sys
+import uuid
+
+import pytest
+
+from protocol import FC_READ_TCRT5000, FC_READ_ULTRASONIC, SLAVE_SENSOR_ADDR
+from sharedbus import Publisher, Subscriber
+
+S = SLAVE_SENSOR_ADDR
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def name():
+    return f"rs485-test-{uuid.uuid4().hex[:8]}"
+
+
+def test_subscriber_reads_new_records_in_order(name):
+    with Publisher(name, capacity=16) as pub, Subscriber(name) as sub:
+        for i in range(5):
+            pub.append(100.0 + i, S, FC_READ_ULTRASONIC, float(i))
+        records = sub.read()
+        assert records["seq"].tolist() == [1, 2, 3, 4, 5]
+        assert records["value"].tolist() == [0.0, 1.0, 2.0, 3.0, 4.0]
+        assert len(sub.read()) == 0
+        assert sub.latest(S, FC_READ_ULTRASONIC) == 4.0
+        assert sub.latest(S, FC_READ_TCRT5000) is None
+
+
+def test_late_subscriber_starts_at_head(name):
+    with Publisher(name, capacity=16) as pub:
+        pub.append(1.0, S, FC_READ_TCRT5000, 1)
+        with Subscriber(name) as sub, Subscriber(name, from_start=True) as history:
+            assert len(sub.read()) == 0
+            assert history.read()["seq"].tolist() == [1]
+
+
+def test_overrun_counts_lost_records(name):
+    with Publisher(name, capacity=8) as pub, Subscriber(name) as sub:
+        for i in range(20):
+            pub.append(float(i), S, FC_READ_ULTRASONIC, float(i))
+        records = sub.read()
+        assert sub.lost == 12
+        assert records["seq"].tolist() == list(range(13, 21))
+
+
+def test_slot_being_written_is_discarded(name):
+    with Publisher(name, capacity=8) as pub, Subscriber(name) as sub:
+        for i in range(4):
+            pub.append(float(i), S, FC_READ_ULTRASONIC, float(i))
+        # Writer di tengah menulis slot seq 3: seq slot masih nol
+        pub._ring["seq"][3] = 0
+        records = sub.read()
+        assert records["seq"].tolist() == [1, 2, 4]
+        assert sub.lost == 1
+
+
+def test_append_frame_splits_sensor_frames(name):
+    with Publisher(name, capacity=8) as pub, Subscriber(name) as sub:
+        pub.append_frame(bytes([S, 0x04, 120, 1]), t=5.0)
+        records = sub.read()
+        assert records["fc"].tolist() == [FC_READ_ULTRASONIC, FC_READ_TCRT5000]
+        assert records["value"].tolist() == [120.0, 1.0]
+        assert records["t"].tolist() == [5.0, 5.0]
+
+
+def test_close_removes_segment(name):
+    Publisher(name, capacity=8).close()
+    with pytest.raises(FileNotFoundError):
+        Subscriber(name)
+
+
+def test_second_live_publisher_rejected(name):
+    with Publisher(name, capacity=8):
+        with pytest.raises(FileExistsError, match="in use"):
+            Publisher(name, capacity=8)
+
+
+@pytest.mark.skipif(os.name == "nt", reason="Windows tidak menyisakan segmen proses mati")
+def test_stale_segment_from_dead_publisher_recreated(name):
+    code = ("import os, signal, sys; sys.path.insert(0, sys.argv[1]); "
+            "from sharedbus import Publisher; p = Publisher(sys.argv[2], capacity=8); "
+            "p.append(1.0, 0x24, 1, 7.0); os.kill(os.getpid(), signal.SIGKILL)")
+    result = subprocess.run([sys.executable, "-c", code, ROOT, name])
+    assert result.returncode == -signal.SIGKILL
+    with Publisher(name, capacity=8) as pub, Subscriber(name, from_start=True) as sub:
+        assert sub.head() == 0
+        pub.append(2.0, S, FC_READ_ULTRASONIC, 8.0)
+        assert sub.read()["value"].tolist() == [8.0]
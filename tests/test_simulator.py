@@ -0,0 +1,47 @@
+import pytest
+
+from client import open_serial
+from protocol import (
+    CMD_PING, CMD_READ_TCRT, CMD_READ_ULTRASONIC, FC_READ_TCRT5000, FC_READ_ULTRASONIC,
+    READY_FRAME, SLAVE_SENSOR_ADDR, FrameParser,
+)
+from scheduler import master_turnaround
+from simulator import ADAPTIVE_SLAVE_TIMEOUT, SLAVE_TIMEOUT, BridgeSimulator
+
+
+def test_replies_due_together_keep_queue_order():
+    # READY dari CMD_PING siap tepat saat transaksi berjalan selesai:
+    # tetap harus datang setelah frame datanya
+    port = open_serial("sim://?latency=0.01&seed=1", timeout=0.5)
+    try:
+        for _ in range(50):
+            port.write(CMD_READ_ULTRASONIC + CMD_PING)
+            frames = FrameParser().feed(port.read(5))
+            assert [frame[:2] for frame in frames] == [
+                bytes([SLAVE_SENSOR_ADDR, FC_READ_ULTRASONIC]), READY_FRAME]
+    finally:
+        port.close()
+
+
+def test_master_processes_commands_in_order():
+    port = open_serial("sim://?latency=0.005&seed=1", timeout=0.5)
+    try:
+        port.write(CMD_READ_TCRT + CMD_READ_ULTRASONIC + CMD_READ_TCRT)
+        frames = FrameParser().feed(port.read(9))
+        assert [frame[1] for frame in frames] == [
+            FC_READ_TCRT5000, FC_READ_ULTRASONIC, FC_READ_TCRT5000]
+    finally:
+        port.close()
+
+
+def test_adaptive_slave_timeout_per_function_code():
+    simulator = BridgeSimulator(latency=0.01, seed=1)
+    [(ready, frame)] = simulator.feed(CMD_READ_TCRT, 0.0)
+    assert frame[1] == FC_READ_TCRT5000
+    simulator.timeout_rate = 1.0
+    turnaround = master_turnaround(simulator.baudrate)
+    # TCRT pernah menjawab: timeout adaptif; ultrasonik belum: timeout penuh
+    [(tcrt_ready, _)] = simulator.feed(CMD_READ_TCRT, 1.0)
+    assert tcrt_ready == pytest.approx(1.0 + ADAPTIVE_SLAVE_TIMEOUT + turnaround)
+    [(ultra_ready, _)] = simulator.feed(CMD_READ_ULTRASONIC, 2.0)
+    assert ultra_ready == pytest.approx(2.0 + SLAVE_TIMEOUT + turnaround)
@@ -0,0 +1,415 @@
+import itertools
+import queue
+import time
+
+import serial
+from PyQt5.QtCore import QObject, QThread, pyqtSignal
+
+from client import PRIORITY_CONTROL, PRIORITY_URGENT, RS485Client, Response
+from hotplug import PortSupervisor, PresenceMonitor
+from protocol import (DEFAULT_BAUD,
+                      CMD_READ_ULTRASONIC, CMD_READ_TCRT, CMD_CONTROL_RELAY, CMD_RELAY_STATUS,
+                      FC_READ_ULTRASONIC, FC_READ_TCRT5000, FC_CONTROL_RELAY, FC_READ_REGISTERS,
+                      ResponseTimeout, is_error_frame)
+from scheduler import REGISTERS_COMMAND, default_scheduler
+from stats import BusStats
+
+_STOP = object()
+
+# Function code -> (tag, command) untuk Response hasil replay rekaman.
+# Sampel FC 0x05 berisi jarak dalam mm (register 16-bit)
+REPLAY_TAGS = {
+    FC_READ_ULTRASONIC: ("ultrasonic", CMD_READ_ULTRASONIC),
+    FC_READ_TCRT5000: ("tcrt", CMD_READ_TCRT),
+    FC_CONTROL_RELAY: ("relay", CMD_CONTROL_RELAY + CMD_RELAY_STATUS),
+    FC_READ_REGISTERS: ("registers", REGISTERS_COMMAND),
+}
+
+
+class SerialWorker(QThread):
+    """Thread I/O yang memiliki RS485Client (dan objek serial.Serial-nya)"""
+
+    connected = pyqtSignal(str)
+    connection_failed = pyqtSignal(str)
+    disconnected = pyqtSignal()
+    response_received = pyqtSignal(object)
+    poll_load_changed = pyqtSignal(float)
+    link_lost = pyqtSignal(str)  # Port hilang, worker mencoba reconnect
+
+    # Worker replay tidak bisa mengirim request ke bus
+    read_only = False
+
+    def __init__(self, scheduler=None, parent=None):
+        super().__init__(parent)
+        # Antrean prioritas: request mendesak (tulis relay), lalu perintah
+        # kontrol, lalu request biasa; FIFO di dalam prioritas yang sama
+        self._queue = queue.PriorityQueue()
+        self._seq = itertools.count()
+        # Instrumentasi setiap transaksi (RTT, byte, error per slave/FC)
+        self.stats = BusStats()
+        self._client = RS485Client(stats=self.stats)
+        # Retry polling berhenti begitu ada request mendesak di antrean
+        self._client.preempt = self._urgent_pending
+        self.scheduler = scheduler
+        self._polling = False
+        self._recorder = None
+        # ChangeFilter opsional: hasil polling yang tidak berubah tidak
+        # diteruskan ke GUI/recorder (report-by-exception)
+        self.change_filter = None
+        self._supervisor = None  # PortSupervisor selama port terbuka
+        self._monitor = None     # PresenceMonitor untuk _supervisor
+
+    # ===== API DARI GUI THREAD =====
+    def open_port(self, port, baudrate=DEFAULT_BAUD):
+        """Minta worker membuka port (non-blocking)"""
+        self._put(("open", port, baudrate))
+
+    def close_port(self):
+        """Minta worker menutup port"""
+        self._put(("close",))
+
+    def submit(self, request):
+        """Antrekan satu Request ke bus sesuai request.priority"""
+        self._put(("request", request, time.monotonic()), request.priority)
+
+    def set_polling(self, enabled):
+        """Aktifkan/nonaktifkan polling otomatis dari scheduler"""
+        self._put(("polling", enabled))
+
+    def configure_channel(self, name, interval=None, priority=None, enabled=None):
+        """Ubah interval/prioritas satu channel polling"""
+        self._put(("channel", name, interval, priority, enabled))
+
+    def set_recorder(self, recorder):
+        """Rekam setiap frame data ke Recorder (None = berhenti merekam)"""
+        self._put(("recorder", recorder))
+
+    def set_change_filter(self, change_filter):
+        """Saring hasil polling dengan ChangeFilter (None = teruskan semua)"""
+        self._put(("filter", change_filter))
+
+    def stop(self, wait=True):
+        """Hentikan thread dan tutup port"""
+        self._put(_STOP)
+        if wait:
+            self.wait()
+
+    # ===== ANTREAN =====
+    def _put(self, item, priority=PRIORITY_CONTROL):
+        self._queue.put((priority, next(self._seq), item))
+
+    def _get(self, timeout):
+        return self._queue.get(timeout=timeout)[2]
+
+    def _urgent_pending(self):
+        """True jika ada request mendesak di antrean
+
+        Hanya request yang memakai PRIORITY_URGENT, jadi cukup cek kepala heap.
+        """
+        with self._queue.mutex:
+            return bool(self._queue.queue) and self._queue.queue[0][0] == PRIORITY_URGENT
+
+    # ===== LOOP WORKER =====
+    def run(self):
+        while True:
+            timeout = None
+            # Presence dicek PresenceMonitor di thread lain; di sini hanya
+            # jadwal reconnect setelah link putus
+            supervisor = self._supervisor
+            if supervisor is not None and supervisor.lost:
+                now = time.monotonic()
+                if supervisor.due(now):
+                    self._reconnect()
+                    continue
+                timeout = supervisor.wait_time(now)
+
+            # Request manual di antrean selalu didahulukan; jika antrean
+            # kosong, kirim channel polling yang sudah jatuh tempo
+            if self._polling and self._client.is_open:
+                now = time.monotonic()
+                channel = self.scheduler.next_due(now)
+                if channel is not None and self._queue.empty():
+                    start = time.monotonic()
+                    self._execute(channel.request, filtered=True)
+                    end = time.monotonic()
+                    self.scheduler.completed(channel, end - start, end)
+                    continue
+                poll_wait = self.scheduler.wait_time(now)
+                timeout = poll_wait if timeout is None else min(timeout, poll_wait)
+
+            try:
+                item = self._get(timeout)
+            except queue.Empty:
+                continue
+
+            if item is _STOP:
+                self._close()
+                self._swap_recorder(None)
+                return
+
+            kind = item[0]
+            if kind == "open":
+                self._open(item[1], item[2])
+            elif kind == "close":
+                self._close()
+                self._polling = False
+                self.disconnected.emit()
+            elif kind == "request":
+                # Transaksi berikutnya langsung diambil dari antrean
+                # begitu response (atau frame error) sebelumnya diterima
+                self._execute(item[1], item[2])
+            elif kind == "polling":
+                self._polling = item[1] and self.scheduler is not None
+                if self._polling:
+                    self.scheduler.reset()
+                    if self.change_filter is not None:
+                        self.change_filter.reset()
+                    self.poll_load_changed.emit(self.scheduler.load())
+            elif kind == "channel":
+                self.scheduler.configure(*item[1:])
+                self.poll_load_changed.emit(self.scheduler.load())
+            elif kind == "recorder":
+                self._swap_recorder(item[1])
+            elif kind == "filter":
+                self.change_filter = item[1]
+            elif kind == "removed":
+                # Event dari monitor koneksi sebelumnya (sudah antre sebelum
+                # monitor dihentikan) diabaikan
+                _, monitor, device = item
+                supervisor = self._supervisor
+                if (monitor is self._monitor and supervisor is not None
+                        and not supervisor.lost and supervisor.device == device):
+                    self._link_lost("Device removed")
+
+    def _execute(self, request, submitted=None, filtered=False):
+        start = time.monotonic()
+        response = self._transact(request)
+        # Latency submit -> ack, termasuk waktu antre di belakang transaksi lain
+        response = response._replace(
+            latency=time.monotonic() - (start if submitted is None else submitted))
+        change_filter = self.change_filter if filtered else None
+        if (change_filter is not None and response.data and not is_error_frame(response.data)
+                and not change_filter.accept_frame(response.data)):
+            # Nilai tidak berubah (di dalam deadband): tidak direkam/ditampilkan
+            return response
+        if self._recorder is not None and response.data and not is_error_frame(response.data):
+            self._recorder.append_frame(response.data)
+        self.response_received.emit(response)
+        return response
+
+    def _swap_recorder(self, recorder):
+        if self._recorder is not None:
+            self._recorder.close()
+        self._recorder = recorder
+
+    def _open(self, port, baudrate):
+        self._close()
+        try:
+            self._client.baudrate = baudrate
+            self._client.open(port)
+            self.stats.reset()
+            self._supervisor = PortSupervisor(port)
+            self._supervisor.attached(port)
+            self._start_monitor()
+            self.connected.emit(port)
+        except Exception as e:
+            self._client.close()
+            self.connection_failed.emit(str(e))
+
+    def _close(self):
+        self._client.close()
+        self._stop_monitor()
+        self._supervisor = None
+
+    def _start_monitor(self):
+        """Monitor presence baru untuk koneksi saat ini"""
+        monitor = PresenceMonitor(
+            self._supervisor, lambda device: self._put(("removed", monitor, device)))
+        self._monitor = monitor
+        monitor.start()
+
+    def _stop_monitor(self):
+        if self._monitor is not None:
+            self._monitor.stop()
+            self._monitor = None
+
+    # ===== SUPERVISOR KONEKSI =====
+    def _link_lost(self, message):
+        """Port putus di tengah sesi: tutup dan mulai reconnect"""
+        self._client.close()
+        self._stop_monitor()
+        self._supervisor.detached()
+        self.link_lost.emit(message)
+
+    def _reconnect(self):
+        """Satu percobaan reconnect ke device yang sama (bisa beda nama)"""
+        device = self._supervisor.candidate()
+        if device is None:
+            return
+        try:
+            # Handshake READY menggantikan sleep reset 2 detik
+            self._client.open(device)
+        except Exception:
+            self._client.close()
+            return
+
+        self._supervisor.attached(device)
+        self._start_monitor()
+        if self._polling:
+            # Lanjutkan jadwal polling dari awal, tanpa catch-up
+            self.scheduler.reset()
+        if self.change_filter is not None:
+            # Nilai setelah link putus selalu dilaporkan ulang
+            self.change_filter.reset()
+        self.connected.emit(device)
+
+    def _transact(self, request):
+        if not self._client.is_open:
+            return Response(request.tag, request.command, None, "Not connected")
+
+        try:
+            frame = self._client.transact(request.command, request.timeout)
+            return Response(request.tag, request.command, frame, None)
+        except ResponseTimeout:
+            return Response(request.tag, request.command, None, "timeout")
+        except (serial.SerialException, OSError) as e:
+            # Error I/O port (USB dicabut), bukan error protokol
+            if self._supervisor is not None:
+                self._link_lost(str(e))
+            return Response(request.tag, request.command, None, str(e))
+        except Exception as e:
+            return Response(request.tag, request.command, None, str(e))
+
+
+class ReplayWorker(SerialWorker):
+    """Putar ulang sampel rekaman lewat signal yang sama dengan SerialWorker
+
+    Panel segmen menampilkan rekaman dengan widget yang sama seperti data
+    live. samples berisi (t, slave, fc, value), diputar sesuai jarak waktu
+    aslinya dibagi speed.
+    """
+
+    read_only = True
+
+    def __init__(self, samples, speed=1.0, scheduler=None, parent=None):
+        super().__init__(scheduler, parent)
+        self._samples = samples
+        self.speed = speed
+
+    def run(self):
+        samples = None
+        pending = None
+        t0 = start = None
+        while True:
+            timeout = None
+            if samples is not None:
+                if pending is None:
+                    pending = next(samples, None)
+                    if pending is None:
+                        # Rekaman selesai diputar
+                        samples = None
+                        self.disconnected.emit()
+                        continue
+                    if t0 is None:
+                        t0, start = pending[0], time.monotonic()
+                due = start + (pending[0] - t0) / self.speed
+                timeout = max(0.0, due - time.monotonic())
+
+            try:
+                item = self._get(timeout)
+            except queue.Empty:
+                self._emit_sample(*pending)
+                pending = None
+                continue
+
+            if item is _STOP:
+                return
+
+            kind = item[0]
+            if kind == "open":
+                samples = iter(self._samples)
+                self.stats.reset()
+                self.connected.emit(item[1])
+            elif kind == "close":
+                samples = None
+                self.disconnected.emit()
+            elif kind == "request":
+                request = item[1]
+                self.response_received.emit(
+                    Response(request.tag, request.command, None, "Replay is read-only"))
+            elif kind == "recorder" and item[1] is not None:
+                # Rekaman tidak direkam ulang
+                item[1].close()
+
+    def _emit_sample(self, t, slave, fc, value):
+        if fc not in REPLAY_TAGS:
+            return
+        tag, command = REPLAY_TAGS[fc]
+        # Tuple, bukan bytes: nilai rekaman bisa lebih lebar dari 8 bit
+        frame = (slave, fc, value)
+        self.stats.record(slave, fc, 0.0, 0, len(frame))
+        self.response_received.emit(Response(tag, command, frame, None))
+
+
+class BridgeManager(QObject):
+    """Kelola satu SerialWorker per port (satu per segmen RS-485)
+
+    Setiap master bridge punya thread I/O dan scheduler sendiri, jadi
+    semua segmen di-poll paralel.
+    """
+
+    bridge_opened = pyqtSignal(str, object)
+    bridge_closed = pyqtSignal(str)
+
+    def __init__(self, scheduler_factory=default_scheduler, parent=None):
+        super().__init__(parent)
+        self.scheduler_factory = scheduler_factory
+        self.workers = {}
+        self._stopping = set()
+
+    def ports(self):
+        return list(self.workers)
+
+    def open(self, port, baudrate=DEFAULT_BAUD):
+        """Buat worker baru untuk port dan mulai membuka port"""
+        if port in self.workers:
+            return self.workers[port]
+
+        worker = SerialWorker(self.scheduler_factory(baudrate))
+        self._start(port, worker)
+        worker.open_port(port, baudrate)
+        return worker
+
+    def open_replay(self, name, samples, speed=1.0):
+        """Putar ulang rekaman sebagai segmen read-only bernama name"""
+        if name in self.workers:
+            return self.workers[name]
+
+        worker = ReplayWorker(samples, speed, self.scheduler_factory(DEFAULT_BAUD))
+        self._start(name, worker)
+        worker.open_port(name)
+        return worker
+
+    def _start(self, port, worker):
+        self.workers[port] = worker
+        # Listener menyambung signal worker sebelum port dibuka
+        self.bridge_opened.emit(port, worker)
+        worker.start()
+
+    def close(self, port):
+        """Hentikan worker port tanpa memblokir GUI thread"""
+        worker = self.workers.pop(port, None)
+        if worker is None:
+            return
+
+        # Simpan referensi sampai thread benar-benar selesai
+        self._stopping.add(worker)
+        worker.finished.connect(lambda: self._stopping.discard(worker))
+        worker.stop(wait=False)
+        self.bridge_closed.emit(port)
+
+    def close_all(self):
+        for port in self.ports():
+            self.close(port)
+        for worker in list(self._stopping):
+            worker.wait()
@@ -0,0 +1,54 @@
+"""View-model untuk label GUI: update di-coalesce dan di-diff per frame
+
+Handler response cukup memanggil set(nama, teks, varian). Perubahan
+dikumpulkan lalu diterapkan sekali per frame. setText/setStyleSheet hanya
+dipanggil jika teks atau varian style berbeda dari yang sedang tampil.
+setStyleSheet memaksa Qt me-repolish widget, jadi stylesheet setiap
+varian dibuat sekali saat bind(), bukan per response.
+"""
+from PyQt5.QtCore import QObject, QTimer
+
+FRAME_INTERVAL = 50  # ms, paling banyak satu batch update per frame
+
+
+class ViewModel(QObject):
+    """State terakhir yang dirender untuk sekumpulan label"""
+
+    def __init__(self, interval=FRAME_INTERVAL, parent=None):
+        super().__init__(parent)
+        self._bindings = {}  # nama -> (label, {varian: stylesheet})
+        self._rendered = {}  # nama -> (teks, varian) yang sedang tampil
+        self._pending = {}   # nama -> (teks, varian) untuk frame berikutnya
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(interval)
+        self.timer.timeout.connect(self.flush)
+
+    def bind(self, name, label, styles=None, variant=None):
+        """Daftarkan label dengan varian style yang sudah jadi"""
+        styles = styles or {}
+        self._bindings[name] = (label, styles)
+        if variant is not None:
+            label.setStyleSheet(styles[variant])
+        self._rendered[name] = (label.text(), variant)
+
+    def set(self, name, text, variant=None):
+        """Jadwalkan state baru; varian None = style tidak diubah"""
+        if variant is None:
+            variant = self._pending.get(name, self._rendered[name])[1]
+        self._pending[name] = (text, variant)
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def flush(self):
+        """Terapkan semua perubahan yang tertunda dalam satu batch"""
+        pending, self._pending = self._pending, {}
+        for name, (text, variant) in pending.items():
+            rendered_text, rendered_variant = self._rendered[name]
+            label, styles = self._bindings[name]
+            if text != rendered_text:
+                label.setText(text)
+            if variant != rendered_variant:
+                label.setStyleSheet(styles[variant])
+            self._rendered[name] = (text, variant)